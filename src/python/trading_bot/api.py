@@ -2,14 +2,19 @@ import os
 import json
 import logging
 import asyncio
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Optional, Any, Literal
 from fastapi import FastAPI, HTTPException, Depends, Query, Path, Body
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import PlainTextResponse
 from pydantic import BaseModel, Field
 
 from config import TradingBotConfig, ExchangeConfig, PermissionLevel
 from exchange_manager import exchange_manager
 from strategy_manager import strategy_manager
+from grid_sweep import sweep_grid, grid_combinations
+from history_store import history_store
+from backfill import Backfill
+import metrics
 
 # Configure logging
 logging.basicConfig(
@@ -37,6 +42,10 @@ app.add_middleware(
 # Load configuration
 config = TradingBotConfig.load()
 
+# History download started through the API
+backfill: Optional[Backfill] = None
+backfill_task: Optional[asyncio.Task] = None
+
 # Pydantic models for API requests and responses
 class ExchangeConfigModel(BaseModel):
     exchange_id: str
@@ -48,11 +57,30 @@ class ExchangeConfigModel(BaseModel):
     enabled: bool = True
     test_mode: bool = False
     additional_params: Dict = Field(default_factory=dict)
+    pool_size: int = 10
+    request_timeout: float = 10.0
+    keepalive_timeout: float = 30.0
+    ticker_ttl: float = 2.0
+    requests_per_second: Optional[float] = None
+    rate_limit_burst: float = 1.0
+    markets_ttl: float = 86400.0
+    balance_sync_interval: float = 30.0
 
 class StrategyConfigModel(BaseModel):
     strategy_id: str
     parameters: Dict = Field(default_factory=dict)
 
+class StrategyInstanceModel(BaseModel):
+    name: str
+    strategy_id: str
+    parameters: Dict = Field(default_factory=dict)
+    autostart: bool = True
+
+class SubscriptionModel(BaseModel):
+    symbol: str
+    kind: Literal["ticker", "order_book"] = "ticker"
+    limit: Optional[int] = None
+
 class OrderModel(BaseModel):
     exchange_id: str
     symbol: str
@@ -62,11 +90,72 @@ class OrderModel(BaseModel):
     price: Optional[float] = None
     params: Dict = Field(default_factory=dict)
 
+class GridSweepModel(BaseModel):
+    exchange_id: Optional[str] = None
+    symbol: Optional[str] = None
+    timeframe: str = "1m"
+    since: Optional[int] = None
+    limit: Optional[int] = None
+    bars: Optional[List[List[float]]] = None
+    lower_prices: List[float]
+    upper_prices: List[float]
+    grid_levels: List[int]
+    total_investments: List[float]
+    fee_rate: float = 0.001
+    processes: Optional[int] = None
+    sort_by: str = "return_pct"
+    top: Optional[int] = 100
+
+class BackfillModel(BaseModel):
+    markets: List[Dict[str, str]]
+    kinds: List[Literal["ohlcv", "trades"]] = ["ohlcv"]
+    timeframe: str = "1m"
+    since: int
+    end: Optional[int] = None
+    page_limit: int = 1000
+    concurrency: int = 4
+
 # API routes
 @app.get("/")
 async def root():
     return {"message": "WATTxchange Trading Bot API"}
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def get_metrics():
+    """Exchange call latency, errors and timeouts and strategy tick duration in Prometheus format"""
+    return PlainTextResponse(metrics.registry.render(), media_type="text/plain; version=0.0.4")
+
+@app.on_event("startup")
+async def startup():
+    """Start the state store, the market data bus, the market recorder and the strategy worker pool if configured"""
+    if config.global_settings.get("state_store", True):
+        exchange_manager.enable_state_store()
+    
+    if config.global_settings.get("market_bus"):
+        exchange_manager.enable_market_bus(config.global_settings.get("market_bus_name"))
+    
+    num_workers = config.global_settings.get("strategy_workers", 0)
+    recorder_markets = config.global_settings.get("recorder_markets")
+    if num_workers or recorder_markets:
+        for exchange in config.exchanges:
+            if exchange.enabled and exchange_manager.get_exchange(exchange.exchange_id) is None:
+                exchange_manager.add_exchange(exchange)
+    
+    if recorder_markets:
+        exchange_manager.start_recorder(
+            [(market["exchange_id"], market["symbol"]) for market in recorder_markets],
+            order_book_depth=config.global_settings.get("recorder_order_book_depth", 10)
+        )
+    
+    if num_workers:
+        strategy_manager.start_workers(exchange_manager, num_workers)
+
+@app.on_event("shutdown")
+async def shutdown():
+    """Stop strategy instances and close pooled exchange sessions when the server stops"""
+    await strategy_manager.stop_all()
+    await exchange_manager.close()
+
 # Exchange routes
 @app.get("/exchanges")
 async def get_exchanges():
@@ -94,7 +183,15 @@ async def add_exchange(exchange_config: ExchangeConfigModel):
         permission_level=exchange_config.permission_level,
         enabled=exchange_config.enabled,
         test_mode=exchange_config.test_mode,
-        additional_params=exchange_config.additional_params
+        additional_params=exchange_config.additional_params,
+        pool_size=exchange_config.pool_size,
+        request_timeout=exchange_config.request_timeout,
+        keepalive_timeout=exchange_config.keepalive_timeout,
+        ticker_ttl=exchange_config.ticker_ttl,
+        requests_per_second=exchange_config.requests_per_second,
+        rate_limit_burst=exchange_config.rate_limit_burst,
+        markets_ttl=exchange_config.markets_ttl,
+        balance_sync_interval=exchange_config.balance_sync_interval
     )
     
     # Add to config
@@ -120,7 +217,7 @@ async def remove_exchange(exchange_id: str):
     config.save()
     
     # Remove from exchange manager
-    exchange_manager.remove_exchange(exchange_id)
+    await exchange_manager.remove_exchange(exchange_id)
     
     return {"message": f"Exchange {exchange_id} removed successfully"}
 
@@ -166,9 +263,24 @@ async def get_exchange_balance(exchange_id: str):
     
     return balance
 
+@app.get("/exchanges/{exchange_id}/balance/tracked")
+async def get_tracked_balance(exchange_id: str):
+    """Get the locally tracked balances and open reservations for an exchange"""
+    if exchange_manager.get_exchange(exchange_id) is None:
+        raise HTTPException(status_code=404, detail=f"Exchange {exchange_id} not found")
+    return exchange_manager.balance_tracker.get_status(exchange_id)
+
+@app.get("/exchanges/{exchange_id}/rate-limit")
+async def get_exchange_rate_limit(exchange_id: str):
+    """Get rate limiter queue depth and wait times for an exchange"""
+    stats = exchange_manager.get_rate_limit_stats(exchange_id)
+    if not stats:
+        raise HTTPException(status_code=404, detail=f"Exchange {exchange_id} not found")
+    return stats
+
 @app.get("/exchanges/{exchange_id}/markets")
-async def get_exchange_markets(exchange_id: str):
-    """Get markets for an exchange"""
+async def get_exchange_markets(exchange_id: str, reload: bool = False):
+    """Get markets for an exchange, from the market index unless reload is set"""
     exchange = config.get_exchange(exchange_id)
     if not exchange:
         raise HTTPException(status_code=404, detail=f"Exchange {exchange_id} not found")
@@ -178,7 +290,7 @@ async def get_exchange_markets(exchange_id: str):
         exchange_manager.add_exchange(exchange)
     
     # Get markets
-    markets = await exchange_manager.fetch_markets(exchange_id)
+    markets = await exchange_manager.fetch_markets(exchange_id, reload=reload)
     
     if not markets:
         raise HTTPException(status_code=400, detail=f"Failed to fetch markets from {exchange_id}")
@@ -204,6 +316,84 @@ async def get_exchange_ticker(exchange_id: str, symbol: str):
     
     return ticker
 
+@app.get("/exchanges/{exchange_id}/tickers")
+async def get_exchange_tickers(exchange_id: str, symbols: str = Query(..., description="Comma-separated symbols")):
+    """Get tickers for several symbols on an exchange"""
+    exchange = config.get_exchange(exchange_id)
+    if not exchange:
+        raise HTTPException(status_code=404, detail=f"Exchange {exchange_id} not found")
+    
+    # Make sure the exchange is added to the manager
+    if exchange_manager.get_exchange(exchange_id) is None:
+        exchange_manager.add_exchange(exchange)
+    
+    # Get tickers
+    symbol_list = [symbol.strip() for symbol in symbols.split(",") if symbol.strip()]
+    tickers = await exchange_manager.fetch_tickers(exchange_id, symbol_list)
+    
+    if not tickers:
+        raise HTTPException(status_code=400, detail=f"Failed to fetch tickers from {exchange_id}")
+    
+    return tickers
+
+@app.get("/exchanges/{exchange_id}/orderbook/{symbol}")
+async def get_exchange_order_book(exchange_id: str, symbol: str, limit: Optional[int] = None):
+    """Get the order book for a symbol on an exchange"""
+    exchange = config.get_exchange(exchange_id)
+    if not exchange:
+        raise HTTPException(status_code=404, detail=f"Exchange {exchange_id} not found")
+    
+    # Make sure the exchange is added to the manager
+    if exchange_manager.get_exchange(exchange_id) is None:
+        exchange_manager.add_exchange(exchange)
+    
+    # Get order book
+    order_book = await exchange_manager.fetch_order_book(exchange_id, symbol, limit)
+    
+    if order_book is None:
+        raise HTTPException(status_code=400, detail=f"Failed to fetch order book for {symbol} from {exchange_id}")
+    
+    return order_book.to_dict(limit)
+
+@app.post("/exchanges/{exchange_id}/subscriptions")
+async def subscribe_market_data(exchange_id: str, subscription: SubscriptionModel):
+    """Stream a ticker or order book into the local quote store"""
+    exchange = config.get_exchange(exchange_id)
+    if not exchange:
+        raise HTTPException(status_code=404, detail=f"Exchange {exchange_id} not found")
+    
+    # Make sure the exchange is added to the manager
+    if exchange_manager.get_exchange(exchange_id) is None:
+        exchange_manager.add_exchange(exchange)
+    
+    if subscription.kind == "ticker":
+        success = exchange_manager.subscribe_ticker(exchange_id, subscription.symbol)
+    else:
+        success = exchange_manager.subscribe_order_book(exchange_id, subscription.symbol, subscription.limit)
+    
+    if not success:
+        raise HTTPException(status_code=400, detail=f"Failed to subscribe to {subscription.symbol} on {exchange_id}")
+    
+    return {"message": f"Subscribed to {subscription.kind} {subscription.symbol} on {exchange_id}"}
+
+@app.delete("/exchanges/{exchange_id}/subscriptions")
+async def unsubscribe_market_data(exchange_id: str, subscription: SubscriptionModel):
+    """Release a ticker or order book subscription"""
+    if subscription.kind == "ticker":
+        success = await exchange_manager.unsubscribe_ticker(exchange_id, subscription.symbol)
+    else:
+        success = await exchange_manager.unsubscribe_order_book(exchange_id, subscription.symbol)
+    
+    if not success:
+        raise HTTPException(status_code=404, detail=f"No {subscription.kind} subscription for {subscription.symbol} on {exchange_id}")
+    
+    return {"message": f"Unsubscribed from {subscription.kind} {subscription.symbol} on {exchange_id}"}
+
+@app.get("/subscriptions")
+async def get_subscriptions():
+    """Get the status of all market data feeds"""
+    return exchange_manager.get_subscriptions()
+
 @app.post("/exchanges/{exchange_id}/orders")
 async def create_order(exchange_id: str, order: OrderModel):
     """Create an order on an exchange"""
@@ -235,6 +425,33 @@ async def create_order(exchange_id: str, order: OrderModel):
     
     return result
 
+@app.post("/exchanges/{exchange_id}/orders/batch")
+async def create_orders(exchange_id: str, orders: List[OrderModel]):
+    """Create several orders on an exchange, returning one result or error per order"""
+    exchange = config.get_exchange(exchange_id)
+    if not exchange:
+        raise HTTPException(status_code=404, detail=f"Exchange {exchange_id} not found")
+    
+    # Make sure the exchange is added to the manager
+    if exchange_manager.get_exchange(exchange_id) is None:
+        exchange_manager.add_exchange(exchange)
+    
+    # Check permission
+    if not exchange_manager.check_permission(exchange_id, "read_write"):
+        raise HTTPException(status_code=403, detail=f"Exchange {exchange_id} does not have read_write permission")
+    
+    return await exchange_manager.create_orders(exchange_id, [
+        {
+            "symbol": order.symbol,
+            "type": order.order_type,
+            "side": order.side,
+            "amount": order.amount,
+            "price": order.price,
+            "params": order.params
+        }
+        for order in orders
+    ])
+
 @app.delete("/exchanges/{exchange_id}/orders/{order_id}")
 async def cancel_order(exchange_id: str, order_id: str, symbol: Optional[str] = None):
     """Cancel an order on an exchange"""
@@ -262,6 +479,24 @@ async def cancel_order(exchange_id: str, order_id: str, symbol: Optional[str] =
     
     return result
 
+@app.delete("/exchanges/{exchange_id}/orders")
+async def cancel_all_orders(exchange_id: str, symbol: str):
+    """Cancel all open orders for a symbol on an exchange"""
+    exchange = config.get_exchange(exchange_id)
+    if not exchange:
+        raise HTTPException(status_code=404, detail=f"Exchange {exchange_id} not found")
+    
+    # Make sure the exchange is added to the manager
+    if exchange_manager.get_exchange(exchange_id) is None:
+        exchange_manager.add_exchange(exchange)
+    
+    # Check permission
+    if not exchange_manager.check_permission(exchange_id, "read_write"):
+        raise HTTPException(status_code=403, detail=f"Exchange {exchange_id} does not have read_write permission")
+    
+    cancelled = await exchange_manager.cancel_all_for_symbol(exchange_id, symbol)
+    return {"cancelled": cancelled}
+
 @app.get("/exchanges/{exchange_id}/orders")
 async def get_exchange_orders(
     exchange_id: str, 
@@ -300,6 +535,11 @@ async def get_strategies():
     """Get all available strategies"""
     return strategy_manager.get_all_strategies_info()
 
+@app.get("/strategies/status")
+async def get_strategy_status():
+    """Get the status of the active strategy"""
+    return strategy_manager.get_active_strategy_status()
+
 @app.get("/strategies/{strategy_id}")
 async def get_strategy(strategy_id: str):
     """Get information about a specific strategy"""
@@ -317,7 +557,7 @@ async def set_active_strategy(strategy_config: StrategyConfigModel):
             exchange_manager.add_exchange(exchange)
     
     # Set active strategy
-    success = strategy_manager.set_active_strategy(
+    success = await strategy_manager.set_active_strategy(
         strategy_id=strategy_config.strategy_id,
         exchange_manager=exchange_manager,
         parameters=strategy_config.parameters
@@ -359,10 +599,183 @@ async def stop_strategy():
     
     return {"message": "Active strategy stopped"}
 
-@app.get("/strategies/status")
-async def get_strategy_status():
-    """Get the status of the active strategy"""
-    return strategy_manager.get_active_strategy_status()
+# Strategy instance routes
+@app.get("/instances")
+async def get_instances():
+    """Get the status of all strategy instances"""
+    return strategy_manager.get_all_instances_status()
+
+@app.post("/instances")
+async def create_instance(instance: StrategyInstanceModel):
+    """Create or replace a named strategy instance"""
+    # Make sure all exchanges are added to the manager
+    for exchange in config.exchanges:
+        if exchange_manager.get_exchange(exchange.exchange_id) is None:
+            exchange_manager.add_exchange(exchange)
+    
+    success = await strategy_manager.deploy_instance(
+        name=instance.name,
+        strategy_id=instance.strategy_id,
+        exchange_manager=exchange_manager,
+        parameters=instance.parameters,
+        start=instance.autostart
+    )
+    
+    if not success:
+        raise HTTPException(status_code=400, detail=f"Failed to create strategy instance {instance.name}")
+    
+    # Update config
+    config.add_strategy_instance({
+        "name": instance.name,
+        "strategy_id": instance.strategy_id,
+        "parameters": instance.parameters,
+        "autostart": instance.autostart
+    })
+    config.save()
+    
+    return strategy_manager.get_instance_status(instance.name)
+
+@app.get("/instances/{name}")
+async def get_instance(name: str):
+    """Get the status of a strategy instance"""
+    status = strategy_manager.get_instance_status(name)
+    if not status:
+        raise HTTPException(status_code=404, detail=f"Strategy instance {name} not found")
+    return status
+
+@app.delete("/instances/{name}")
+async def delete_instance(name: str):
+    """Stop and remove a strategy instance"""
+    success = await strategy_manager.remove_instance(name)
+    
+    if not success:
+        raise HTTPException(status_code=404, detail=f"Strategy instance {name} not found")
+    
+    # Update config
+    config.remove_strategy_instance(name)
+    config.save()
+    
+    return {"message": f"Strategy instance {name} removed"}
+
+@app.post("/instances/{name}/start")
+async def start_instance(name: str):
+    """Start a strategy instance"""
+    if not strategy_manager.has_instance(name):
+        raise HTTPException(status_code=404, detail=f"Strategy instance {name} not found")
+    
+    success = await strategy_manager.set_instance_running(name, True)
+    
+    if not success:
+        raise HTTPException(status_code=400, detail=f"Failed to start strategy instance {name}")
+    
+    return {"message": f"Strategy instance {name} started"}
+
+@app.post("/instances/{name}/stop")
+async def stop_instance(name: str):
+    """Stop a strategy instance"""
+    if not strategy_manager.has_instance(name):
+        raise HTTPException(status_code=404, detail=f"Strategy instance {name} not found")
+    
+    success = await strategy_manager.set_instance_running(name, False)
+    
+    if not success:
+        raise HTTPException(status_code=400, detail=f"Failed to stop strategy instance {name}")
+    
+    return {"message": f"Strategy instance {name} stopped"}
+
+@app.get("/workers")
+async def get_workers():
+    """Get the health and load of the strategy worker processes"""
+    return strategy_manager.get_workers_status()
+
+# Backtesting routes
+@app.post("/backtest/grid-sweep")
+async def grid_sweep(sweep: GridSweepModel):
+    """Evaluate grid trading parameter combinations over OHLCV bars"""
+    bars = sweep.bars
+    if bars is None:
+        if not sweep.exchange_id or not sweep.symbol:
+            raise HTTPException(status_code=400, detail="Either bars or exchange_id and symbol are required")
+        
+        exchange = config.get_exchange(sweep.exchange_id)
+        if not exchange:
+            raise HTTPException(status_code=404, detail=f"Exchange {sweep.exchange_id} not found")
+        
+        # Make sure the exchange is added to the manager
+        if exchange_manager.get_exchange(sweep.exchange_id) is None:
+            exchange_manager.add_exchange(exchange)
+        
+        bars = await exchange_manager.fetch_ohlcv(sweep.exchange_id, sweep.symbol, sweep.timeframe, sweep.since, sweep.limit)
+    
+    if len(bars) < 2:
+        raise HTTPException(status_code=400, detail="Not enough price data")
+    
+    combinations = grid_combinations(sweep.lower_prices, sweep.upper_prices, sweep.grid_levels, sweep.total_investments)
+    if not combinations:
+        raise HTTPException(status_code=400, detail="No valid parameter combinations")
+    
+    # The sweep blocks on its process pool, keep it off the event loop
+    loop = asyncio.get_running_loop()
+    results = await loop.run_in_executor(None, sweep_grid, bars, combinations, sweep.fee_rate, sweep.processes)
+    
+    if results and sweep.sort_by not in results[0]:
+        raise HTTPException(status_code=400, detail=f"Cannot sort by {sweep.sort_by}")
+    results.sort(key=lambda result: result[sweep.sort_by], reverse=sweep.sort_by != "max_drawdown_pct")
+    
+    return {
+        "bars": len(bars),
+        "combinations": len(combinations),
+        "results": results[:sweep.top] if sweep.top else results
+    }
+
+# Market history
+@app.get("/history")
+async def get_history():
+    """List the data sets in the local market history store"""
+    return history_store.list_datasets()
+
+@app.post("/history/backfill")
+async def start_backfill(request: BackfillModel):
+    """Download candles or public trades of markets into the history store in the background"""
+    global backfill, backfill_task
+    
+    if backfill_task and not backfill_task.done():
+        raise HTTPException(status_code=409, detail="A backfill is already running")
+    
+    for market in request.markets:
+        if "exchange_id" not in market or "symbol" not in market:
+            raise HTTPException(status_code=400, detail="Markets need an exchange_id and a symbol")
+        
+        exchange = config.get_exchange(market["exchange_id"])
+        if not exchange:
+            raise HTTPException(status_code=404, detail=f"Exchange {market['exchange_id']} not found")
+        
+        # Make sure the exchange is added to the manager
+        if exchange_manager.get_exchange(market["exchange_id"]) is None:
+            exchange_manager.add_exchange(exchange)
+    
+    jobs = [
+        {
+            "kind": kind,
+            "exchange_id": market["exchange_id"],
+            "symbol": market["symbol"],
+            "timeframe": request.timeframe,
+            "since": request.since,
+            "end": request.end
+        }
+        for market in request.markets
+        for kind in request.kinds
+    ]
+    backfill = Backfill(exchange_manager, jobs, page_limit=request.page_limit, concurrency=request.concurrency)
+    backfill_task = asyncio.ensure_future(backfill.run())
+    return {"message": f"Started backfill of {len(jobs)} data sets", "jobs": len(jobs)}
+
+@app.get("/history/backfill")
+async def get_backfill():
+    """Get the progress of the last backfill"""
+    if not backfill:
+        raise HTTPException(status_code=404, detail="No backfill has been started")
+    return backfill.get_status()
 
 # Configuration routes
 @app.get("/config")
@@ -381,6 +794,36 @@ async def update_config(config_data: Dict):
     
     return {"message": "Configuration updated successfully"}
 
+# Market data bus
+@app.get("/market-bus")
+async def get_market_bus():
+    """Get the state of the shared memory market data bus"""
+    if not exchange_manager.market_bus:
+        return {"enabled": False}
+    return {"enabled": True, **exchange_manager.market_bus.get_status()}
+
+# Strategy state store
+@app.get("/state-store")
+async def get_state_store():
+    """Get the path, staged writes and commit counters of the strategy state store"""
+    if not exchange_manager.state_store:
+        return {"enabled": False}
+    return {"enabled": True, **exchange_manager.state_store.get_status()}
+
+# Market data recorder
+@app.get("/recorder")
+async def get_recorder():
+    """Get the recorded markets and the recorder's overhead"""
+    if not exchange_manager.recorder:
+        return {"enabled": False}
+    return {"enabled": True, **exchange_manager.recorder.get_status()}
+
+# Cache statistics
+@app.get("/cache/tickers")
+async def get_ticker_cache_stats():
+    """Get ticker cache hit, miss and coalesce counters"""
+    return exchange_manager.get_ticker_cache_stats()
+
 # Supported exchanges
 @app.get("/supported-exchanges")
 async def get_supported_exchanges():
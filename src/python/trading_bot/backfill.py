@@ -0,0 +1,435 @@
+import os
+import json
+import time
+import logging
+import asyncio
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List, Optional, Any, Tuple
+from config import DATA_DIR
+from history_store import HistoryStore, history_store
+import metrics
+
+logger = logging.getLogger("backfill")
+
+# Progress of all backfill jobs, so an interrupted run resumes
+BACKFILL_CHECKPOINT = DATA_DIR / "backfill.json"
+
+# ccxt method and capability of each kind of history
+FETCH_METHODS = {
+    "ohlcv": ("fetch_ohlcv", "fetchOHLCV"),
+    "trades": ("fetch_trades", "fetchTrades")
+}
+
+def job_key(job: Dict) -> str:
+    """
+    Get the checkpoint key of a backfill job
+    
+    Args:
+        job: Job with kind, exchange_id, symbol and for candles timeframe
+        
+    Returns:
+        str: Key, e.g. ohlcv:binance:BTC/USDT:1m
+    """
+    key = f"{job['kind']}:{job['exchange_id']}:{job['symbol']}"
+    if job["kind"] == "ohlcv":
+        key += f":{job.get('timeframe', '1m')}"
+    return key
+
+class Backfill:
+    """
+    Resumable bulk download of candles and public trades into the history store
+    
+    Every job pages forward from its start time through one market's
+    history. Jobs run concurrently and send their requests through the
+    ExchangeManager in the lowest priority rate limiter lane, so each
+    exchange is paged at its own rate limit and live trading requests are
+    always served first. Rows are written to the store on a dedicated
+    thread, one page after the other, so disk writes neither block the
+    event loop nor reorder a data set. After every page the job's cursor is
+    saved to a checkpoint file; running the same jobs again continues from there, and
+    finished jobs are extended up to the new end time.
+    """
+    def __init__(
+        self,
+        exchange_manager: Any,
+        jobs: List[Dict],
+        store: HistoryStore = history_store,
+        checkpoint_path: Path = BACKFILL_CHECKPOINT,
+        page_limit: int = 1000,
+        concurrency: int = 4,
+        retries: int = 5
+    ):
+        """
+        Initialize the download
+        
+        Args:
+            exchange_manager: Exchange manager instance
+            jobs: Dicts with kind ("ohlcv" or "trades"), exchange_id, symbol, since (ms),
+                and optionally end (ms, defaults to now) and timeframe (candles, defaults to 1m)
+            store: History store to write to
+            checkpoint_path: JSON file holding the progress of each job
+            page_limit: Rows requested per page
+            concurrency: Requests in flight per exchange
+            retries: Attempts per page before a job gives up
+        """
+        self.exchange_manager = exchange_manager
+        self.jobs = jobs
+        self.store = store
+        self.checkpoint_path = Path(checkpoint_path)
+        self.page_limit = page_limit
+        self.concurrency = concurrency
+        self.retries = retries
+        
+        self.semaphores: Dict[str, asyncio.Semaphore] = {}
+        # One thread keeps the appends of each data set in order
+        self.writer: Optional[ThreadPoolExecutor] = None
+        # Candles per page of exchanges returning fewer than page_limit
+        self.page_sizes: Dict[str, int] = {}
+        self.state: Dict[str, Dict] = self._load_checkpoint()
+        # Saves queue behind the write in progress and coalesce
+        self.checkpoint_lock = asyncio.Lock()
+        self.checkpoint_dirty = False
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+    
+    def _load_checkpoint(self) -> Dict[str, Dict]:
+        """
+        Read the progress saved by earlier runs
+        
+        Returns:
+            Dict[str, Dict]: Job key to job state
+        """
+        if not self.checkpoint_path.exists():
+            return {}
+        
+        try:
+            with open(self.checkpoint_path) as f:
+                return json.load(f)
+        except Exception as e:
+            logger.error(f"Failed to read backfill checkpoint {self.checkpoint_path}: {str(e)}")
+            return {}
+    
+    async def _save_checkpoint(self) -> None:
+        """
+        Write the progress of all jobs off the event loop
+        
+        The state is kept in memory and serialized on the loop, so the file
+        always holds a consistent snapshot. Saves requested while a write is
+        in progress are merged into one write of the latest state.
+        """
+        self.checkpoint_dirty = True
+        async with self.checkpoint_lock:
+            if not self.checkpoint_dirty:
+                return
+            self.checkpoint_dirty = False
+            data = json.dumps(self.state, indent=2)
+            await asyncio.get_running_loop().run_in_executor(None, self._write_checkpoint, data)
+    
+    def _write_checkpoint(self, data: str) -> None:
+        """
+        Replace the checkpoint file atomically, runs in an executor thread
+        
+        Args:
+            data: Serialized state
+        """
+        self.checkpoint_path.parent.mkdir(exist_ok=True, parents=True)
+        temporary = self.checkpoint_path.with_suffix(".tmp")
+        with open(temporary, "w") as f:
+            f.write(data)
+        os.replace(temporary, self.checkpoint_path)
+    
+    def _prepare(self, job: Dict, now: int) -> Dict:
+        """
+        Get the state of a job, resuming a saved one
+        
+        Args:
+            job: Job definition
+            now: Current time in milliseconds
+            
+        Returns:
+            Dict: Job state
+        """
+        end = int(job.get("end") or now)
+        state = self.state.get(job_key(job))
+        if state and state["start"] <= job["since"]:
+            state["end"] = max(state["end"], end)
+            state["done"] = state["cursor"] >= state["end"]
+            state["error"] = None
+            return state
+        
+        return {
+            "kind": job["kind"],
+            "exchange_id": job["exchange_id"],
+            "symbol": job["symbol"],
+            "timeframe": job.get("timeframe", "1m") if job["kind"] == "ohlcv" else None,
+            "start": int(job["since"]),
+            "end": end,
+            "cursor": int(job["since"]),
+            # Trade IDs at the cursor's timestamp that are already stored
+            "boundary_ids": [],
+            "pages": 0,
+            "rows": 0,
+            "done": False,
+            "error": None
+        }
+    
+    async def run(self) -> Dict:
+        """
+        Run all jobs until they are done or failed
+        
+        Returns:
+            Dict: Status of the download, see get_status
+        """
+        self.started_at = time.time()
+        self.finished_at = None
+        now = int(self.started_at * 1000)
+        for job in self.jobs:
+            self.state[job_key(job)] = self._prepare(job, now)
+        
+        self.writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="backfill-writer")
+        try:
+            await asyncio.gather(*(self._run_job(job_key(job)) for job in self.jobs))
+        finally:
+            # Every append was awaited, so nothing is left to wait for
+            self.writer.shutdown(wait=False)
+            self.writer = None
+        await self._save_checkpoint()
+        
+        self.finished_at = time.time()
+        status = self.get_status()
+        logger.info(
+            f"Backfill finished in {self.finished_at - self.started_at:.1f}s: "
+            f"{status['rows']} rows, {status['done']} of {len(self.jobs)} jobs done"
+        )
+        return status
+    
+    async def _run_job(self, key: str) -> None:
+        """
+        Page through the history of one job
+        
+        Args:
+            key: Job key
+        """
+        state = self.state[key]
+        exchange_id = state["exchange_id"]
+        exchange = self.exchange_manager.get_exchange(exchange_id)
+        if not exchange:
+            state["error"] = f"Exchange {exchange_id} not found"
+            logger.error(state["error"])
+            return
+        
+        if not self.exchange_manager.check_permission(exchange_id, "read_only"):
+            state["error"] = f"Exchange {exchange_id} does not have read_only permission"
+            logger.error(state["error"])
+            return
+        
+        method, capability = FETCH_METHODS[state["kind"]]
+        if not exchange.has.get(capability):
+            state["error"] = f"Exchange {exchange_id} does not support {method}"
+            logger.error(state["error"])
+            return
+        
+        self.semaphores.setdefault(exchange_id, asyncio.Semaphore(self.concurrency))
+        while not state["done"]:
+            try:
+                if state["kind"] == "ohlcv":
+                    pages, written = await self._backfill_ohlcv(state, exchange.parse_timeframe(state["timeframe"]) * 1000)
+                else:
+                    page = await self._fetch(exchange_id, method, (state["symbol"], state["cursor"], self.page_limit))
+                    pages, written = 1, await self._store_trades(state, page)
+            except Exception as e:
+                state["error"] = str(e)
+                logger.error(f"Backfill of {key} stopped at {state['cursor']}: {str(e)}")
+                await self._save_checkpoint()
+                return
+            
+            state["pages"] += pages
+            state["rows"] += written
+            state["done"] = state["cursor"] >= state["end"]
+            metrics.backfill_rows.inc(written, exchange=exchange_id, kind=state["kind"])
+            await self._save_checkpoint()
+        
+        logger.info(f"Backfill of {key} done: {state['rows']} rows in {state['pages']} pages")
+    
+    async def _fetch(self, exchange_id: str, method: str, args: tuple) -> List:
+        """
+        Fetch one page, retrying with exponential backoff
+        
+        Args:
+            exchange_id: ID of the exchange
+            method: ccxt method
+            args: Method arguments
+            
+        Returns:
+            List: Candles or trades
+        """
+        for attempt in range(self.retries):
+            try:
+                async with self.semaphores[exchange_id]:
+                    return await self.exchange_manager._call(exchange_id, method, *args, lane="backfill")
+            except Exception as e:
+                if attempt == self.retries - 1:
+                    raise
+                delay = min(2 ** attempt, 60)
+                logger.warning(f"{method} on {exchange_id} failed, retrying in {delay}s: {str(e)}")
+                await asyncio.sleep(delay)
+    
+    async def _append(self, method: str, exchange_id: str, symbol: str, rows: List) -> int:
+        """
+        Append rows to the history store on the writer thread
+        
+        Args:
+            method: HistoryStore append method, e.g. append_ohlcv
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            rows: Rows as returned by ccxt
+            
+        Returns:
+            int: Number of rows written
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.writer, getattr(self.store, method), exchange_id, symbol, rows)
+    
+    async def _backfill_ohlcv(self, state: Dict, timeframe_ms: int) -> Tuple[int, int]:
+        """
+        Download the next windows of candles concurrently and write them in order
+        
+        Candle pages cover fixed time windows, so up to ``concurrency``
+        consecutive windows are requested at once instead of one page after
+        the other.
+        
+        Args:
+            state: Job state
+            timeframe_ms: Candle period in milliseconds
+            
+        Returns:
+            Tuple of (pages fetched, rows written)
+        """
+        span = self.page_sizes.get(state["exchange_id"], self.page_limit) * timeframe_ms
+        starts = range(state["cursor"], state["end"], span)[:self.concurrency]
+        windows = await asyncio.gather(*(
+            self._fetch_window(state, start, min(start + span, state["end"]), timeframe_ms)
+            for start in starts
+        ))
+        
+        written = 0
+        for _, candles in windows:
+            written += await self._append("append_ohlcv", state["exchange_id"], state["symbol"], candles)
+        state["cursor"] = min(starts[-1] + span, state["end"])
+        return sum(pages for pages, _ in windows), written
+    
+    async def _fetch_window(self, state: Dict, start: int, stop: int, timeframe_ms: int) -> Tuple[int, List[List[float]]]:
+        """
+        Fetch the candles of one time window
+        
+        A page that ends early is followed up from its last candle: either
+        the exchange returns fewer candles per page than requested, in which
+        case later windows are shrunk to its page size, or the market had
+        no candles there.
+        
+        Args:
+            state: Job state
+            start: First timestamp in milliseconds
+            stop: End of the window in milliseconds, exclusive
+            timeframe_ms: Candle period in milliseconds
+            
+        Returns:
+            Tuple of (pages fetched, candles sorted by timestamp)
+        """
+        exchange_id = state["exchange_id"]
+        candles = []
+        pages = 0
+        since = start
+        while since < stop:
+            page = await self._fetch(exchange_id, "fetch_ohlcv", (state["symbol"], state["timeframe"], since, self.page_limit))
+            pages += 1
+            rows = sorted((candle for candle in page if since <= candle[0] < stop), key=lambda candle: candle[0])
+            if not rows:
+                break
+            
+            if candles:
+                # The previous page was cut short by the exchange
+                self.page_sizes[exchange_id] = min(self.page_sizes.get(exchange_id, self.page_limit), page_size)
+            candles.extend(rows)
+            page_size = len(page)
+            since = int(rows[-1][0]) + timeframe_ms
+            
+            # The page went past the window, so the window is complete
+            if len(page) > len(rows):
+                break
+        return pages, candles
+    
+    async def _store_trades(self, state: Dict, page: List[Dict]) -> int:
+        """
+        Write a page of trades and move the cursor to the last one
+        
+        Trades sharing a timestamp can span pages, so the next page starts
+        at the last timestamp and the IDs already stored there are skipped.
+        
+        Args:
+            state: Job state
+            page: Trades
+            
+        Returns:
+            int: Number of rows written
+        """
+        cursor, end = state["cursor"], state["end"]
+        boundary = set(state["boundary_ids"])
+        trades = sorted(
+            (
+                trade for trade in page
+                if trade.get("timestamp") is not None
+                and cursor <= trade["timestamp"] < end
+                and not (trade["timestamp"] == cursor and str(trade.get("id")) in boundary)
+            ),
+            key=lambda trade: trade["timestamp"]
+        )
+        
+        if not trades:
+            if len(page) >= self.page_limit and all(trade.get("timestamp") == cursor for trade in page):
+                # A full page within one millisecond, skip ahead
+                state["cursor"] = cursor + 1
+                state["boundary_ids"] = []
+            else:
+                # No newer trades, or the exchange only serves recent ones
+                state["cursor"] = end
+            return 0
+        
+        written = await self._append("append_trades", state["exchange_id"], state["symbol"], trades)
+        
+        # The cursor only moves past trades that are stored
+        last = trades[-1]["timestamp"]
+        ids = [str(trade.get("id")) for trade in trades if trade["timestamp"] == last]
+        state["boundary_ids"] = (state["boundary_ids"] if last == cursor else []) + ids
+        state["cursor"] = last
+        return written
+    
+    def get_status(self) -> Dict:
+        """
+        Get the progress of the download
+        
+        Returns:
+            Dict: Totals and per job cursor, rows, pages, progress, done flag and error
+        """
+        jobs = []
+        for job in self.jobs:
+            state = self.state.get(job_key(job))
+            if not state:
+                continue
+            span = max(state["end"] - state["start"], 1)
+            jobs.append({
+                **{name: value for name, value in state.items() if name != "boundary_ids"},
+                "progress_pct": min(100.0, (state["cursor"] - state["start"]) / span * 100)
+            })
+        
+        return {
+            "running": self.started_at is not None and self.finished_at is None,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "rows": sum(job["rows"] for job in jobs),
+            "pages": sum(job["pages"] for job in jobs),
+            "done": sum(1 for job in jobs if job["done"]),
+            "failed": sum(1 for job in jobs if job["error"]),
+            "jobs": jobs
+        }
\ No newline at end of file
@@ -0,0 +1,885 @@
+import time
+import bisect
+import logging
+import asyncio
+import numpy as np
+import ccxt.async_support as ccxt
+from typing import Dict, List, Optional, Any, Tuple, Type, Union
+from config import ExchangeConfig
+from exchange_manager import ExchangeManager
+from market_index import MarketIndex
+from base_strategy import BaseStrategy
+from clock import VirtualClock
+
+logger = logging.getLogger("backtest")
+
+# Bar columns as returned by ccxt fetch_ohlcv
+TIMESTAMP, OPEN, HIGH, LOW, CLOSE, VOLUME = range(6)
+
+class SimulatedMarket:
+    """
+    Minute (or any period) OHLCV bars of one market
+    """
+    def __init__(self, symbol: str, bars: Union[np.ndarray, List[List[float]]]):
+        """
+        Initialize the market
+        
+        Args:
+            symbol: Market symbol (e.g. BTC/USDT)
+            bars: Rows of [timestamp_ms, open, high, low, close, volume] sorted by time
+        """
+        bars = np.asarray(bars, dtype=np.float64)
+        if bars.ndim != 2 or bars.shape[1] < 6 or not len(bars):
+            raise ValueError(f"Bars for {symbol} must be a non-empty array of [timestamp, open, high, low, close, volume] rows")
+        
+        self.symbol = symbol
+        self.base, self.quote = symbol.split(":")[0].split("/")
+        self.times = bars[:, TIMESTAMP] / 1000.0
+        self.open = bars[:, OPEN]
+        self.high = bars[:, HIGH]
+        self.low = bars[:, LOW]
+        self.close = bars[:, CLOSE]
+        self.volume = bars[:, VOLUME]
+        # Number of bars visible at the simulated time
+        self.position = 0
+    
+    def advance_to(self, now: float) -> None:
+        """
+        Make all bars up to a time visible
+        
+        Args:
+            now: Simulated Unix time
+        """
+        self.position = int(np.searchsorted(self.times, now, side="right"))
+    
+    def last_index(self) -> int:
+        """
+        Get the index of the latest visible bar
+        
+        Returns:
+            int: Bar index, the first bar before the data starts
+        """
+        return max(self.position - 1, 0)
+    
+    def to_market(self) -> Dict:
+        """
+        Describe the market like ccxt fetch_markets
+        
+        Returns:
+            Dict: Market
+        """
+        return {
+            "id": self.symbol.replace("/", ""),
+            "symbol": self.symbol,
+            "base": self.base,
+            "quote": self.quote,
+            "type": "spot",
+            "spot": True,
+            "active": True
+        }
+
+class SimulatedExchange:
+    """
+    In-memory exchange matching limit orders against OHLCV bars
+    
+    Exposes the subset of the ccxt exchange interface ExchangeManager calls.
+    Resting limit orders fill at their limit price on the first bar whose
+    range reaches it; market and marketable orders fill immediately at the
+    simulated bid or ask. Fills are not limited by bar volume.
+    """
+    def __init__(
+        self,
+        exchange_id: str,
+        markets: Dict[str, SimulatedMarket],
+        balances: Dict[str, float],
+        clock: VirtualClock,
+        fee_rate: float = 0.001,
+        spread: float = 0.0
+    ):
+        """
+        Initialize the exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            markets: Symbol to market data
+            balances: Currency to initial free balance
+            clock: Simulated clock
+            fee_rate: Fee as a fraction of the traded cost, charged in quote currency
+            spread: Relative bid/ask spread around the bar close
+        """
+        self.id = exchange_id
+        self.markets = markets
+        self.clock = clock
+        self.fee_rate = fee_rate
+        self.spread = spread
+        self.has = {
+            "createOrders": True,
+            "cancelOrders": True,
+            "fetchOrder": True,
+            "fetchOpenOrders": True,
+            "fetchClosedOrders": True,
+            "fetchMyTrades": True,
+            "fetchOrderBook": False,
+            "ws": False
+        }
+        
+        self.balances: Dict[str, Dict[str, float]] = {
+            currency: {"free": float(amount), "used": 0.0} for currency, amount in balances.items()
+        }
+        # Orders in creation order, with their creation times for range queries
+        self.orders: Dict[str, Dict] = {}
+        self.order_times: List[int] = []
+        self.locked: Dict[str, float] = {}
+        self.open_ids: Dict[str, List[str]] = {symbol: [] for symbol in markets}
+        self.trades: List[Dict] = []
+        self.next_id = 1
+    
+    def _market(self, symbol: str) -> SimulatedMarket:
+        market = self.markets.get(symbol)
+        if market is None:
+            raise ccxt.BadSymbol(f"{self.id} does not have market symbol {symbol}")
+        return market
+    
+    def _balance(self, currency: str) -> Dict[str, float]:
+        return self.balances.setdefault(currency, {"free": 0.0, "used": 0.0})
+    
+    def _now_ms(self) -> int:
+        return int(self.clock.time() * 1000)
+    
+    def fetch_ticker(self, symbol: str) -> Dict:
+        """
+        Get the ticker of the latest visible bar
+        
+        Args:
+            symbol: Market symbol
+            
+        Returns:
+            Dict: Ticker with bid and ask around the close
+        """
+        market = self._market(symbol)
+        i = market.last_index()
+        close = float(market.close[i])
+        half_spread = close * self.spread / 2
+        return {
+            "symbol": symbol,
+            "timestamp": int(market.times[i] * 1000),
+            "bid": close - half_spread,
+            "ask": close + half_spread,
+            "last": close,
+            "high": float(market.high[i]),
+            "low": float(market.low[i]),
+            "baseVolume": float(market.volume[i])
+        }
+    
+    def fetch_markets(self) -> List[Dict]:
+        return [market.to_market() for market in self.markets.values()]
+    
+    def fetch_balance(self) -> Dict:
+        """
+        Get the balances like ccxt fetch_balance
+        
+        Returns:
+            Dict: Balance
+        """
+        balance = {"info": {}, "free": {}, "used": {}, "total": {}}
+        for currency, entry in self.balances.items():
+            total = entry["free"] + entry["used"]
+            balance[currency] = {"free": entry["free"], "used": entry["used"], "total": total}
+            balance["free"][currency] = entry["free"]
+            balance["used"][currency] = entry["used"]
+            balance["total"][currency] = total
+        return balance
+    
+    def create_order(
+        self,
+        symbol: str,
+        order_type: str,
+        side: str,
+        amount: float,
+        price: Optional[float] = None,
+        params: Optional[Dict] = None
+    ) -> Dict:
+        """
+        Place an order, filling it right away if it is marketable
+        
+        Args:
+            symbol: Market symbol
+            order_type: Order type (limit, market)
+            side: Order side (buy, sell)
+            amount: Order amount in base currency
+            price: Limit price
+            params: Ignored
+            
+        Returns:
+            Dict: Order
+        """
+        market = self._market(symbol)
+        if amount <= 0:
+            raise ccxt.InvalidOrder(f"Invalid amount {amount}")
+        if order_type == "limit" and not price:
+            raise ccxt.InvalidOrder("Limit orders require a price")
+        
+        ticker = self.fetch_ticker(symbol)
+        touch = ticker["ask"] if side == "buy" else ticker["bid"]
+        marketable = order_type == "market" or (price >= touch if side == "buy" else price <= touch)
+        
+        # Buys lock quote currency at the price they can fill at, sells lock base currency
+        lock_price = touch if order_type == "market" else price
+        currency, locked = (market.quote, amount * lock_price) if side == "buy" else (market.base, amount)
+        balance = self._balance(currency)
+        if locked > balance["free"] * (1 + 1e-12):
+            raise ccxt.InsufficientFunds(f"Insufficient {currency} for {side} {amount} {symbol}: {balance['free']} free")
+        balance["free"] -= locked
+        balance["used"] += locked
+        
+        order_id = str(self.next_id)
+        self.next_id += 1
+        timestamp = self._now_ms()
+        order = {
+            "id": order_id,
+            "clientOrderId": None,
+            "timestamp": timestamp,
+            "lastTradeTimestamp": None,
+            "symbol": symbol,
+            "type": order_type,
+            "side": side,
+            "price": price if order_type == "limit" else None,
+            "amount": amount,
+            "filled": 0.0,
+            "remaining": amount,
+            "cost": 0.0,
+            "average": None,
+            "status": "open",
+            "fee": None
+        }
+        self.orders[order_id] = order
+        self.order_times.append(timestamp)
+        self.locked[order_id] = locked
+        
+        if marketable:
+            self._fill(order, touch, timestamp)
+        else:
+            self.open_ids[symbol].append(order_id)
+        return dict(order)
+    
+    def create_orders(self, orders: List[Dict]) -> List[Dict]:
+        """
+        Place several orders, rejected ones are returned without an id
+        
+        Args:
+            orders: Orders as dicts with symbol, type, side, amount, price and optional params
+            
+        Returns:
+            List[Dict]: One order per request
+        """
+        results = []
+        for request in orders:
+            try:
+                results.append(self.create_order(
+                    request["symbol"], request["type"], request["side"],
+                    request["amount"], request.get("price"), request.get("params")
+                ))
+            except ccxt.BaseError as e:
+                results.append({"id": None, "info": str(e)})
+        return results
+    
+    def _fill(self, order: Dict, price: float, timestamp: int) -> None:
+        """
+        Fill the remainder of an order and settle the balances
+        
+        Args:
+            order: Internal order
+            price: Fill price
+            timestamp: Fill time in milliseconds
+        """
+        market = self.markets[order["symbol"]]
+        amount = order["remaining"]
+        cost = amount * price
+        fee = cost * self.fee_rate
+        
+        if order["side"] == "buy":
+            quote = self._balance(market.quote)
+            quote["used"] -= self.locked[order["id"]]
+            quote["free"] += self.locked[order["id"]] - cost - fee
+            self._balance(market.base)["free"] += amount
+        else:
+            self._balance(market.base)["used"] -= self.locked[order["id"]]
+            self._balance(market.quote)["free"] += cost - fee
+        
+        order.update({
+            "filled": order["amount"],
+            "remaining": 0.0,
+            "cost": cost,
+            "average": price,
+            "status": "closed",
+            "lastTradeTimestamp": timestamp,
+            "fee": {"cost": fee, "currency": market.quote}
+        })
+        self.locked[order["id"]] = 0.0
+        self.trades.append({
+            "id": str(len(self.trades) + 1),
+            "order": order["id"],
+            "timestamp": timestamp,
+            "symbol": order["symbol"],
+            "side": order["side"],
+            "price": price,
+            "amount": amount,
+            "cost": cost,
+            "fee": {"cost": fee, "currency": market.quote},
+            "takerOrMaker": "taker" if order["timestamp"] == timestamp else "maker"
+        })
+    
+    def next_fill_time(self, until: float) -> Optional[float]:
+        """
+        Find when the first resting order fills, without filling it
+        
+        The bars after the visible ones and up to ``until`` are scanned at
+        once: running minima of the lows and maxima of the highs turn the
+        first crossing of each limit price into a binary search.
+        
+        Args:
+            until: Simulated Unix time to scan up to
+            
+        Returns:
+            float: Time of the bar with the first fill, or None if nothing fills
+        """
+        first = None
+        for symbol, order_ids in self.open_ids.items():
+            if not order_ids:
+                continue
+            market = self.markets[symbol]
+            start = market.position
+            stop = int(np.searchsorted(market.times, until, side="right"))
+            if stop <= start:
+                continue
+            
+            sides = np.array([self.orders[order_id]["side"] == "buy" for order_id in order_ids])
+            prices = np.array([self.orders[order_id]["price"] for order_id in order_ids])
+            crossings = np.full(len(order_ids), stop - start)
+            
+            if sides.any():
+                lows = np.minimum.accumulate(market.low[start:stop])
+                crossings[sides] = np.searchsorted(-lows, -prices[sides], side="left")
+            if (~sides).any():
+                highs = np.maximum.accumulate(market.high[start:stop])
+                crossings[~sides] = np.searchsorted(highs, prices[~sides], side="left")
+            
+            crossing = int(crossings.min())
+            if crossing < stop - start:
+                fill_time = float(market.times[start + crossing])
+                first = fill_time if first is None else min(first, fill_time)
+        return first
+    
+    def advance_to(self, now: float) -> List[Dict]:
+        """
+        Move to a time, filling the resting orders its bars reach
+        
+        Args:
+            now: Simulated Unix time
+            
+        Returns:
+            List[Dict]: Orders filled on the way
+        """
+        filled = []
+        for symbol, market in self.markets.items():
+            start = market.position
+            market.advance_to(now)
+            order_ids = self.open_ids[symbol]
+            if not order_ids or market.position <= start:
+                continue
+            
+            low = market.low[start:market.position].min()
+            high = market.high[start:market.position].max()
+            remaining = []
+            for order_id in order_ids:
+                order = self.orders[order_id]
+                if (order["side"] == "buy" and low <= order["price"]) or (order["side"] == "sell" and high >= order["price"]):
+                    self._fill(order, order["price"], int(market.times[market.position - 1] * 1000))
+                    filled.append(dict(order))
+                else:
+                    remaining.append(order_id)
+            self.open_ids[symbol] = remaining
+        return filled
+    
+    def _get_order(self, order_id: str) -> Dict:
+        order = self.orders.get(str(order_id))
+        if order is None:
+            raise ccxt.OrderNotFound(f"Order {order_id} not found")
+        return order
+    
+    def cancel_order(self, order_id: str, symbol: Optional[str] = None) -> Dict:
+        """
+        Cancel an open order
+        
+        Args:
+            order_id: ID of the order
+            symbol: Ignored
+            
+        Returns:
+            Dict: Cancelled order
+        """
+        order = self._get_order(order_id)
+        if order["status"] != "open":
+            raise ccxt.OrderNotFound(f"Order {order_id} is {order['status']}")
+        
+        market = self.markets[order["symbol"]]
+        balance = self._balance(market.quote if order["side"] == "buy" else market.base)
+        balance["free"] += self.locked[order["id"]]
+        balance["used"] -= self.locked[order["id"]]
+        order["status"] = "canceled"
+        self.locked[order["id"]] = 0.0
+        self.open_ids[order["symbol"]].remove(order["id"])
+        return dict(order)
+    
+    def cancel_orders(self, order_ids: List[str], symbol: Optional[str] = None) -> List[Dict]:
+        results = []
+        for order_id in order_ids:
+            try:
+                results.append(self.cancel_order(order_id, symbol))
+            except ccxt.OrderNotFound:
+                pass
+        return results
+    
+    def cancel_all_orders(self, symbol: Optional[str] = None) -> List[Dict]:
+        order_ids = [
+            order_id for market_symbol, ids in self.open_ids.items()
+            if symbol is None or market_symbol == symbol for order_id in ids
+        ]
+        return self.cancel_orders(order_ids, symbol)
+    
+    def fetch_order(self, order_id: str, symbol: Optional[str] = None) -> Dict:
+        return dict(self._get_order(order_id))
+    
+    def _query(
+        self,
+        symbol: Optional[str],
+        since: Optional[int],
+        limit: Optional[int],
+        statuses: Tuple[str, ...]
+    ) -> List[Dict]:
+        orders = list(self.orders.values())
+        if since is not None:
+            orders = orders[bisect.bisect_left(self.order_times, since):]
+        orders = [
+            dict(order) for order in orders
+            if order["status"] in statuses and (symbol is None or order["symbol"] == symbol)
+        ]
+        return orders[-limit:] if limit else orders
+    
+    def fetch_orders(self, symbol: Optional[str] = None, since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        return self._query(symbol, since, limit, ("open", "closed", "canceled"))
+    
+    def fetch_open_orders(self, symbol: Optional[str] = None, since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        order_ids = [
+            order_id for market_symbol, ids in self.open_ids.items()
+            if symbol is None or market_symbol == symbol for order_id in ids
+        ]
+        orders = [dict(self.orders[order_id]) for order_id in order_ids]
+        return [order for order in orders if since is None or order["timestamp"] >= since]
+    
+    def fetch_closed_orders(self, symbol: Optional[str] = None, since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        return self._query(symbol, since, limit, ("closed", "canceled"))
+    
+    def fetch_my_trades(self, symbol: Optional[str] = None, since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
+        trades = [
+            dict(trade) for trade in self.trades
+            if (symbol is None or trade["symbol"] == symbol) and (since is None or trade["timestamp"] >= since)
+        ]
+        return trades[-limit:] if limit else trades
+    
+    async def close(self) -> None:
+        pass
+
+class SimulatedExchangeManager(ExchangeManager):
+    """
+    Exchange manager backed by simulated exchanges and a virtual clock
+    
+    All public methods keep the signatures of ExchangeManager, so
+    strategies run against it unchanged. Exchange calls go straight to the
+    SimulatedExchange without rate limiting, caching or network access.
+    ``advance`` is installed as the clock's advance callback and moves the
+    market data forward whenever a strategy waits.
+    """
+    def __init__(
+        self,
+        data: Dict[str, Dict[str, Union[np.ndarray, List[List[float]]]]],
+        balances: Dict[str, Dict[str, float]],
+        clock: VirtualClock,
+        fee_rate: float = 0.001,
+        spread: float = 0.0
+    ):
+        """
+        Initialize the simulated exchanges
+        
+        Args:
+            data: Exchange ID to symbol to OHLCV bars
+            balances: Exchange ID to currency to initial balance
+            clock: Virtual clock shared with the strategy
+            fee_rate: Fee as a fraction of the traded cost
+            spread: Relative bid/ask spread around the bar close
+        """
+        super().__init__()
+        self.clock = clock
+        self.subscribed: Dict[Tuple[str, str], int] = {}
+        
+        for exchange_id, symbols in data.items():
+            markets = {symbol: SimulatedMarket(symbol, bars) for symbol, bars in symbols.items()}
+            for market in markets.values():
+                market.advance_to(clock.time())
+            
+            exchange = SimulatedExchange(exchange_id, markets, balances.get(exchange_id, {}), clock, fee_rate, spread)
+            self.exchanges[exchange_id] = exchange
+            self.exchange_configs[exchange_id] = ExchangeConfig(
+                exchange_id=exchange_id,
+                name=exchange_id,
+                permission_level="read_write"
+            )
+            self.balance_tracker.update(exchange_id, exchange.fetch_balance())
+    
+    def add_exchange(self, config: ExchangeConfig) -> bool:
+        logger.error("Exchanges cannot be added to a simulation")
+        return False
+    
+    async def _call(self, exchange_id: str, method: str, *args, lane: Optional[str] = None, **kwargs) -> Any:
+        """
+        Call a method of a simulated exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            method: Name of the ccxt method to call
+            lane: Ignored
+            
+        Returns:
+            Any: Result of the exchange method
+        """
+        return getattr(self.exchanges[exchange_id], method)(*args, **kwargs)
+    
+    async def load_market_index(self, exchange_id: str, reload: bool = False) -> Optional[MarketIndex]:
+        exchange = self.get_exchange(exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {exchange_id} not found")
+            return None
+        
+        if exchange_id not in self.market_indexes:
+            self.market_indexes[exchange_id] = MarketIndex(exchange_id, exchange.fetch_markets(), self.clock.time())
+        return self.market_indexes[exchange_id]
+    
+    async def fetch_ticker(self, exchange_id: str, symbol: str, max_age: Optional[float] = None) -> Dict:
+        exchange = self.get_exchange(exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {exchange_id} not found")
+            return {}
+        
+        try:
+            return exchange.fetch_ticker(symbol)
+        except Exception as e:
+            logger.error(f"Failed to fetch ticker for {symbol} from {exchange_id}: {str(e)}")
+            return {}
+    
+    def get_ticker_age(self, exchange_id: str, symbol: str) -> Optional[float]:
+        return 0.0 if exchange_id in self.exchanges else None
+    
+    def _subscribe(self, kind: str, exchange_id: str, symbol: str, **feed_params) -> bool:
+        """
+        Push the ticker of a market to the quote store on every bar
+        
+        Order books are not simulated.
+        
+        Args:
+            kind: "ticker" or "order_book"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        exchange = self.get_exchange(exchange_id)
+        if kind != "ticker" or not exchange or symbol not in exchange.markets:
+            logger.error(f"Cannot simulate {kind} of {symbol} on {exchange_id}")
+            return False
+        
+        key = (exchange_id, symbol)
+        self.subscribed[key] = self.subscribed.get(key, 0) + 1
+        self.quote_store.put_ticker(exchange_id, symbol, exchange.fetch_ticker(symbol))
+        return True
+    
+    async def _unsubscribe(self, kind: str, exchange_id: str, symbol: str) -> bool:
+        key = (exchange_id, symbol)
+        if kind != "ticker" or key not in self.subscribed:
+            return False
+        
+        self.subscribed[key] -= 1
+        if self.subscribed[key] <= 0:
+            del self.subscribed[key]
+            self.quote_store.discard(kind, exchange_id, symbol)
+        return True
+    
+    def get_subscriptions(self) -> List[Dict]:
+        return [
+            {"kind": "ticker", "exchange_id": exchange_id, "symbol": symbol, "subscribers": count}
+            for (exchange_id, symbol), count in self.subscribed.items()
+        ]
+    
+    def track_balances(self, exchange_id: str) -> bool:
+        # Fills update the balance tracker directly, see advance
+        return exchange_id in self.exchanges
+    
+    async def untrack_balances(self, exchange_id: str) -> bool:
+        return exchange_id in self.exchanges
+    
+    def advance(self, now: float, target: float) -> float:
+        """
+        Move the market data from ``now`` towards ``target``
+        
+        Stops early at the first bar that fills a resting order, so the fill
+        listeners wake the strategy at the time the fill happened. While
+        tickers are subscribed and someone listens to the quote store, each
+        step covers at most one bar so quote triggers fire on time.
+        
+        Args:
+            now: Current simulated Unix time
+            target: Time the strategy waits until
+            
+        Returns:
+            float: Simulated time reached
+        """
+        if self.subscribed and self.quote_store.listeners:
+            next_bars = [
+                market.times[market.position]
+                for exchange in self.exchanges.values()
+                for market in exchange.markets.values()
+                if market.position < len(market.times)
+            ]
+            if next_bars:
+                target = min(target, max(now, float(min(next_bars))))
+        
+        fill_times = [exchange.next_fill_time(target) for exchange in self.exchanges.values()]
+        fill_times = [fill_time for fill_time in fill_times if fill_time is not None]
+        reached = min(fill_times + [target])
+        
+        for exchange_id, exchange in self.exchanges.items():
+            filled = exchange.advance_to(reached)
+            for order in filled:
+                self.balance_tracker.on_order(exchange_id, order)
+            if filled:
+                # Fees are not known to the tracker, sync the balances like a snapshot would
+                self.balance_tracker.update(exchange_id, exchange.fetch_balance())
+        
+        for exchange_id, symbol in self.subscribed:
+            self.quote_store.put_ticker(exchange_id, symbol, self.exchanges[exchange_id].fetch_ticker(symbol))
+        return reached
+
+class Backtester:
+    """
+    Replays OHLCV bars through an unchanged strategy
+    
+    The strategy runs on the normal asyncio event loop with a
+    SimulatedExchangeManager and a VirtualClock, so its timer ticks, event
+    triggers and order handling are exactly those of live trading while
+    simulated time jumps from one deadline or fill to the next.
+    """
+    def __init__(
+        self,
+        strategy_class: Union[str, Type[BaseStrategy]],
+        parameters: Dict,
+        data: Dict[str, Dict[str, Union[np.ndarray, List[List[float]]]]],
+        balances: Dict[str, Dict[str, float]],
+        fee_rate: float = 0.001,
+        spread: float = 0.0,
+        log_level: int = logging.WARNING
+    ):
+        """
+        Initialize the backtest
+        
+        Args:
+            strategy_class: Strategy class or strategy ID
+            parameters: Strategy parameters
+            data: Exchange ID to symbol to OHLCV bars [timestamp_ms, open, high, low, close, volume]
+            balances: Exchange ID to currency to initial balance
+            fee_rate: Fee as a fraction of the traded cost
+            spread: Relative bid/ask spread around the bar close
+            log_level: Level of the strategy's logger, per-tick logs slow replays down
+        """
+        if isinstance(strategy_class, str):
+            from strategy_manager import strategy_manager
+            strategy_id = strategy_class
+            strategy_class = strategy_manager.get_strategy_class(strategy_id)
+            if not strategy_class:
+                raise ValueError(f"Strategy {strategy_id} not found")
+        
+        self.strategy_class = strategy_class
+        self.parameters = parameters
+        self.data = data
+        self.balances = balances
+        self.fee_rate = fee_rate
+        self.spread = spread
+        self.log_level = log_level
+    
+    def _time_range(self) -> Tuple[float, float]:
+        times = [np.asarray(bars, dtype=np.float64)[:, TIMESTAMP] for symbols in self.data.values() for bars in symbols.values()]
+        if not times:
+            raise ValueError("No market data")
+        return min(float(t[0]) for t in times) / 1000.0, max(float(t[-1]) for t in times) / 1000.0
+    
+    async def run(self) -> Dict:
+        """
+        Run the strategy over the whole data set
+        
+        Returns:
+            Dict: Results with fills, balances, equity curve and performance
+        """
+        started_at = time.monotonic()
+        start, end = self._time_range()
+        clock = VirtualClock(start, end)
+        manager = SimulatedExchangeManager(self.data, self.balances, clock, self.fee_rate, self.spread)
+        clock.advance = manager.advance
+        
+        strategy = self.strategy_class(manager, dict(self.parameters))
+        strategy.logger.setLevel(self.log_level)
+        strategy.start()
+        task = strategy.task
+        finished = asyncio.ensure_future(clock.finished.wait())
+        
+        try:
+            await asyncio.wait([task, finished], return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            if strategy.running:
+                strategy.stop()
+            finished.cancel()
+            await asyncio.gather(task, finished, return_exceptions=True)
+        
+        if clock.now < end:
+            logger.warning(f"Strategy stopped at {clock.now} before the end of the data at {end}")
+        
+        results = self._results(manager, strategy)
+        results["duration"] = time.monotonic() - started_at
+        logger.info(
+            f"Backtest of {strategy.get_strategy_id()} replayed {results['bars']} bars "
+            f"with {len(results['trades'])} fills in {results['duration']:.2f}s"
+        )
+        return results
+    
+    def _results(self, manager: SimulatedExchangeManager, strategy: BaseStrategy) -> Dict:
+        """
+        Summarize a finished run
+        
+        Args:
+            manager: Simulated exchange manager
+            strategy: Stopped strategy
+            
+        Returns:
+            Dict: Results
+        """
+        trades = [
+            dict(trade, exchange_id=exchange_id)
+            for exchange_id, exchange in manager.exchanges.items()
+            for trade in exchange.trades
+        ]
+        trades.sort(key=lambda trade: trade["timestamp"])
+        
+        times, equity = self.equity_curve(manager)
+        initial_value, final_value = float(equity[0]), float(equity[-1])
+        peaks = np.maximum.accumulate(equity)
+        drawdowns = np.where(peaks > 0, equity / np.where(peaks > 0, peaks, 1) - 1, 0.0)
+        
+        return {
+            "strategy_id": strategy.get_strategy_id(),
+            "parameters": self.parameters,
+            "start": float(times[0]),
+            "end": float(times[-1]),
+            "bars": int(sum(len(market.times) for exchange in manager.exchanges.values() for market in exchange.markets.values())),
+            "trades": trades,
+            "fees": float(sum(trade["fee"]["cost"] for trade in trades)),
+            "balances": {
+                exchange_id: {currency: entry["total"] for currency, entry in manager.balance_tracker.get_balances(exchange_id).items()}
+                for exchange_id in manager.exchanges
+            },
+            "initial_value": initial_value,
+            "final_value": final_value,
+            "return_pct": (final_value / initial_value - 1) * 100 if initial_value else 0.0,
+            "max_drawdown_pct": float(drawdowns.min()) * -100,
+            "equity": {"times": times.tolist(), "values": equity.tolist()},
+            "performance": strategy.get_performance()
+        }
+    
+    def equity_curve(self, manager: SimulatedExchangeManager) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the account value at every bar of the first market
+        
+        Balances are rebuilt from the initial balances and the cumulative
+        fills, and valued at each bar's close in the quote currency of the
+        first market. Currencies without a market against it count as zero.
+        
+        Args:
+            manager: Simulated exchange manager after the run
+            
+        Returns:
+            Tuple of (times, values) arrays
+        """
+        exchanges = list(manager.exchanges.values())
+        first = next(iter(exchanges[0].markets.values()))
+        times = first.times
+        valuation = first.quote
+        equity = np.zeros(len(times))
+        
+        for exchange in exchanges:
+            currencies = set(self.balances.get(exchange.id, {})) | {
+                currency for market in exchange.markets.values() for currency in (market.base, market.quote)
+            }
+            for currency in currencies:
+                if currency == valuation:
+                    prices = np.ones(len(times))
+                else:
+                    market = next((
+                        market for candidate in exchanges for market in candidate.markets.values()
+                        if market.base == currency and market.quote == valuation
+                    ), None)
+                    if market is None:
+                        continue
+                    indexes = np.maximum(np.searchsorted(market.times, times, side="right") - 1, 0)
+                    prices = market.close[indexes]
+                
+                trade_times, deltas = [], []
+                for trade in exchange.trades:
+                    market = exchange.markets[trade["symbol"]]
+                    sign = 1 if trade["side"] == "buy" else -1
+                    if currency == market.base:
+                        delta = sign * trade["amount"]
+                    elif currency == market.quote:
+                        delta = -sign * trade["cost"] - trade["fee"]["cost"]
+                    else:
+                        continue
+                    trade_times.append(trade["timestamp"] / 1000.0)
+                    deltas.append(delta)
+                
+                holdings = np.full(len(times), float(self.balances.get(exchange.id, {}).get(currency, 0.0)))
+                if deltas:
+                    cumulative = np.concatenate(([0.0], np.cumsum(deltas)))
+                    holdings += cumulative[np.searchsorted(trade_times, times, side="right")]
+                equity += holdings * prices
+        
+        return times, equity
+
+async def run_backtest(
+    strategy_class: Union[str, Type[BaseStrategy]],
+    parameters: Dict,
+    data: Dict[str, Dict[str, Union[np.ndarray, List[List[float]]]]],
+    balances: Dict[str, Dict[str, float]],
+    fee_rate: float = 0.001,
+    spread: float = 0.0
+) -> Dict:
+    """
+    Backtest a strategy on OHLCV bars
+    
+    Args:
+        strategy_class: Strategy class or strategy ID
+        parameters: Strategy parameters
+        data: Exchange ID to symbol to OHLCV bars [timestamp_ms, open, high, low, close, volume]
+        balances: Exchange ID to currency to initial balance
+        fee_rate: Fee as a fraction of the traded cost
+        spread: Relative bid/ask spread around the bar close
+        
+    Returns:
+        Dict: Results, see Backtester.run
+    """
+    return await Backtester(strategy_class, parameters, data, balances, fee_rate, spread).run()
\ No newline at end of file
@@ -0,0 +1,307 @@
+import time
+import logging
+from typing import Dict, List, Optional, Any, Tuple, Callable
+
+logger = logging.getLogger("balance_tracker")
+
+# Order statuses after which nothing stays reserved
+FINAL_STATUSES = ("closed", "canceled", "cancelled", "expired", "rejected")
+
+class BalanceTracker:
+    """
+    Locally maintained free and used balances per exchange and currency
+    
+    Balances are seeded from exchange snapshots and then kept current from
+    our own order activity: placing an order moves the funds it locks from
+    free to used, fills move them to the other currency, and cancellation
+    frees the remainder. Snapshots taken later reconcile any drift (fees,
+    deposits, activity outside the bot).
+    """
+    def __init__(self):
+        self.balances: Dict[str, Dict[str, Dict[str, float]]] = {}
+        self.reservations: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.synced_at: Dict[str, float] = {}
+        self.listeners: List[Callable[[str, Dict], None]] = []
+    
+    def add_listener(self, listener: Callable[[str, Dict], None]) -> None:
+        """
+        Register a callback for fills of tracked orders
+        
+        Args:
+            listener: Called as listener(exchange_id, order) whenever an order's filled amount grows
+        """
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, Dict], None]) -> None:
+        """
+        Unregister a callback
+        
+        Args:
+            listener: Previously registered callback
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    @staticmethod
+    def _currencies(symbol: str) -> Tuple[str, str]:
+        """
+        Split a symbol into its base and quote currency
+        
+        Args:
+            symbol: Market symbol (e.g. BTC/USDT or BTC/USDT:USDT)
+            
+        Returns:
+            Tuple of (base, quote)
+        """
+        base, quote = symbol.split(":")[0].split("/")
+        return base, quote
+    
+    def _adjust(self, exchange_id: str, currency: str, free: float = 0.0, used: float = 0.0) -> None:
+        """
+        Shift the free and used balance of a currency
+        
+        Args:
+            exchange_id: ID of the exchange
+            currency: Currency code
+            free: Change of the free balance
+            used: Change of the used balance
+        """
+        balance = self.balances.setdefault(exchange_id, {}).setdefault(
+            currency, {"free": 0.0, "used": 0.0, "total": 0.0}
+        )
+        balance["free"] += free
+        balance["used"] += used
+        balance["total"] = balance["free"] + balance["used"]
+    
+    def update(self, exchange_id: str, balance: Dict, requested_at: Optional[float] = None) -> None:
+        """
+        Replace the balances of an exchange with a snapshot
+        
+        Reservations made after the snapshot was requested are not reflected
+        in it yet and are applied on top.
+        
+        Args:
+            exchange_id: ID of the exchange
+            balance: Balance as returned by ccxt fetch_balance
+            requested_at: time.monotonic() when the snapshot was requested
+        """
+        currencies = {}
+        for currency, entry in balance.items():
+            if currency in ("info", "free", "used", "total", "timestamp", "datetime") or not isinstance(entry, dict):
+                continue
+            free = entry.get("free") or 0.0
+            used = entry.get("used") or 0.0
+            currencies[currency] = {"free": free, "used": used, "total": free + used}
+        
+        self.balances[exchange_id] = currencies
+        self.synced_at[exchange_id] = time.monotonic()
+        
+        if requested_at is not None:
+            for (reservation_exchange, _), reservation in self.reservations.items():
+                if reservation_exchange == exchange_id and reservation["created_at"] > requested_at:
+                    self._adjust(exchange_id, reservation["currency"], free=-reservation["amount"], used=reservation["amount"])
+    
+    def get_free(self, exchange_id: str, currency: str) -> Optional[float]:
+        """
+        Get the free balance of a currency
+        
+        Args:
+            exchange_id: ID of the exchange
+            currency: Currency code
+            
+        Returns:
+            float: Free balance or None if the exchange was never synced
+        """
+        if exchange_id not in self.synced_at:
+            return None
+        return self.balances.get(exchange_id, {}).get(currency, {}).get("free", 0.0)
+    
+    def get_balances(self, exchange_id: str) -> Dict[str, Dict[str, float]]:
+        """
+        Get all tracked balances of an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            
+        Returns:
+            Dict: Currency to free, used and total balance
+        """
+        return {currency: dict(entry) for currency, entry in self.balances.get(exchange_id, {}).items()}
+    
+    def get_age(self, exchange_id: str) -> Optional[float]:
+        """
+        Get the time since the last snapshot of an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            
+        Returns:
+            float: Age in seconds or None if never synced
+        """
+        synced_at = self.synced_at.get(exchange_id)
+        if synced_at is None:
+            return None
+        return time.monotonic() - synced_at
+    
+    def reserve(
+        self,
+        exchange_id: str,
+        order_id: str,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: Optional[float]
+    ) -> None:
+        """
+        Lock the funds of a newly placed order
+        
+        Buys lock quote currency at the order price and sells lock base
+        currency. Market buys without a known price are left to the next
+        snapshot.
+        
+        Args:
+            exchange_id: ID of the exchange
+            order_id: ID of the order
+            symbol: Market symbol
+            side: Order side (buy, sell)
+            amount: Order amount in base currency
+            price: Order price
+        """
+        base, quote = self._currencies(symbol)
+        if side == "buy":
+            if not price:
+                return
+            currency, reserved = quote, amount * price
+        else:
+            currency, reserved = base, amount
+        
+        self.reservations[(exchange_id, str(order_id))] = {
+            "symbol": symbol,
+            "side": side,
+            "price": price,
+            "base": base,
+            "quote": quote,
+            "currency": currency,
+            "amount": reserved,
+            "filled": 0.0,
+            "created_at": time.monotonic()
+        }
+        self._adjust(exchange_id, currency, free=-reserved, used=reserved)
+    
+    def release(self, exchange_id: str, order_id: str) -> None:
+        """
+        Free whatever an order still has locked
+        
+        Args:
+            exchange_id: ID of the exchange
+            order_id: ID of the order
+        """
+        reservation = self.reservations.pop((exchange_id, str(order_id)), None)
+        if reservation and reservation["amount"] > 0:
+            self._adjust(exchange_id, reservation["currency"], free=reservation["amount"], used=-reservation["amount"])
+    
+    def get_reserved_ids(self, exchange_id: str, symbol: str) -> List[str]:
+        """
+        Get the orders holding reservations on one market
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            List[str]: Order IDs
+        """
+        return [
+            order_id for (reservation_exchange, order_id), reservation in self.reservations.items()
+            if reservation_exchange == exchange_id and reservation["symbol"] == symbol
+        ]
+    
+    def release_symbol(self, exchange_id: str, symbol: str) -> List[str]:
+        """
+        Free everything locked by orders on one market
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            List[str]: IDs of the released orders
+        """
+        order_ids = self.get_reserved_ids(exchange_id, symbol)
+        for order_id in order_ids:
+            self.release(exchange_id, order_id)
+        return order_ids
+    
+    def on_order(self, exchange_id: str, order: Dict) -> None:
+        """
+        Apply an observed order state
+        
+        Newly filled amounts are moved between the base and quote currency,
+        and the remainder is released once the order is final.
+        
+        Args:
+            exchange_id: ID of the exchange
+            order: Order as returned by ccxt
+        """
+        order_id = order.get("id")
+        reservation = self.reservations.get((exchange_id, str(order_id)))
+        if not reservation:
+            return
+        
+        filled = order.get("filled") or 0.0
+        delta = filled - reservation["filled"]
+        if delta > 0:
+            fill_price = order.get("average") or order.get("price") or reservation["price"] or 0.0
+            if reservation["side"] == "buy":
+                consumed = min(reservation["amount"], delta * reservation["price"])
+                # Price improvement returns the difference to the free balance
+                self._adjust(exchange_id, reservation["quote"], free=consumed - delta * fill_price, used=-consumed)
+                self._adjust(exchange_id, reservation["base"], free=delta)
+            else:
+                consumed = min(reservation["amount"], delta)
+                self._adjust(exchange_id, reservation["base"], free=consumed - delta, used=-consumed)
+                self._adjust(exchange_id, reservation["quote"], free=delta * fill_price)
+            reservation["amount"] -= consumed
+            reservation["filled"] = filled
+            
+            for listener in list(self.listeners):
+                try:
+                    listener(exchange_id, order)
+                except Exception as e:
+                    logger.error(f"Balance tracker listener failed: {str(e)}")
+        
+        if order.get("status") in FINAL_STATUSES:
+            self.release(exchange_id, order_id)
+    
+    def forget(self, exchange_id: str) -> None:
+        """
+        Drop all state of an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+        """
+        self.balances.pop(exchange_id, None)
+        self.synced_at.pop(exchange_id, None)
+        for key in [key for key in self.reservations if key[0] == exchange_id]:
+            del self.reservations[key]
+    
+    def get_status(self, exchange_id: str) -> Dict:
+        """
+        Get the tracked state of an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            
+        Returns:
+            Dict: Balances, snapshot age and open reservations
+        """
+        return {
+            "exchange_id": exchange_id,
+            "age": self.get_age(exchange_id),
+            "balances": self.get_balances(exchange_id),
+            "reservations": [
+                {"order_id": order_id, **{key: value for key, value in reservation.items() if key != "created_at"}}
+                for (reservation_exchange, order_id), reservation in self.reservations.items()
+                if reservation_exchange == exchange_id
+            ]
+        }
\ No newline at end of file
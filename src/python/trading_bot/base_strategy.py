@@ -1,8 +1,12 @@
 import time
+import random
 import logging
 import asyncio
 from abc import ABC, abstractmethod
 from typing import Dict, List, Optional, Any, ClassVar, Type
+import metrics
+from clock import SYSTEM_CLOCK
+from ledger import Ledger
 
 # Configure logging
 logging.basicConfig(
@@ -89,17 +93,38 @@ class BaseStrategy(ABC):
         """
         self.exchange_manager = exchange_manager
         self.parameters = parameters or {}
-        self.logger = logging.getLogger(f"strategy.{self.get_strategy_id()}")
+        # Simulated exchange managers bring their own clock
+        self.clock = getattr(exchange_manager, "clock", None) or SYSTEM_CLOCK
+        self.instance_id = self.get_strategy_id()
+        self.logger = logging.getLogger(f"strategy.{self.instance_id}")
         self.running = False
         self.task = None
         self.start_time = None
         self.last_update_time = None
-        self.performance = {
-            "trades": 0,
-            "profit_loss": 0.0,
-            "win_rate": 0.0,
-            "max_drawdown": 0.0
-        }
+        self.ledger = Ledger(clock=self.clock)
+        
+        # Scheduler state
+        self.next_tick_at = None
+        self.wake_event = asyncio.Event()
+        self.pending_events = set()
+        self.last_trigger = None
+        self.ticking = False
+        self.missed_ticks = 0
+        self.watchers = []
+        self.quote_refs = {}
+    
+    def set_instance_id(self, instance_id: str) -> None:
+        """
+        Name this instance of the strategy
+        
+        The name labels the instance's logs and metrics, so several
+        instances of the same strategy can be told apart.
+        
+        Args:
+            instance_id: Instance name
+        """
+        self.instance_id = instance_id
+        self.logger = logging.getLogger(f"strategy.{instance_id}")
     
     def get_parameters(self) -> Dict:
         """
@@ -132,10 +157,12 @@ class BaseStrategy(ABC):
         """
         Get the strategy performance metrics
         
+        The ledger keeps them up to date on every fill, so this is a read.
+        
         Returns:
             Dict: Performance metrics
         """
-        return self.performance
+        return self.ledger.get_summary()
     
     def get_last_update_time(self) -> Optional[float]:
         """
@@ -155,8 +182,8 @@ class BaseStrategy(ABC):
             return
         
         self.running = True
-        self.start_time = time.time()
-        self.last_update_time = time.time()
+        self.start_time = self.clock.time()
+        self.last_update_time = self.clock.time()
         
         # Create a task to run the strategy
         loop = asyncio.get_event_loop()
@@ -180,27 +207,31 @@ class BaseStrategy(ABC):
         
         self.logger.info(f"Stopped strategy: {self.get_strategy_name()}")
     
+    def get_tick_interval(self) -> float:
+        """
+        Get the period of timer ticks
+        
+        Returns:
+            float: Tick interval in seconds
+        """
+        return self.parameters.get("tick_interval", 60)  # Default: 1 minute
+    
     async def _run(self) -> None:
         """
         Main loop for the strategy
+        
+        Timer ticks run at a fixed rate: slot n is due at start + n * interval
+        regardless of how long ticks take, and slots that passed while a tick
+        was running are skipped rather than run back to back. Events raised
+        with ``trigger`` run a tick immediately without moving the schedule.
         """
         try:
             await self.on_start()
             
+            self.next_tick_at = self.clock.monotonic()
             while self.running:
-                try:
-                    await self.tick()
-                    self.last_update_time = time.time()
-                    
-                    # Sleep for the tick interval
-                    tick_interval = self.parameters.get("tick_interval", 60)  # Default: 1 minute
-                    await asyncio.sleep(tick_interval)
-                
-                except asyncio.CancelledError:
-                    break
-                except Exception as e:
-                    self.logger.error(f"Error in strategy tick: {str(e)}")
-                    await asyncio.sleep(5)  # Sleep briefly before retrying
+                trigger = await self._wait_for_tick()
+                await self._run_tick(trigger)
             
             await self.on_stop()
         
@@ -209,6 +240,191 @@ class BaseStrategy(ABC):
         except Exception as e:
             self.logger.error(f"Fatal error in strategy: {str(e)}")
             self.running = False
+        finally:
+            self._remove_watchers()
+    
+    async def _wait_for_tick(self) -> str:
+        """
+        Wait for the next timer slot or an event
+        
+        The optional ``tick_jitter`` parameter delays each timer tick by a
+        random amount up to that many seconds, without accumulating.
+        
+        Returns:
+            str: "timer" or "event"
+        """
+        jitter = self.parameters.get("tick_jitter", 0)
+        jitter = random.uniform(0, jitter) if jitter else 0.0
+        delay = self.next_tick_at + jitter - self.clock.monotonic()
+        
+        if delay > 0 and not self.wake_event.is_set():
+            await self.clock.wait(self.wake_event, delay)
+        
+        if self.wake_event.is_set():
+            self.wake_event.clear()
+            self.last_trigger = sorted(self.pending_events)
+            self.pending_events.clear()
+            return "event"
+        
+        strategy = self.instance_id
+        interval = self.get_tick_interval()
+        lateness = max(0.0, self.clock.monotonic() - self.next_tick_at - jitter)
+        metrics.strategy_tick_lateness.observe(lateness, strategy=strategy)
+        
+        # Skip the slots that already passed instead of catching up
+        missed = int(lateness // interval)
+        if missed:
+            self.missed_ticks += missed
+            metrics.strategy_missed_ticks.inc(missed, strategy=strategy)
+        self.next_tick_at += (missed + 1) * interval
+        self.last_trigger = ["timer"]
+        return "timer"
+    
+    async def _run_tick(self, trigger: str) -> None:
+        """
+        Run one tick, recording its duration and errors
+        
+        Args:
+            trigger: "timer" or "event"
+        """
+        strategy = self.instance_id
+        started_at = time.monotonic()
+        self.ticking = True
+        
+        try:
+            await self.tick()
+            self.last_update_time = self.clock.time()
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            # The next slot is the retry, no fixed back-off
+            metrics.strategy_tick_errors.inc(strategy=strategy)
+            self.logger.error(f"Error in strategy tick: {str(e)}")
+        finally:
+            self.ticking = False
+            duration = time.monotonic() - started_at
+            metrics.strategy_tick_duration.observe(duration, strategy=strategy)
+            metrics.strategy_ticks.inc(strategy=strategy, trigger=trigger)
+            if duration > self.get_tick_interval():
+                metrics.strategy_tick_overruns.inc(strategy=strategy)
+    
+    def trigger(self, reason: str) -> None:
+        """
+        Run a tick as soon as possible
+        
+        Events raised while a tick is running cause one more tick right
+        after it; several events before a tick starts are coalesced.
+        
+        Args:
+            reason: Event name, exposed to the next tick as ``last_trigger``
+        """
+        self.pending_events.add(reason)
+        self.wake_event.set()
+    
+    def watch_quote(self, exchange_id: str, symbol: str, bps: float) -> None:
+        """
+        Trigger a tick when a market's mid price moves by ``bps`` basis points
+        
+        The move is measured from the price at the previous trigger. Requires
+        a ticker subscription so the quote store is kept up to date.
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            bps: Move in basis points that triggers a tick
+        """
+        key = (exchange_id, symbol)
+        
+        def listener(kind: str, update_exchange_id: str, update_symbol: str, ticker: Any) -> None:
+            if kind != "ticker" or (update_exchange_id, update_symbol) != key:
+                return
+            bid, ask = ticker.get("bid"), ticker.get("ask")
+            mid = (bid + ask) / 2 if bid and ask else ticker.get("last")
+            if not mid:
+                return
+            
+            reference = self.quote_refs.get(key)
+            if reference is None:
+                self.quote_refs[key] = mid
+            elif abs(mid / reference - 1) * 10000 >= bps:
+                self.quote_refs[key] = mid
+                self.trigger("quote_move")
+        
+        store = self.exchange_manager.quote_store
+        store.add_listener(listener)
+        self.watchers.append((store.remove_listener, listener))
+    
+    def watch_fills(self, exchange_id: str) -> None:
+        """
+        Trigger a tick when a tracked order on an exchange fills
+        
+        Fills observed by this strategy's own tick are not re-triggered.
+        
+        Args:
+            exchange_id: ID of the exchange
+        """
+        def listener(fill_exchange_id: str, order: Dict) -> None:
+            if fill_exchange_id == exchange_id and not self.ticking:
+                self.trigger("order_filled")
+        
+        tracker = self.exchange_manager.balance_tracker
+        tracker.add_listener(listener)
+        self.watchers.append((tracker.remove_listener, listener))
+    
+    def _remove_watchers(self) -> None:
+        """
+        Unregister all event listeners
+        """
+        for remove, listener in self.watchers:
+            remove(listener)
+        self.watchers = []
+        self.quote_refs = {}
+    
+    @property
+    def state_store(self) -> Optional[Any]:
+        """
+        Get the store persisting this instance's state, None if state is not persisted
+        """
+        return getattr(self.exchange_manager, "state_store", None)
+    
+    def save_state(self, key: str, value: Any) -> None:
+        """
+        Persist an item of state, committed in the background
+        
+        Args:
+            key: Key within this instance's state
+            value: JSON-serializable value
+        """
+        if self.state_store:
+            self.state_store.put(self.instance_id, key, value)
+    
+    def delete_state(self, key: str) -> None:
+        """
+        Remove an item of persisted state
+        
+        Args:
+            key: Key within this instance's state
+        """
+        if self.state_store:
+            self.state_store.delete(self.instance_id, key)
+    
+    def clear_state(self) -> None:
+        """
+        Remove all persisted state of this instance
+        """
+        if self.state_store:
+            self.state_store.clear(self.instance_id)
+    
+    async def load_state(self) -> Dict[str, Any]:
+        """
+        Read the state persisted by a previous run of this instance
+        
+        Returns:
+            Dict[str, Any]: Key to value, empty if state is not persisted
+        """
+        if not self.state_store:
+            return {}
+        return await self.state_store.load(self.instance_id)
     
     async def on_start(self) -> None:
         """
@@ -229,30 +445,56 @@ class BaseStrategy(ABC):
         """
         pass
     
-    def update_performance(self, trade_profit: float, is_win: bool) -> None:
+    def record_fill(
+        self,
+        exchange_id: str,
+        order: Dict,
+        symbol: Optional[str] = None,
+        side: Optional[str] = None,
+        amount: Optional[float] = None,
+        price: Optional[float] = None
+    ) -> float:
+        """
+        Book the filled part of an order in the ledger
+        
+        Values missing from the order fall back to the given ones. A fee
+        charged in the base currency is converted to the quote currency.
+        
+        Args:
+            exchange_id: ID of the exchange
+            order: Order as returned by the exchange
+            symbol: Market symbol
+            side: "buy" or "sell"
+            amount: Filled amount
+            price: Fill price
+            
+        Returns:
+            float: PnL realized by the fill, before fees
+        """
+        symbol = order.get("symbol") or symbol
+        side = order.get("side") or side
+        filled = order.get("filled")
+        amount = float(filled if filled is not None else amount or 0.0)
+        price = float(order.get("average") or order.get("price") or price or 0.0)
+        if not amount or not price:
+            return 0.0
+        
+        fee = 0.0
+        fee_info = order.get("fee") or {}
+        if fee_info.get("cost"):
+            fee = float(fee_info["cost"])
+            if fee_info.get("currency") and fee_info["currency"] == symbol.split("/")[0]:
+                fee *= price
+        
+        return self.ledger.record_fill(exchange_id, symbol, side, amount, price, fee)
+    
+    def mark_price(self, exchange_id: str, symbol: str, price: float) -> None:
         """
-        Update performance metrics with a new trade
+        Revalue the open position in a market
         
         Args:
-            trade_profit: Profit/loss from the trade
-            is_win: Whether the trade was a win
-        """
-        self.performance["trades"] += 1
-        self.performance["profit_loss"] += trade_profit
-        
-        # Update win rate
-        if is_win:
-            win_count = self.performance.get("win_count", 0) + 1
-            self.performance["win_count"] = win_count
-        else:
-            win_count = self.performance.get("win_count", 0)
-        
-        if self.performance["trades"] > 0:
-            self.performance["win_rate"] = (win_count / self.performance["trades"]) * 100
-        
-        # Update max drawdown
-        current_drawdown = min(0, self.performance["profit_loss"])
-        self.performance["max_drawdown"] = min(
-            self.performance.get("max_drawdown", 0),
-            current_drawdown
-        )
\ No newline at end of file
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            price: Current price
+        """
+        self.ledger.mark(exchange_id, symbol, price)
\ No newline at end of file
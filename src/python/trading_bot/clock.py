@@ -0,0 +1,108 @@
+import time
+import asyncio
+from typing import Optional, Callable
+
+class Clock:
+    """
+    Wall clock used by strategies
+    
+    Strategies read the time and wait through ``self.clock`` instead of
+    calling time.time or asyncio.sleep directly, so a backtest can replace
+    it with a VirtualClock.
+    """
+    def time(self) -> float:
+        """
+        Get the current Unix time
+        
+        Returns:
+            float: Seconds since the epoch
+        """
+        return time.time()
+    
+    def monotonic(self) -> float:
+        """
+        Get a monotonic timestamp for scheduling
+        
+        Returns:
+            float: Seconds
+        """
+        return time.monotonic()
+    
+    async def sleep(self, seconds: float) -> None:
+        """
+        Wait for a number of seconds
+        
+        Args:
+            seconds: Delay
+        """
+        await asyncio.sleep(seconds)
+    
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        """
+        Wait for an event with a timeout
+        
+        Args:
+            event: Event to wait for
+            timeout: Maximum wait in seconds
+            
+        Returns:
+            bool: True if the event was set, False on timeout
+        """
+        try:
+            await asyncio.wait_for(event.wait(), timeout=timeout)
+            return True
+        except asyncio.TimeoutError:
+            return event.is_set()
+
+class VirtualClock(Clock):
+    """
+    Simulated clock that jumps to the next deadline instead of waiting
+    
+    Time only moves when a strategy waits. Before each jump the ``advance``
+    callback (usually the simulated exchange) processes market data up to
+    the deadline and may stop early, e.g. at a fill that triggers an event.
+    Once the clock reaches ``end``, waiting blocks until the strategy is
+    cancelled.
+    """
+    def __init__(self, start: float, end: Optional[float] = None):
+        """
+        Initialize the clock
+        
+        Args:
+            start: Unix time to start at
+            end: Unix time at which the simulation is finished
+        """
+        self.now = start
+        self.end = end
+        self.advance: Optional[Callable[[float, float], float]] = None
+        self.finished = asyncio.Event()
+    
+    def time(self) -> float:
+        return self.now
+    
+    def monotonic(self) -> float:
+        return self.now
+    
+    async def sleep(self, seconds: float) -> None:
+        await self.wait(asyncio.Event(), seconds)
+    
+    async def wait(self, event: asyncio.Event, timeout: float) -> bool:
+        target = self.now + max(0.0, timeout)
+        while True:
+            # Let tasks woken by the last step run first
+            await asyncio.sleep(0)
+            if event.is_set():
+                return True
+            
+            if self.end is not None and self.now >= self.end:
+                self.finished.set()
+                await asyncio.Event().wait()
+            
+            if self.now >= target:
+                return False
+            
+            step = min(target, self.end) if self.end is not None else target
+            self.now = max(self.now, self.advance(self.now, step) if self.advance else step)
+
+# Clock of live trading
+SYSTEM_CLOCK = Clock()
\ No newline at end of file
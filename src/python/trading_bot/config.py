@@ -28,7 +28,15 @@ class ExchangeConfig:
         permission_level: PermissionLevel = "read_only",
         enabled: bool = True,
         test_mode: bool = False,
-        additional_params: Optional[Dict] = None
+        additional_params: Optional[Dict] = None,
+        pool_size: int = 10,
+        request_timeout: float = 10.0,
+        keepalive_timeout: float = 30.0,
+        ticker_ttl: float = 2.0,
+        requests_per_second: Optional[float] = None,
+        rate_limit_burst: float = 1.0,
+        markets_ttl: float = 86400.0,
+        balance_sync_interval: float = 30.0
     ):
         self.exchange_id = exchange_id
         self.name = name
@@ -39,6 +47,19 @@ class ExchangeConfig:
         self.enabled = enabled
         self.test_mode = test_mode
         self.additional_params = additional_params or {}
+        # HTTP connection pool settings (timeouts in seconds)
+        self.pool_size = pool_size
+        self.request_timeout = request_timeout
+        self.keepalive_timeout = keepalive_timeout
+        # How long a fetched ticker is served from cache (seconds)
+        self.ticker_ttl = ticker_ttl
+        # Request budget, defaults to the exchange's own ccxt rateLimit
+        self.requests_per_second = requests_per_second
+        self.rate_limit_burst = rate_limit_burst
+        # How long the on-disk market index is reused before re-downloading (seconds)
+        self.markets_ttl = markets_ttl
+        # How often tracked balances are reconciled with the exchange (seconds)
+        self.balance_sync_interval = balance_sync_interval
     
     def to_dict(self) -> Dict:
         return {
@@ -50,7 +71,15 @@ class ExchangeConfig:
             "permission_level": self.permission_level,
             "enabled": self.enabled,
             "test_mode": self.test_mode,
-            "additional_params": self.additional_params
+            "additional_params": self.additional_params,
+            "pool_size": self.pool_size,
+            "request_timeout": self.request_timeout,
+            "keepalive_timeout": self.keepalive_timeout,
+            "ticker_ttl": self.ticker_ttl,
+            "requests_per_second": self.requests_per_second,
+            "rate_limit_burst": self.rate_limit_burst,
+            "markets_ttl": self.markets_ttl,
+            "balance_sync_interval": self.balance_sync_interval
         }
     
     @classmethod
@@ -64,7 +93,15 @@ class ExchangeConfig:
             permission_level=data.get("permission_level", "read_only"),
             enabled=data.get("enabled", True),
             test_mode=data.get("test_mode", False),
-            additional_params=data.get("additional_params", {})
+            additional_params=data.get("additional_params", {}),
+            pool_size=data.get("pool_size", 10),
+            request_timeout=data.get("request_timeout", 10.0),
+            keepalive_timeout=data.get("keepalive_timeout", 30.0),
+            ticker_ttl=data.get("ticker_ttl", 2.0),
+            requests_per_second=data.get("requests_per_second"),
+            rate_limit_burst=data.get("rate_limit_burst", 1.0),
+            markets_ttl=data.get("markets_ttl", 86400.0),
+            balance_sync_interval=data.get("balance_sync_interval", 30.0)
         )
 
 class TradingBotConfig:
@@ -73,11 +110,14 @@ class TradingBotConfig:
         exchanges: List[ExchangeConfig] = None,
         active_strategy: Optional[str] = None,
         strategy_params: Optional[Dict] = None,
-        global_settings: Optional[Dict] = None
+        global_settings: Optional[Dict] = None,
+        strategy_instances: Optional[List[Dict]] = None
     ):
         self.exchanges = exchanges or []
         self.active_strategy = active_strategy
         self.strategy_params = strategy_params or {}
+        # Named strategy instances: name, strategy_id, parameters, autostart
+        self.strategy_instances = strategy_instances or []
         self.global_settings = global_settings or {
             "log_level": "INFO",
             "max_order_age_seconds": 60 * 60 * 24,  # 24 hours
@@ -87,6 +127,12 @@ class TradingBotConfig:
             "default_leverage": 1,
             "default_position_mode": "one-way",
             "default_slippage_tolerance": 0.01,  # 1%
+            "strategy_workers": 0,  # Worker processes for strategy instances, 0 runs them in-process
+            "market_bus": False,  # Publish quotes to shared memory for local processes
+            "market_bus_name": None,  # Shared memory segment name, None derives it from the pid
+            "recorder_markets": [],  # {"exchange_id", "symbol"} pairs whose quotes are recorded to disk
+            "recorder_order_book_depth": 10,  # Order book levels recorded per side
+            "state_store": True,  # Persist strategy state in SQLite and adopt open orders on restart
         }
     
     def to_dict(self) -> Dict:
@@ -94,6 +140,7 @@ class TradingBotConfig:
             "exchanges": [exchange.to_dict() for exchange in self.exchanges],
             "active_strategy": self.active_strategy,
             "strategy_params": self.strategy_params,
+            "strategy_instances": self.strategy_instances,
             "global_settings": self.global_settings
         }
     
@@ -103,7 +150,8 @@ class TradingBotConfig:
             exchanges=[ExchangeConfig.from_dict(exchange) for exchange in data.get("exchanges", [])],
             active_strategy=data.get("active_strategy"),
             strategy_params=data.get("strategy_params", {}),
-            global_settings=data.get("global_settings", {})
+            global_settings=data.get("global_settings", {}),
+            strategy_instances=data.get("strategy_instances", [])
         )
     
     def save(self, filename: str = "config.json") -> None:
@@ -146,6 +194,18 @@ class TradingBotConfig:
             if exchange.exchange_id == exchange_id:
                 return exchange
         return None
+    
+    def add_strategy_instance(self, instance: Dict) -> None:
+        """Add or update a strategy instance configuration"""
+        for i, existing in enumerate(self.strategy_instances):
+            if existing["name"] == instance["name"]:
+                self.strategy_instances[i] = instance
+                return
+        self.strategy_instances.append(instance)
+    
+    def remove_strategy_instance(self, name: str) -> None:
+        """Remove a strategy instance configuration"""
+        self.strategy_instances = [instance for instance in self.strategy_instances if instance["name"] != name]
 
 # Default supported exchanges
 DEFAULT_EXCHANGES = [
@@ -2,13 +2,15 @@ import time
 import json
 import hmac
 import hashlib
-import requests
 from typing import Dict, List, Optional, Any, Union
-import ccxt
+import ccxt.async_support as ccxt
 
 class TradeOgre(ccxt.Exchange):
     """
     Custom implementation of the TradeOgre exchange API
+    
+    Built on the asyncio flavour of ccxt so requests go through the shared
+    aiohttp session instead of blocking the event loop.
     """
     id = 'tradeogre'
     name = 'TradeOgre'
@@ -26,6 +28,7 @@ class TradeOgre(ccxt.Exchange):
         'fetchOpenOrders': True,
         'fetchMyTrades': False,
         'fetchMarkets': True,
+        'fetchCurrencies': False,
     }
     urls = {
         'logo': 'https://tradeogre.com/images/ogre.png',
@@ -56,25 +59,22 @@ class TradeOgre(ccxt.Exchange):
         },
     }
     
-    def __init__(self, config={}):
-        super().__init__(config)
-        self.markets_by_id = {}
-        self.currencies_by_id = {}
-    
     def sign(self, path, api='public', method='GET', params={}, headers=None, body=None):
-        url = self.urls['api'] + '/' + path
+        url = self.urls['api'] + '/' + self.implode_params(path, params)
+        params = self.omit(params, self.extract_params(path))
+        headers = headers or {}
         
         if api == 'private':
             self.check_required_credentials()
-            auth = {'Authorization': 'Basic ' + self.apiKey + ':' + self.secret}
-            headers = {**headers, **auth} if headers else auth
+            credentials = self.string_to_base64(self.apiKey + ':' + self.secret)
+            headers['Authorization'] = 'Basic ' + credentials
         
         if method == 'GET':
             if params:
                 url += '?' + self.urlencode(params)
         elif method == 'POST':
-            body = self.json(params)
-            headers['Content-Type'] = 'application/json'
+            body = self.urlencode(params)
+            headers['Content-Type'] = 'application/x-www-form-urlencoded'
         
         return {'url': url, 'method': method, 'body': body, 'headers': headers}
     
@@ -87,7 +87,7 @@ class TradeOgre(ccxt.Exchange):
             raise ccxt.ExchangeError(f"{self.id} error: {error}")
     
     async def fetch_markets(self, params={}):
-        response = await self.publicGetMarkets(params)
+        response = await self.request('markets', 'public', 'GET', params)
         result = []
         
         for market_id, data in response.items():
@@ -99,6 +99,8 @@ class TradeOgre(ccxt.Exchange):
                 'symbol': symbol,
                 'base': base,
                 'quote': quote,
+                'type': 'spot',
+                'spot': True,
                 'active': True,
                 'precision': {
                     'price': 8,
@@ -122,7 +124,7 @@ class TradeOgre(ccxt.Exchange):
     async def fetch_ticker(self, symbol, params={}):
         await self.load_markets()
         market = self.market(symbol)
-        response = await self.publicGetTickerMarket({'market': market['id']})
+        response = await self.request('ticker/{market}', 'public', 'GET', {'market': market['id']})
         
         return {
             'symbol': symbol,
@@ -150,28 +152,31 @@ class TradeOgre(ccxt.Exchange):
     async def fetch_order_book(self, symbol, limit=None, params={}):
         await self.load_markets()
         market = self.market(symbol)
-        response = await self.publicGetOrdersMarket({'market': market['id']})
+        response = await self.request('orders/{market}', 'public', 'GET', {'market': market['id']})
         
         return {
             'symbol': symbol,
             'timestamp': self.milliseconds(),
             'datetime': self.iso8601(self.milliseconds()),
             'nonce': None,
-            'bids': self.parse_bids_asks(response.get('buy', []), 'price', 'quantity'),
+            'bids': self.parse_bids_asks(response.get('buy', []), 'price', 'quantity', descending=True),
             'asks': self.parse_bids_asks(response.get('sell', []), 'price', 'quantity'),
         }
     
-    def parse_bids_asks(self, bidasks, price_key='price', amount_key='quantity'):
-        result = []
-        for bidask in bidasks:
-            price = self.safe_float(bidask, price_key)
-            amount = self.safe_float(bidask, amount_key)
-            result.append([price, amount])
-        return result
+    def parse_bids_asks(self, bidasks, price_key='price', amount_key='quantity', descending=False):
+        # TradeOgre returns each side as a {price: quantity} map
+        if isinstance(bidasks, dict):
+            levels = [[float(price), float(amount)] for price, amount in bidasks.items()]
+        else:
+            levels = [[self.safe_float(bidask, price_key), self.safe_float(bidask, amount_key)] for bidask in bidasks]
+        
+        # Best price first, as ccxt order books are
+        levels.sort(key=lambda level: level[0], reverse=descending)
+        return levels
     
     async def fetch_balance(self, params={}):
         await self.load_markets()
-        response = await self.privateGetAccountBalances(params)
+        response = await self.request('account/balances', 'private', 'GET', params)
         
         result = {'info': response}
         
@@ -196,8 +201,8 @@ class TradeOgre(ccxt.Exchange):
             'price': price,
         }
         
-        method = 'privatePostAccountBuy' if side == 'buy' else 'privatePostAccountSell'
-        response = await getattr(self, method)(self.extend(request, params))
+        path = 'account/buy' if side == 'buy' else 'account/sell'
+        response = await self.request(path, 'private', 'POST', self.extend(request, params))
         
         return {
             'id': response.get('uuid'),
@@ -215,7 +220,7 @@ class TradeOgre(ccxt.Exchange):
             'uuid': id,
         }
         
-        response = await self.privatePostAccountCancel(self.extend(request, params))
+        response = await self.request('account/cancel', 'private', 'POST', self.extend(request, params))
         
         return {
             'id': id,
@@ -226,13 +231,13 @@ class TradeOgre(ccxt.Exchange):
     
     async def fetch_open_orders(self, symbol=None, since=None, limit=None, params={}):
         await self.load_markets()
-        response = await self.privateGetAccountOrders(params)
+        response = await self.request('account/orders', 'private', 'GET', params)
         
         result = []
         for order_id, order in response.items():
             market_id = order.get('market')
-            market = self.markets_by_id[market_id] if market_id in self.markets_by_id else None
-            symbol = market['symbol'] if market else None
+            # markets_by_id is filled by load_markets/set_markets
+            symbol = self.safe_market(market_id, None, '-')['symbol'] if market_id else None
             
             result.append({
                 'id': order_id,
@@ -2,10 +2,28 @@ import os
 import time
 import json
 import logging
-import ccxt
 import asyncio
-from typing import Dict, List, Optional, Any, Union
+import aiohttp
+import ccxt.async_support as ccxt
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Union, Tuple
 from config import ExchangeConfig, PermissionLevel
+from ticker_cache import TickerCache
+from rate_limiter import TokenBucket, ExchangeThrottle, request_lane
+from market_data import QuoteStore, MarketDataFeed
+from order_book import OrderBook
+from market_index import MarketIndex
+from balance_tracker import BalanceTracker
+from market_bus import MarketDataBus
+from recorder import MarketRecorder
+from state_store import StateStore, STATE_DB
+import metrics
+
+# Websocket support is optional, feeds fall back to REST polling without it
+try:
+    import ccxt.pro as ccxtpro
+except ImportError:
+    ccxtpro = None
 
 # Configure logging
 logging.basicConfig(
@@ -14,14 +32,45 @@ logging.basicConfig(
 )
 logger = logging.getLogger("exchange_manager")
 
+# Rate limiter lane for each exchange method, anything else is a read
+METHOD_LANES = {
+    "cancel_order": "cancel",
+    "cancel_orders": "cancel",
+    "cancel_all_orders": "cancel",
+    "create_order": "create",
+    "create_orders": "create",
+    "withdraw": "create",
+}
+
+# Seconds before retrying to seed the markets of an exchange after a failure
+MARKETS_RETRY_INTERVAL = 60.0
+
 class ExchangeManager:
     """
     Manages connections to multiple cryptocurrency exchanges
+    
+    Exchanges are instantiated from ``ccxt.async_support`` and each one gets a
+    single long-lived aiohttp session with its own keep-alive connection pool,
+    so a slow request only occupies a connection instead of the event loop.
     """
     def __init__(self):
         self.exchanges: Dict[str, ccxt.Exchange] = {}
         self.exchange_configs: Dict[str, ExchangeConfig] = {}
-        self.last_rate_limit_reset: Dict[str, float] = {}
+        self.rate_limiters: Dict[str, TokenBucket] = {}
+        self.sessions: Dict[str, aiohttp.ClientSession] = {}
+        self.ticker_cache = TickerCache()
+        self.quote_store = QuoteStore()
+        self.feeds: Dict[Tuple[str, str, str], MarketDataFeed] = {}
+        self.stream_clients: Dict[str, Any] = {}
+        self.market_indexes: Dict[str, MarketIndex] = {}
+        self.market_locks: Dict[str, asyncio.Lock] = {}
+        self.market_retry_at: Dict[str, float] = {}
+        self.balance_tracker = BalanceTracker()
+        self.balance_tasks: Dict[str, asyncio.Task] = {}
+        self.balance_refs: Dict[str, int] = {}
+        self.market_bus: Optional[MarketDataBus] = None
+        self.recorder: Optional[MarketRecorder] = None
+        self.state_store: Optional[StateStore] = None
     
     def add_exchange(self, config: ExchangeConfig) -> bool:
         """
@@ -34,23 +83,21 @@ class ExchangeManager:
             bool: True if successful, False otherwise
         """
         try:
-            # Check if the exchange is supported by ccxt
-            if not hasattr(ccxt, config.exchange_id):
-                logger.error(f"Exchange {config.exchange_id} is not supported by ccxt")
-                return False
-            
             # Special handling for TradeOgre which isn't in ccxt
             if config.exchange_id == "tradeogre":
                 from custom_exchanges.tradeogre import TradeOgre
                 exchange_class = TradeOgre
-            else:
+            elif hasattr(ccxt, config.exchange_id):
                 exchange_class = getattr(ccxt, config.exchange_id)
+            else:
+                logger.error(f"Exchange {config.exchange_id} is not supported by ccxt")
+                return False
             
             # Create exchange instance
             exchange_params = {
                 'apiKey': config.api_key,
                 'secret': config.api_secret,
-                'enableRateLimit': True,
+                'timeout': int(config.request_timeout * 1000),
             }
             
             # Add password if provided (some exchanges require it)
@@ -59,6 +106,8 @@ class ExchangeManager:
             
             # Add any additional parameters
             exchange_params.update(config.additional_params)
+            # ccxt's throttle hook is what charges our token bucket, see below
+            exchange_params['enableRateLimit'] = True
             
             # Create the exchange instance
             exchange = exchange_class(exchange_params)
@@ -67,10 +116,29 @@ class ExchangeManager:
             if config.test_mode and hasattr(exchange, 'set_sandbox_mode'):
                 exchange.set_sandbox_mode(True)
             
+            # Replacing an existing connection must not leak its session
+            if config.exchange_id in self.exchanges:
+                self._schedule_close(config.exchange_id)
+            
             # Store the exchange and its configuration
             self.exchanges[config.exchange_id] = exchange
             self.exchange_configs[config.exchange_id] = config
-            self.last_rate_limit_reset[config.exchange_id] = time.time()
+            self.ticker_cache.invalidate(config.exchange_id)
+            # The new instance has no markets loaded yet
+            self.market_indexes.pop(config.exchange_id, None)
+            self.market_retry_at.pop(config.exchange_id, None)
+            bucket = TokenBucket(
+                rate=config.requests_per_second or 1000 / max(exchange.rateLimit, 1),
+                capacity=config.rate_limit_burst
+            )
+            self.rate_limiters[config.exchange_id] = bucket
+            
+            # Every HTTP request ccxt makes, including implicit ones, pays its endpoint cost
+            exchange_id = config.exchange_id
+            exchange.throttle = ExchangeThrottle(
+                bucket,
+                lambda lane, wait: metrics.rate_limit_wait.observe(wait, exchange=exchange_id, lane=lane)
+            )
             
             logger.info(f"Added exchange: {config.exchange_id} ({config.name})")
             return True
@@ -79,9 +147,9 @@ class ExchangeManager:
             logger.error(f"Failed to add exchange {config.exchange_id}: {str(e)}")
             return False
     
-    def remove_exchange(self, exchange_id: str) -> bool:
+    async def remove_exchange(self, exchange_id: str) -> bool:
         """
-        Remove an exchange connection
+        Remove an exchange connection and close its HTTP session
         
         Args:
             exchange_id: ID of the exchange to remove
@@ -90,14 +158,167 @@ class ExchangeManager:
             bool: True if successful, False otherwise
         """
         if exchange_id in self.exchanges:
+            await self.close_exchange(exchange_id)
             del self.exchanges[exchange_id]
             del self.exchange_configs[exchange_id]
-            if exchange_id in self.last_rate_limit_reset:
-                del self.last_rate_limit_reset[exchange_id]
+            self.ticker_cache.invalidate(exchange_id)
+            self.rate_limiters.pop(exchange_id, None)
+            self.market_indexes.pop(exchange_id, None)
+            self.market_retry_at.pop(exchange_id, None)
+            self.balance_tracker.forget(exchange_id)
             logger.info(f"Removed exchange: {exchange_id}")
             return True
         return False
     
+    async def close_exchange(self, exchange_id: str) -> None:
+        """
+        Close the HTTP session of an exchange
+        
+        The exchange stays registered; a new session is opened lazily on
+        the next request.
+        
+        Args:
+            exchange_id: ID of the exchange
+        """
+        exchange = self.exchanges.get(exchange_id)
+        session = self.sessions.pop(exchange_id, None)
+        stream_client = self.stream_clients.pop(exchange_id, None)
+        
+        # Feeds and balance sync of this exchange would otherwise reopen the session
+        for key in [key for key in self.feeds if key[1] == exchange_id]:
+            await self.feeds.pop(key).stop()
+        self.balance_refs.pop(exchange_id, None)
+        balance_task = self.balance_tasks.pop(exchange_id, None)
+        if balance_task:
+            balance_task.cancel()
+            await asyncio.gather(balance_task, return_exceptions=True)
+        
+        try:
+            if stream_client:
+                await stream_client.close()
+            if exchange:
+                await exchange.close()
+            if session and not session.closed:
+                await session.close()
+        except Exception as e:
+            logger.error(f"Failed to close session for {exchange_id}: {str(e)}")
+    
+    async def close(self) -> None:
+        """
+        Close the HTTP sessions of all exchanges
+        """
+        if self.recorder:
+            await self.recorder.stop()
+            self.recorder = None
+        
+        await asyncio.gather(*(self.close_exchange(exchange_id) for exchange_id in list(self.exchanges)))
+        logger.info("Closed all exchange sessions")
+        
+        if self.market_bus:
+            self.quote_store.remove_listener(self.market_bus.on_quote)
+            self.market_bus.close()
+            self.market_bus = None
+        
+        if self.state_store:
+            await self.state_store.close()
+            self.state_store = None
+    
+    def _schedule_close(self, exchange_id: str) -> None:
+        """
+        Close the session of an exchange that is about to be replaced
+        
+        Args:
+            exchange_id: ID of the exchange
+        """
+        exchange = self.exchanges.get(exchange_id)
+        session = self.sessions.pop(exchange_id, None)
+        
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        
+        if exchange:
+            loop.create_task(exchange.close())
+        if session and not session.closed:
+            loop.create_task(session.close())
+    
+    def _open_session(self, exchange_id: str) -> aiohttp.ClientSession:
+        """
+        Get the pooled HTTP session of an exchange, creating it if needed
+        
+        Args:
+            exchange_id: ID of the exchange
+            
+        Returns:
+            aiohttp.ClientSession: Session bound to the running event loop
+        """
+        session = self.sessions.get(exchange_id)
+        if session and not session.closed:
+            return session
+        
+        config = self.exchange_configs[exchange_id]
+        connector = aiohttp.TCPConnector(
+            limit=config.pool_size,
+            limit_per_host=config.pool_size,
+            keepalive_timeout=config.keepalive_timeout,
+            enable_cleanup_closed=True
+        )
+        session = aiohttp.ClientSession(
+            connector=connector,
+            timeout=aiohttp.ClientTimeout(total=config.request_timeout)
+        )
+        
+        # ccxt only opens its own session when none is set
+        self.exchanges[exchange_id].session = session
+        self.sessions[exchange_id] = session
+        return session
+    
+    async def _call(self, exchange_id: str, method: str, *args, lane: Optional[str] = None, **kwargs) -> Any:
+        """
+        Call an exchange method over the exchange's pooled session
+        
+        The exchange's markets are seeded from the market index first, as
+        ccxt would otherwise download them itself, bypassing the cache. Each
+        HTTP request of the call then waits for its endpoint cost in tokens
+        from the exchange's rate limiter, in the method's lane, so cancels
+        are sent before order creation and order creation before reads.
+        Latency, errors and timeouts are recorded per exchange and method.
+        
+        Args:
+            exchange_id: ID of the exchange
+            method: Name of the ccxt method to call
+            lane: Rate limiter lane, defaults to the lane of the method
+            
+        Returns:
+            Any: Result of the exchange method
+        """
+        exchange = self.exchanges[exchange_id]
+        if (
+            method != "fetch_markets"
+            and exchange_id not in self.market_indexes
+            and time.monotonic() >= self.market_retry_at.get(exchange_id, 0.0)
+        ):
+            if await self.load_market_index(exchange_id) is None:
+                self.market_retry_at[exchange_id] = time.monotonic() + MARKETS_RETRY_INTERVAL
+        
+        self._open_session(exchange_id)
+        
+        metrics.exchange_requests.inc(exchange=exchange_id, method=method)
+        token = request_lane.set(lane or METHOD_LANES.get(method, "read"))
+        started_at = time.monotonic()
+        try:
+            return await getattr(exchange, method)(*args, **kwargs)
+        except (ccxt.RequestTimeout, asyncio.TimeoutError):
+            metrics.exchange_timeouts.inc(exchange=exchange_id, method=method)
+            raise
+        except Exception as e:
+            metrics.exchange_errors.inc(exchange=exchange_id, method=method, error=type(e).__name__)
+            raise
+        finally:
+            request_lane.reset(token)
+            metrics.exchange_request_duration.observe(time.monotonic() - started_at, exchange=exchange_id, method=method)
+    
     def get_exchange(self, exchange_id: str) -> Optional[ccxt.Exchange]:
         """
         Get an exchange instance by ID
@@ -159,6 +380,8 @@ class ExchangeManager:
         """
         Fetch account balance from an exchange
         
+        Every fetched balance also reconciles the local balance tracker.
+        
         Args:
             exchange_id: ID of the exchange
             
@@ -175,39 +398,100 @@ class ExchangeManager:
             return {}
         
         try:
-            return await exchange.fetch_balance()
+            requested_at = time.monotonic()
+            balance = await self._call(exchange_id, "fetch_balance")
+            self.balance_tracker.update(exchange_id, balance, requested_at)
+            return balance
         except Exception as e:
             logger.error(f"Failed to fetch balance from {exchange_id}: {str(e)}")
             return {}
     
-    async def fetch_markets(self, exchange_id: str) -> List[Dict]:
+    async def fetch_markets(self, exchange_id: str, reload: bool = False) -> List[Dict]:
         """
         Fetch markets from an exchange
         
+        Markets are served from the exchange's market index, see
+        ``load_market_index``.
+        
         Args:
             exchange_id: ID of the exchange
+            reload: Download the markets even if the index is fresh
             
         Returns:
             List[Dict]: Markets
         """
+        index = await self.load_market_index(exchange_id, reload=reload)
+        return index.markets if index else []
+    
+    async def load_market_index(self, exchange_id: str, reload: bool = False) -> Optional[MarketIndex]:
+        """
+        Get the market index of an exchange, loading it if needed
+        
+        The index is taken from memory, then from the on-disk cache while it
+        is younger than the exchange's ``markets_ttl``, and only otherwise
+        downloaded and persisted again. The loaded markets are also handed
+        to the ccxt instance so it does not download them a second time.
+        
+        Args:
+            exchange_id: ID of the exchange
+            reload: Download the markets even if the index is fresh
+            
+        Returns:
+            MarketIndex: Market index or None if the markets could not be loaded
+        """
         exchange = self.get_exchange(exchange_id)
         if not exchange:
             logger.error(f"Exchange {exchange_id} not found")
-            return []
+            return None
         
-        try:
-            return await exchange.fetch_markets()
-        except Exception as e:
-            logger.error(f"Failed to fetch markets from {exchange_id}: {str(e)}")
-            return []
+        config = self.exchange_configs[exchange_id]
+        ttl = config.markets_ttl
+        lock = self.market_locks.setdefault(exchange_id, asyncio.Lock())
+        
+        # Concurrent callers wait for one load instead of each downloading the markets
+        async with lock:
+            index = self.market_indexes.get(exchange_id)
+            if index is None and not reload:
+                index = MarketIndex.load(exchange_id, config.test_mode)
+            
+            if reload or index is None or index.is_stale(ttl):
+                try:
+                    markets = await self._call(exchange_id, "fetch_markets")
+                except Exception as e:
+                    logger.error(f"Failed to fetch markets from {exchange_id}: {str(e)}")
+                    if index is None:
+                        return None
+                    # A stale index is better than none
+                    logger.warning(f"Using stale market index for {exchange_id}")
+                else:
+                    index = MarketIndex(exchange_id, markets, sandbox=config.test_mode)
+                    try:
+                        index.save()
+                    except Exception as e:
+                        logger.error(f"Failed to save market index for {exchange_id}: {str(e)}")
+            
+            if self.market_indexes.get(exchange_id) is not index:
+                self.market_indexes[exchange_id] = index
+                try:
+                    exchange.set_markets(index.markets)
+                except Exception as e:
+                    logger.error(f"Failed to set markets on {exchange_id}: {str(e)}")
+                logger.info(f"Loaded {len(index)} markets for {exchange_id}")
+            
+            return index
     
-    async def fetch_ticker(self, exchange_id: str, symbol: str) -> Dict:
+    async def fetch_ticker(self, exchange_id: str, symbol: str, max_age: Optional[float] = None) -> Dict:
         """
         Fetch ticker for a symbol from an exchange
         
+        Tickers are served from the ticker cache while younger than
+        ``max_age``, and concurrent requests for the same symbol share one
+        exchange call. The returned dict is shared and must not be mutated.
+        
         Args:
             exchange_id: ID of the exchange
             symbol: Symbol to fetch ticker for
+            max_age: Maximum acceptable age in seconds, defaults to the exchange's ticker_ttl
             
         Returns:
             Dict: Ticker
@@ -217,12 +501,158 @@ class ExchangeManager:
             logger.error(f"Exchange {exchange_id} not found")
             return {}
         
+        if max_age is None:
+            max_age = self.exchange_configs[exchange_id].ticker_ttl
+        
+        ticker = self._get_streamed("ticker", exchange_id, symbol, max_age)
+        if ticker is not None:
+            return ticker
+        
         try:
-            return await exchange.fetch_ticker(symbol)
+            return await self.ticker_cache.get(
+                exchange_id,
+                symbol,
+                lambda: self._load_ticker(exchange_id, symbol),
+                ttl=max_age
+            )
         except Exception as e:
             logger.error(f"Failed to fetch ticker for {symbol} from {exchange_id}: {str(e)}")
             return {}
     
+    async def _load_ticker(self, exchange_id: str, symbol: str) -> Dict:
+        """
+        Fetch a ticker from the exchange and publish it to the market data bus
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol to fetch ticker for
+            
+        Returns:
+            Dict: Ticker
+        """
+        ticker = await self._call(exchange_id, "fetch_ticker", symbol)
+        self._publish_ticker(exchange_id, symbol, ticker)
+        return ticker
+    
+    def _publish_ticker(self, exchange_id: str, symbol: str, ticker: Dict) -> None:
+        """
+        Publish a ticker fetched over REST to the market data bus, if enabled
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            ticker: Ticker
+        """
+        if self.market_bus and ticker:
+            self.market_bus.publish_ticker(exchange_id, symbol, ticker)
+    
+    async def fetch_tickers(
+        self,
+        exchange_id: str,
+        symbols: List[str],
+        max_age: Optional[float] = None,
+        max_concurrency: Optional[int] = None
+    ) -> Dict[str, Dict]:
+        """
+        Fetch tickers for several symbols from an exchange
+        
+        Symbols with a fresh cached ticker are not requested again. The rest
+        are fetched with the exchange's all-tickers endpoint when it has one,
+        otherwise with concurrent per-symbol requests.
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbols: Symbols to fetch tickers for
+            max_age: Maximum acceptable age in seconds, defaults to the exchange's ticker_ttl
+            max_concurrency: Cap on concurrent per-symbol requests, defaults to the exchange's pool_size
+            
+        Returns:
+            Dict[str, Dict]: Symbol to ticker, symbols that failed are omitted
+        """
+        exchange = self.get_exchange(exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {exchange_id} not found")
+            return {}
+        
+        config = self.exchange_configs[exchange_id]
+        if max_age is None:
+            max_age = config.ticker_ttl
+        
+        result = {}
+        missing = []
+        for symbol in dict.fromkeys(symbols):
+            ticker = self._get_streamed("ticker", exchange_id, symbol, max_age)
+            if ticker is None:
+                ticker = self.ticker_cache.peek(exchange_id, symbol, max_age)
+            if ticker is not None:
+                result[symbol] = ticker
+            else:
+                missing.append(symbol)
+        
+        if not missing:
+            return result
+        
+        if exchange.has.get("fetchTickers"):
+            try:
+                tickers = await self._call(exchange_id, "fetch_tickers", missing)
+                for symbol in missing:
+                    ticker = tickers.get(symbol)
+                    if ticker:
+                        self.ticker_cache.put(exchange_id, symbol, ticker)
+                        self._publish_ticker(exchange_id, symbol, ticker)
+                        result[symbol] = ticker
+                return result
+            except Exception as e:
+                logger.error(f"Failed to fetch tickers from {exchange_id}, falling back to per-symbol requests: {str(e)}")
+        
+        semaphore = asyncio.Semaphore(max_concurrency or config.pool_size)
+        
+        async def fetch_one(symbol: str) -> Dict:
+            async with semaphore:
+                return await self.fetch_ticker(exchange_id, symbol, max_age=max_age)
+        
+        tickers = await asyncio.gather(*(fetch_one(symbol) for symbol in missing))
+        for symbol, ticker in zip(missing, tickers):
+            if ticker:
+                result[symbol] = ticker
+        
+        return result
+    
+    async def fetch_order_book(self, exchange_id: str, symbol: str, limit: Optional[int] = None, max_age: Optional[float] = None) -> Optional[OrderBook]:
+        """
+        Fetch the order book for a symbol from an exchange
+        
+        Subscribed order books are served from the local quote store. The
+        returned book may be shared and must not be mutated.
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol to fetch the order book for
+            limit: Maximum number of levels per side
+            max_age: Maximum acceptable age of a polled order book in seconds
+            
+        Returns:
+            OrderBook: Normalized order book or None if the fetch failed
+        """
+        exchange = self.get_exchange(exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {exchange_id} not found")
+            return None
+        
+        if max_age is None:
+            max_age = self.exchange_configs[exchange_id].ticker_ttl
+        
+        order_book = self._get_streamed("order_book", exchange_id, symbol, max_age)
+        if order_book is not None:
+            return order_book
+        
+        try:
+            order_book = await self._call(exchange_id, "fetch_order_book", symbol, limit)
+            return OrderBook.from_ccxt(order_book, exchange_id)
+        except Exception as e:
+            logger.error(f"Failed to fetch order book for {symbol} from {exchange_id}: {str(e)}")
+            return None
+    
     async def create_order(
         self, 
         exchange_id: str, 
@@ -260,11 +690,110 @@ class ExchangeManager:
         params = params or {}
         
         try:
-            return await exchange.create_order(symbol, order_type, side, amount, price, params)
+            order = await self._call(exchange_id, "create_order", symbol, order_type, side, amount, price, params)
+            self._reserve(exchange_id, order, symbol, side, amount, price)
+            return order
         except Exception as e:
             logger.error(f"Failed to create {order_type} {side} order for {symbol} on {exchange_id}: {str(e)}")
             return {}
     
+    def _reserve(self, exchange_id: str, order: Dict, symbol: str, side: str, amount: float, price: Optional[float]) -> None:
+        """
+        Lock the funds of a created order in the balance tracker
+        
+        Args:
+            exchange_id: ID of the exchange
+            order: Order as returned by ccxt
+            symbol: Symbol of the order
+            side: Order side (buy, sell)
+            amount: Order amount
+            price: Order price
+        """
+        if order and order.get("id") is not None:
+            self.balance_tracker.reserve(exchange_id, order["id"], symbol, side, amount, price or order.get("price"))
+            self.balance_tracker.on_order(exchange_id, order)
+    
+    async def create_orders(
+        self,
+        exchange_id: str,
+        orders: List[Dict],
+        max_concurrency: Optional[int] = None,
+        batch_size: int = 5
+    ) -> List[Dict]:
+        """
+        Create several orders on an exchange
+        
+        Exchanges with a batch order endpoint receive the orders in batches
+        of ``batch_size``. Otherwise the orders are sent concurrently, at most
+        ``max_concurrency`` at a time, each through the rate limiter's create
+        lane.
+        
+        Args:
+            exchange_id: ID of the exchange
+            orders: Orders as dicts with symbol, type, side, amount, price and optional params
+            max_concurrency: Cap on concurrent requests, defaults to the exchange's pool_size
+            batch_size: Maximum number of orders per batch request
+            
+        Returns:
+            List[Dict]: One result per input order in the same order, either
+            the created order or a dict with an "error" message
+        """
+        exchange = self.get_exchange(exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {exchange_id} not found")
+            return [{"error": f"Exchange {exchange_id} not found"} for _ in orders]
+        
+        if not self.check_permission(exchange_id, "read_write"):
+            logger.error(f"Exchange {exchange_id} does not have read_write permission")
+            return [{"error": f"Exchange {exchange_id} does not have read_write permission"} for _ in orders]
+        
+        requests = [dict(order, params=order.get("params") or {}) for order in orders]
+        semaphore = asyncio.Semaphore(max_concurrency or self.exchange_configs[exchange_id].pool_size)
+        
+        async def create_batch(batch: List[Dict]) -> List[Dict]:
+            async with semaphore:
+                try:
+                    created = await self._call(exchange_id, "create_orders", batch)
+                except Exception as e:
+                    logger.error(f"Failed to create {len(batch)} orders on {exchange_id}: {str(e)}")
+                    return [{"error": str(e)} for _ in batch]
+            
+            results = []
+            for request, order in zip(batch, created or []):
+                if order and order.get("id") is not None:
+                    self._reserve(exchange_id, order, request["symbol"], request["side"], request["amount"], request.get("price"))
+                    results.append(order)
+                else:
+                    results.append({"error": "Order rejected", "info": (order or {}).get("info")})
+            
+            # Keep one result per order even if the exchange returned fewer
+            if len(results) < len(batch):
+                logger.error(f"Exchange {exchange_id} returned {len(results)} results for {len(batch)} orders")
+                results.extend({"error": "No result returned"} for _ in range(len(batch) - len(results)))
+            return results
+        
+        async def create_one(request: Dict) -> Dict:
+            async with semaphore:
+                try:
+                    order = await self._call(
+                        exchange_id, "create_order", request["symbol"], request["type"], request["side"],
+                        request["amount"], request.get("price"), request["params"]
+                    )
+                except Exception as e:
+                    logger.error(f"Failed to create {request['type']} {request['side']} order for {request['symbol']} on {exchange_id}: {str(e)}")
+                    return {"error": str(e)}
+            if not order or order.get("id") is None:
+                return {"error": "Order rejected", "info": (order or {}).get("info")}
+            self._reserve(exchange_id, order, request["symbol"], request["side"], request["amount"], request.get("price"))
+            return order
+        
+        if exchange.has.get("createOrders"):
+            batches = [requests[i:i + batch_size] for i in range(0, len(requests), batch_size)]
+            results = await asyncio.gather(*(create_batch(batch) for batch in batches))
+            return [result for batch in results for result in batch]
+        
+        return list(await asyncio.gather(*(create_one(request) for request in requests)))
+    
     async def cancel_order(self, exchange_id: str, order_id: str, symbol: Optional[str] = None) -> Dict:
         """
         Cancel an order on an exchange
@@ -287,11 +816,171 @@ class ExchangeManager:
             return {}
         
         try:
-            return await exchange.cancel_order(order_id, symbol)
+            result = await self._call(exchange_id, "cancel_order", order_id, symbol)
+            self.balance_tracker.release(exchange_id, order_id)
+            return result
         except Exception as e:
             logger.error(f"Failed to cancel order {order_id} on {exchange_id}: {str(e)}")
             return {}
     
+    async def cancel_orders(
+        self,
+        exchange_id: str,
+        order_ids: List[str],
+        symbol: Optional[str] = None,
+        max_concurrency: Optional[int] = None
+    ) -> List[str]:
+        """
+        Cancel several orders on an exchange
+        
+        Uses the exchange's batch cancel endpoint when it has one, otherwise
+        sends the cancels concurrently, at most ``max_concurrency`` at a time.
+        Only orders confirmed as gone are reported: from the batch response
+        when it lists orders, otherwise from the open orders fetched after it.
+        
+        Args:
+            exchange_id: ID of the exchange
+            order_ids: IDs of the orders to cancel
+            symbol: Symbol of the orders (required by some exchanges)
+            max_concurrency: Cap on concurrent requests, defaults to the exchange's pool_size
+            
+        Returns:
+            List[str]: IDs of the orders that were cancelled
+        """
+        exchange = self.get_exchange(exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {exchange_id} not found")
+            return []
+        
+        if not self.check_permission(exchange_id, "read_write"):
+            logger.error(f"Exchange {exchange_id} does not have read_write permission")
+            return []
+        
+        order_ids = list(dict.fromkeys(order_ids))
+        if not order_ids:
+            return []
+        
+        cancelled = None
+        if exchange.has.get("cancelOrders"):
+            try:
+                result = await self._call(exchange_id, "cancel_orders", order_ids, symbol)
+                if isinstance(result, list):
+                    requested = set(order_ids)
+                    cancelled = [order_id for order_id in self._cancelled_ids(result) if order_id in requested]
+                else:
+                    cancelled = await self._confirm_cancelled(exchange_id, order_ids, symbol)
+            except Exception as e:
+                logger.error(f"Failed to cancel {len(order_ids)} orders on {exchange_id}, falling back to single cancels: {str(e)}")
+        
+        if cancelled is None:
+            semaphore = asyncio.Semaphore(max_concurrency or self.exchange_configs[exchange_id].pool_size)
+            
+            async def cancel_one(order_id: str) -> Optional[str]:
+                async with semaphore:
+                    try:
+                        await self._call(exchange_id, "cancel_order", order_id, symbol)
+                        return order_id
+                    except Exception as e:
+                        logger.error(f"Failed to cancel order {order_id} on {exchange_id}: {str(e)}")
+                        return None
+            
+            results = await asyncio.gather(*(cancel_one(order_id) for order_id in order_ids))
+            cancelled = [order_id for order_id in results if order_id is not None]
+        
+        for order_id in cancelled:
+            self.balance_tracker.release(exchange_id, order_id)
+        
+        logger.info(f"Cancelled {len(cancelled)}/{len(order_ids)} orders on {exchange_id}")
+        return cancelled
+    
+    async def cancel_all_for_symbol(self, exchange_id: str, symbol: str) -> List[str]:
+        """
+        Cancel every open order of a symbol on an exchange
+        
+        Uses the exchange's cancel-all endpoint when it has one. Otherwise
+        the open orders are fetched once and cancelled with ``cancel_orders``.
+        Only orders confirmed as gone are reported and released.
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol to cancel orders for
+            
+        Returns:
+            List[str]: IDs of the orders that were cancelled
+        """
+        exchange = self.get_exchange(exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {exchange_id} not found")
+            return []
+        
+        if not self.check_permission(exchange_id, "read_write"):
+            logger.error(f"Exchange {exchange_id} does not have read_write permission")
+            return []
+        
+        if exchange.has.get("cancelAllOrders"):
+            try:
+                result = await self._call(exchange_id, "cancel_all_orders", symbol)
+                if isinstance(result, list):
+                    cancelled = self._cancelled_ids(result)
+                else:
+                    # Not every exchange reports the cancelled orders, check the tracked ones
+                    reserved = self.balance_tracker.get_reserved_ids(exchange_id, symbol)
+                    cancelled = await self._confirm_cancelled(exchange_id, reserved, symbol) or []
+                
+                for order_id in cancelled:
+                    self.balance_tracker.release(exchange_id, order_id)
+                logger.info(f"Cancelled {len(cancelled)} orders for {symbol} on {exchange_id}")
+                return cancelled
+            except Exception as e:
+                logger.error(f"Failed to cancel all orders for {symbol} on {exchange_id}, falling back to single cancels: {str(e)}")
+        
+        try:
+            open_orders = await self._call(exchange_id, "fetch_open_orders", symbol)
+        except Exception as e:
+            logger.error(f"Failed to fetch open orders for {symbol} from {exchange_id}: {str(e)}")
+            return []
+        
+        return await self.cancel_orders(exchange_id, [order["id"] for order in open_orders], symbol)
+    
+    async def _confirm_cancelled(self, exchange_id: str, order_ids: List[str], symbol: Optional[str]) -> Optional[List[str]]:
+        """
+        Find which orders are no longer open after a batch cancel
+        
+        Args:
+            exchange_id: ID of the exchange
+            order_ids: IDs of the orders that were cancelled
+            symbol: Symbol of the orders
+            
+        Returns:
+            List[str]: IDs of the orders that are gone, None if the open orders could not be fetched
+        """
+        try:
+            open_orders = await self._call(exchange_id, "fetch_open_orders", symbol)
+        except Exception as e:
+            logger.error(f"Failed to confirm cancels on {exchange_id}: {str(e)}")
+            return None
+        
+        still_open = {str(order["id"]) for order in open_orders}
+        return [order_id for order_id in order_ids if str(order_id) not in still_open]
+    
+    @staticmethod
+    def _cancelled_ids(result: Any) -> List[str]:
+        """
+        Extract order IDs from a batch cancel response
+        
+        Args:
+            result: Response of cancel_orders or cancel_all_orders
+            
+        Returns:
+            List[str]: Order IDs, empty if the response does not list orders
+        """
+        if not isinstance(result, list):
+            return []
+        return [
+            order["id"] for order in result
+            if isinstance(order, dict) and order.get("id") is not None and order.get("status") not in ("open", "rejected")
+        ]
+    
     async def withdraw(
         self, 
         exchange_id: str, 
@@ -327,7 +1016,7 @@ class ExchangeManager:
         params = params or {}
         
         try:
-            return await exchange.withdraw(currency, amount, address, tag, params)
+            return await self._call(exchange_id, "withdraw", currency, amount, address, tag, params)
         except Exception as e:
             logger.error(f"Failed to withdraw {amount} {currency} to {address} from {exchange_id}: {str(e)}")
             return {}
@@ -354,7 +1043,9 @@ class ExchangeManager:
             return {}
         
         try:
-            return await exchange.fetch_order(order_id, symbol)
+            order = await self._call(exchange_id, "fetch_order", order_id, symbol)
+            self.balance_tracker.on_order(exchange_id, order)
+            return order
         except Exception as e:
             logger.error(f"Failed to fetch order {order_id} from {exchange_id}: {str(e)}")
             return {}
@@ -382,7 +1073,7 @@ class ExchangeManager:
             return []
         
         try:
-            return await exchange.fetch_orders(symbol, since, limit)
+            return self._track_orders(exchange_id, await self._call(exchange_id, "fetch_orders", symbol, since, limit))
         except Exception as e:
             logger.error(f"Failed to fetch orders from {exchange_id}: {str(e)}")
             return []
@@ -410,7 +1101,7 @@ class ExchangeManager:
             return []
         
         try:
-            return await exchange.fetch_open_orders(symbol, since, limit)
+            return self._track_orders(exchange_id, await self._call(exchange_id, "fetch_open_orders", symbol, since, limit))
         except Exception as e:
             logger.error(f"Failed to fetch open orders from {exchange_id}: {str(e)}")
             return []
@@ -438,11 +1129,26 @@ class ExchangeManager:
             return []
         
         try:
-            return await exchange.fetch_closed_orders(symbol, since, limit)
+            return self._track_orders(exchange_id, await self._call(exchange_id, "fetch_closed_orders", symbol, since, limit))
         except Exception as e:
             logger.error(f"Failed to fetch closed orders from {exchange_id}: {str(e)}")
             return []
     
+    def _track_orders(self, exchange_id: str, orders: List[Dict]) -> List[Dict]:
+        """
+        Apply fetched order states to the balance tracker
+        
+        Args:
+            exchange_id: ID of the exchange
+            orders: Orders as returned by ccxt
+            
+        Returns:
+            List[Dict]: The same orders
+        """
+        for order in orders:
+            self.balance_tracker.on_order(exchange_id, order)
+        return orders
+    
     async def fetch_my_trades(self, exchange_id: str, symbol: Optional[str] = None, since: Optional[int] = None, limit: Optional[int] = None) -> List[Dict]:
         """
         Fetch trades from an exchange
@@ -466,11 +1172,81 @@ class ExchangeManager:
             return []
         
         try:
-            return await exchange.fetch_my_trades(symbol, since, limit)
+            return await self._call(exchange_id, "fetch_my_trades", symbol, since, limit)
         except Exception as e:
             logger.error(f"Failed to fetch trades from {exchange_id}: {str(e)}")
             return []
     
+    async def fetch_ohlcv(
+        self,
+        exchange_id: str,
+        symbol: str,
+        timeframe: str = "1m",
+        since: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[List[float]]:
+        """
+        Fetch OHLCV candles from an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol to fetch candles for
+            timeframe: Candle period (e.g. 1m, 1h)
+            since: Timestamp of the first candle in milliseconds
+            limit: Maximum number of candles to fetch
+            
+        Returns:
+            List[List[float]]: Rows of [timestamp, open, high, low, close, volume]
+        """
+        exchange = self.get_exchange(exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {exchange_id} not found")
+            return []
+        
+        if not self.check_permission(exchange_id, "read_only"):
+            logger.error(f"Exchange {exchange_id} does not have read_only permission")
+            return []
+        
+        try:
+            return await self._call(exchange_id, "fetch_ohlcv", symbol, timeframe, since, limit)
+        except Exception as e:
+            logger.error(f"Failed to fetch {timeframe} candles for {symbol} from {exchange_id}: {str(e)}")
+            return []
+    
+    async def fetch_trades(
+        self,
+        exchange_id: str,
+        symbol: str,
+        since: Optional[int] = None,
+        limit: Optional[int] = None
+    ) -> List[Dict]:
+        """
+        Fetch public trades of a market from an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol to fetch trades for
+            since: Timestamp of the first trade in milliseconds
+            limit: Maximum number of trades to fetch
+            
+        Returns:
+            List[Dict]: Trades
+        """
+        exchange = self.get_exchange(exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {exchange_id} not found")
+            return []
+        
+        if not self.check_permission(exchange_id, "read_only"):
+            logger.error(f"Exchange {exchange_id} does not have read_only permission")
+            return []
+        
+        try:
+            return await self._call(exchange_id, "fetch_trades", symbol, since, limit)
+        except Exception as e:
+            logger.error(f"Failed to fetch public trades for {symbol} from {exchange_id}: {str(e)}")
+            return []
+    
     async def test_connection(self, exchange_id: str) -> bool:
         """
         Test connection to an exchange
@@ -488,13 +1264,391 @@ class ExchangeManager:
         
         try:
             # Try to fetch markets as a simple test
-            await exchange.load_markets()
+            await self._call(exchange_id, "fetch_markets")
             logger.info(f"Connection to {exchange_id} successful")
             return True
         except Exception as e:
             logger.error(f"Connection to {exchange_id} failed: {str(e)}")
             return False
     
+    def get_ticker_age(self, exchange_id: str, symbol: str) -> Optional[float]:
+        """
+        Get how long ago the cached ticker for a symbol was received
+        
+        Websocket tickers report their real age too, so a feed that went
+        quiet shows up as stale.
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol of the ticker
+            
+        Returns:
+            float: Age in seconds or None if not cached
+        """
+        feed = self.feeds.get(("ticker", exchange_id, symbol))
+        entry = self.quote_store.get_ticker(exchange_id, symbol)
+        if feed and feed.is_live() and entry:
+            return entry[0]
+        return self.ticker_cache.get_age(exchange_id, symbol)
+    
+    def get_stream_client(self, exchange_id: str) -> Optional[Any]:
+        """
+        Get the websocket client of an exchange, creating it if needed
+        
+        Args:
+            exchange_id: ID of the exchange
+            
+        Returns:
+            ccxt.pro exchange instance or None if the exchange has no websocket API
+        """
+        if exchange_id in self.stream_clients:
+            return self.stream_clients[exchange_id]
+        
+        config = self.exchange_configs.get(exchange_id)
+        if ccxtpro is None or config is None or not hasattr(ccxtpro, exchange_id):
+            return None
+        
+        params = {
+            'apiKey': config.api_key,
+            'secret': config.api_secret,
+        }
+        if config.password:
+            params['password'] = config.password
+        params.update(config.additional_params)
+        
+        try:
+            client = getattr(ccxtpro, exchange_id)(params)
+            if config.test_mode and hasattr(client, 'set_sandbox_mode'):
+                client.set_sandbox_mode(True)
+        except Exception as e:
+            logger.error(f"Failed to create stream client for {exchange_id}: {str(e)}")
+            return None
+        
+        self.stream_clients[exchange_id] = client
+        return client
+    
+    def _get_streamed(self, kind: str, exchange_id: str, symbol: str, max_age: float) -> Optional[Any]:
+        """
+        Get a ticker or order book from a live feed
+        
+        Feed data is only served while younger than ``max_age``, whether
+        it is pushed or polled, so a websocket that stopped delivering falls
+        back to REST.
+        
+        Args:
+            kind: "ticker" or "order_book"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            max_age: Maximum acceptable age of feed data in seconds
+            
+        Returns:
+            Ticker or order book, or None if there is no usable feed data
+        """
+        feed = self.feeds.get((kind, exchange_id, symbol))
+        if not feed or not feed.is_live():
+            return None
+        
+        if kind == "ticker":
+            entry = self.quote_store.get_ticker(exchange_id, symbol)
+        else:
+            entry = self.quote_store.get_order_book(exchange_id, symbol)
+        
+        if entry and entry[0] <= max_age:
+            return entry[1]
+        return None
+    
+    def _subscribe(self, kind: str, exchange_id: str, symbol: str, **feed_params) -> bool:
+        """
+        Start or join a market data feed
+        
+        Args:
+            kind: "ticker" or "order_book"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if exchange_id not in self.exchanges:
+            logger.error(f"Exchange {exchange_id} not found")
+            return False
+        
+        key = (kind, exchange_id, symbol)
+        feed = self.feeds.get(key)
+        if feed is None:
+            feed_params.setdefault("max_age", self.exchange_configs[exchange_id].ticker_ttl)
+            feed = MarketDataFeed(self, exchange_id, symbol, kind, **feed_params)
+            self.feeds[key] = feed
+            logger.info(f"Subscribed to {kind} {symbol} on {exchange_id}")
+        
+        feed.subscribers += 1
+        feed.start()
+        return True
+    
+    async def _unsubscribe(self, kind: str, exchange_id: str, symbol: str) -> bool:
+        """
+        Leave a market data feed, stopping it when nobody is subscribed
+        
+        Args:
+            kind: "ticker" or "order_book"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            bool: True if the feed existed, False otherwise
+        """
+        key = (kind, exchange_id, symbol)
+        feed = self.feeds.get(key)
+        if not feed:
+            return False
+        
+        feed.subscribers -= 1
+        if feed.subscribers <= 0:
+            del self.feeds[key]
+            await feed.stop()
+            self.quote_store.discard(kind, exchange_id, symbol)
+            logger.info(f"Unsubscribed from {kind} {symbol} on {exchange_id}")
+        return True
+    
+    def subscribe_ticker(
+        self,
+        exchange_id: str,
+        symbol: str,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0
+    ) -> bool:
+        """
+        Keep the ticker of a symbol up to date in the local quote store
+        
+        Uses the exchange's websocket feed when available, otherwise adaptive
+        REST polling between ``min_interval`` and ``max_interval`` seconds.
+        Subscriptions are reference counted.
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol to subscribe to
+            min_interval: Shortest polling interval in seconds
+            max_interval: Longest polling interval in seconds
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self._subscribe("ticker", exchange_id, symbol, min_interval=min_interval, max_interval=max_interval)
+    
+    def subscribe_order_book(
+        self,
+        exchange_id: str,
+        symbol: str,
+        limit: Optional[int] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0
+    ) -> bool:
+        """
+        Keep the order book of a symbol up to date in the local quote store
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol to subscribe to
+            limit: Order book depth
+            min_interval: Shortest polling interval in seconds
+            max_interval: Longest polling interval in seconds
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return self._subscribe("order_book", exchange_id, symbol, limit=limit, min_interval=min_interval, max_interval=max_interval)
+    
+    async def unsubscribe_ticker(self, exchange_id: str, symbol: str) -> bool:
+        """
+        Release a ticker subscription
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Subscribed symbol
+            
+        Returns:
+            bool: True if the subscription existed, False otherwise
+        """
+        return await self._unsubscribe("ticker", exchange_id, symbol)
+    
+    async def unsubscribe_order_book(self, exchange_id: str, symbol: str) -> bool:
+        """
+        Release an order book subscription
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Subscribed symbol
+            
+        Returns:
+            bool: True if the subscription existed, False otherwise
+        """
+        return await self._unsubscribe("order_book", exchange_id, symbol)
+    
+    def get_subscriptions(self) -> List[Dict]:
+        """
+        Get the status of all market data feeds
+        
+        Returns:
+            List[Dict]: Feed status
+        """
+        return [feed.get_status() for feed in self.feeds.values()]
+    
+    def track_balances(self, exchange_id: str) -> bool:
+        """
+        Reconcile the local balances of an exchange in the background
+        
+        Balances are fetched right away and then every
+        ``balance_sync_interval`` seconds. Calls are reference counted, the
+        sync runs until every caller called ``untrack_balances``.
+        
+        Args:
+            exchange_id: ID of the exchange
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if exchange_id not in self.exchanges:
+            logger.error(f"Exchange {exchange_id} not found")
+            return False
+        
+        self.balance_refs[exchange_id] = self.balance_refs.get(exchange_id, 0) + 1
+        task = self.balance_tasks.get(exchange_id)
+        if task is None or task.done():
+            self.balance_tasks[exchange_id] = asyncio.ensure_future(self._sync_balances(exchange_id))
+        return True
+    
+    async def untrack_balances(self, exchange_id: str) -> bool:
+        """
+        Release a balance sync, stopping it when nobody tracks the exchange anymore
+        
+        Args:
+            exchange_id: ID of the exchange
+            
+        Returns:
+            bool: True if the exchange was tracked, False otherwise
+        """
+        refs = self.balance_refs.get(exchange_id, 0)
+        if not refs:
+            return False
+        
+        if refs > 1:
+            self.balance_refs[exchange_id] = refs - 1
+            return True
+        
+        del self.balance_refs[exchange_id]
+        task = self.balance_tasks.pop(exchange_id, None)
+        if task:
+            task.cancel()
+            await asyncio.gather(task, return_exceptions=True)
+        return True
+    
+    async def _sync_balances(self, exchange_id: str) -> None:
+        """
+        Background loop fetching the balances of an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+        """
+        while True:
+            await self.fetch_balance(exchange_id)
+            await asyncio.sleep(self.exchange_configs[exchange_id].balance_sync_interval)
+    
+    def get_free_balance(self, exchange_id: str, currency: str) -> Optional[float]:
+        """
+        Get the locally tracked free balance of a currency
+        
+        Args:
+            exchange_id: ID of the exchange
+            currency: Currency code
+            
+        Returns:
+            float: Free balance or None if the balances were never fetched
+        """
+        return self.balance_tracker.get_free(exchange_id, currency)
+    
+    def enable_market_bus(self, name: Optional[str] = None, capacity: int = 65536) -> MarketDataBus:
+        """
+        Publish all tickers and order book tops to a shared memory bus
+        
+        Local processes can read the bus with a MarketDataReader instead of
+        requesting quotes from this process. Calling this again returns the
+        existing bus.
+        
+        Args:
+            name: Name of the shared memory segment, defaults to one derived from the pid
+            capacity: Number of records in the ring
+            
+        Returns:
+            MarketDataBus: The bus
+        """
+        if not self.market_bus:
+            self.market_bus = MarketDataBus(name, capacity)
+            self.quote_store.add_listener(self.market_bus.on_quote)
+            logger.info(f"Publishing market data to shared memory bus {self.market_bus.name}")
+        return self.market_bus
+    
+    def enable_state_store(self, path: Path = STATE_DB) -> StateStore:
+        """
+        Persist the state of strategies using this manager in SQLite
+        
+        Strategies save their orders there and adopt them again after a
+        restart. Calling this again returns the existing store.
+        
+        Args:
+            path: SQLite database file
+            
+        Returns:
+            StateStore: The store
+        """
+        if not self.state_store:
+            self.state_store = StateStore(path)
+            logger.info(f"Persisting strategy state to {path}")
+        return self.state_store
+    
+    def start_recorder(self, markets: List[Tuple[str, str]], **options) -> MarketRecorder:
+        """
+        Record ticker and order book snapshots of markets to disk
+        
+        The recorder shares this manager's subscriptions and quote store, so
+        recording a market a strategy already follows adds no requests.
+        Calling this again returns the existing recorder.
+        
+        Args:
+            markets: (exchange_id, symbol) pairs to record
+            **options: MarketRecorder settings, e.g. order_book_depth or rotate_interval
+            
+        Returns:
+            MarketRecorder: The recorder
+        """
+        if not self.recorder:
+            self.recorder = MarketRecorder(self, markets, **options)
+            self.recorder.start()
+        return self.recorder
+    
+    def get_rate_limit_stats(self, exchange_id: str) -> Dict:
+        """
+        Get rate limiter statistics for an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            
+        Returns:
+            Dict: Queue depth and wait times per lane, empty if not found
+        """
+        limiter = self.rate_limiters.get(exchange_id)
+        if not limiter:
+            return {}
+        return limiter.get_stats()
+    
+    def get_ticker_cache_stats(self) -> Dict:
+        """
+        Get ticker cache statistics
+        
+        Returns:
+            Dict: Hit, miss and coalesce counters
+        """
+        return self.ticker_cache.get_stats()
+    
     def get_supported_exchanges(self) -> List[str]:
         """
         Get a list of all exchanges supported by ccxt
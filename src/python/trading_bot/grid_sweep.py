@@ -0,0 +1,240 @@
+import os
+import time
+import logging
+import itertools
+import multiprocessing
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional, Union, Sequence
+
+logger = logging.getLogger("grid_sweep")
+
+def price_path(bars: Union[np.ndarray, Sequence]) -> np.ndarray:
+    """
+    Reduce a price series to the turning points a grid can react to
+    
+    OHLCV bars are expanded to open, low, high, close for rising bars and
+    open, high, low, close for falling ones. Only local extrema are kept:
+    a grid's state after a monotonic move depends on its end point alone.
+    
+    Args:
+        bars: Prices, or rows of [timestamp_ms, open, high, low, close, volume]
+        
+    Returns:
+        np.ndarray: Prices at the turning points, starting with the first price
+    """
+    bars = np.asarray(bars, dtype=np.float64)
+    if bars.ndim == 2:
+        opens, highs, lows, closes = bars[:, 1], bars[:, 2], bars[:, 3], bars[:, 4]
+        rising = closes >= opens
+        path = np.column_stack([
+            opens,
+            np.where(rising, lows, highs),
+            np.where(rising, highs, lows),
+            closes
+        ]).ravel()
+    else:
+        path = bars
+    
+    if len(path) < 2:
+        return path
+    
+    # Drop repeated prices, then every point inside a monotonic run
+    path = path[np.concatenate(([True], np.diff(path) != 0))]
+    moves = np.sign(np.diff(path))
+    turning = np.concatenate(([True], moves[1:] != moves[:-1], [True]))
+    return path[turning]
+
+def grid_combinations(
+    lower_prices: Sequence[float],
+    upper_prices: Sequence[float],
+    grid_levels: Sequence[int],
+    total_investments: Sequence[float]
+) -> List[Dict]:
+    """
+    Build every valid combination of grid parameters
+    
+    Args:
+        lower_prices: Candidate lower price boundaries
+        upper_prices: Candidate upper price boundaries
+        grid_levels: Candidate numbers of grid levels
+        total_investments: Candidate investments in quote currency
+        
+    Returns:
+        List[Dict]: Parameter sets with lower_price below upper_price and at least 2 levels
+    """
+    return [
+        {"lower_price": lower, "upper_price": upper, "grid_levels": levels, "total_investment": investment}
+        for lower, upper, levels, investment in itertools.product(lower_prices, upper_prices, grid_levels, total_investments)
+        if lower < upper and levels >= 2 and investment > 0
+    ]
+
+def simulate_grids(path: np.ndarray, combinations: List[Dict], fee_rate: float = 0.001) -> List[Dict]:
+    """
+    Simulate many grids over one price path at once
+    
+    Models GridTradingStrategy: levels are spaced evenly between the
+    bounds, every order is worth ``total_investment / grid_levels`` in
+    quote currency, a level equal to the start price gets no order, and a
+    filled order is replaced on the opposite side at the same price. Buys
+    then always rest below the price and sells above it, so each grid's
+    state is the number of levels holding buys, and a move of the price
+    updates all grids with a few array operations. Counter orders are
+    assumed to be resting before the price moves on.
+    
+    Args:
+        path: Price path from price_path
+        combinations: Parameter sets with lower_price, upper_price, grid_levels and total_investment
+        fee_rate: Fee as a fraction of the traded cost
+        
+    Returns:
+        List[Dict]: One result per combination, in the same order
+    """
+    lower = np.array([c["lower_price"] for c in combinations], dtype=np.float64)
+    upper = np.array([c["upper_price"] for c in combinations], dtype=np.float64)
+    levels = np.array([c["grid_levels"] for c in combinations], dtype=np.int64)
+    investment = np.array([c["total_investment"] for c in combinations], dtype=np.float64)
+    
+    rows = np.arange(len(combinations))
+    step = (upper - lower) / (levels - 1)
+    order_value = investment / levels
+    
+    start = path[0]
+    indexes = np.arange(levels.max())
+    prices = lower[:, None] + indexes[None, :] * step[:, None]
+    active = (indexes[None, :] < levels[:, None]) & (prices != start)
+    
+    # counts[c, j] is the number of orders below level j and inverse_sums[c, j]
+    # the sum of their 1 / price, so orders at levels a..b-1 hold
+    # order_value * (inverse_sums[b] - inverse_sums[a]) in base currency
+    counts = np.zeros((len(combinations), levels.max() + 1), dtype=np.int64)
+    np.cumsum(active, axis=1, out=counts[:, 1:])
+    inverse_sums = np.zeros((len(combinations), levels.max() + 1))
+    np.cumsum(np.where(active, 1.0 / prices, 0.0), axis=1, out=inverse_sums[:, 1:])
+    
+    # Levels below the boundary hold buys, the others sells
+    boundary = np.clip(np.ceil((start - lower) / step), 0, levels).astype(np.int64)
+    
+    # Sell orders are backed by base bought at the start price
+    inventory = order_value * (inverse_sums[rows, levels] - inverse_sums[rows, boundary])
+    cost = inventory * start
+    quote = order_value * counts[rows, boundary]
+    initial_value = quote + inventory * start
+    
+    buys = np.zeros(len(combinations), dtype=np.int64)
+    sells = np.zeros(len(combinations), dtype=np.int64)
+    realized = np.zeros(len(combinations))
+    fees = np.zeros(len(combinations))
+    peak = initial_value.copy()
+    max_drawdown = np.zeros(len(combinations))
+    
+    previous = start
+    for price in path[1:]:
+        position = (price - lower) / step
+        if price > previous:
+            # Sells at or below the price fill and become buys
+            reached = np.maximum(boundary, np.clip(np.floor(position) + 1, 0, levels).astype(np.int64))
+            filled = counts[rows, reached] - counts[rows, boundary]
+            if filled.any():
+                sold = order_value * (inverse_sums[rows, reached] - inverse_sums[rows, boundary])
+                proceeds = order_value * filled
+                fee = proceeds * fee_rate
+                average_cost = np.divide(cost, inventory, out=np.zeros_like(cost), where=inventory > 0)
+                realized += proceeds - sold * average_cost - fee
+                cost -= sold * average_cost
+                inventory -= sold
+                quote += proceeds - fee
+                fees += fee
+                sells += filled
+            boundary = reached
+        else:
+            # Buys at or above the price fill and become sells
+            reached = np.minimum(boundary, np.clip(np.ceil(position), 0, levels).astype(np.int64))
+            filled = counts[rows, boundary] - counts[rows, reached]
+            if filled.any():
+                bought = order_value * (inverse_sums[rows, boundary] - inverse_sums[rows, reached])
+                spent = order_value * filled
+                fee = spent * fee_rate
+                realized -= fee
+                cost += spent
+                inventory += bought
+                quote -= spent + fee
+                fees += fee
+                buys += filled
+            boundary = reached
+        
+        equity = quote + inventory * price
+        np.maximum(peak, equity, out=peak)
+        np.maximum(max_drawdown, (peak - equity) / peak, out=max_drawdown)
+        previous = price
+    
+    final_value = quote + inventory * path[-1]
+    return [
+        {
+            **combinations[i],
+            "fills": int(buys[i] + sells[i]),
+            "buys": int(buys[i]),
+            "sells": int(sells[i]),
+            "realized_pnl": float(realized[i]),
+            "unrealized_pnl": float(inventory[i] * path[-1] - cost[i]),
+            "fees": float(fees[i]),
+            "inventory": float(inventory[i]),
+            "quote_balance": float(quote[i]),
+            "initial_value": float(initial_value[i]),
+            "final_value": float(final_value[i]),
+            "return_pct": float((final_value[i] / initial_value[i] - 1) * 100),
+            "max_drawdown_pct": float(max_drawdown[i] * 100)
+        }
+        for i in range(len(combinations))
+    ]
+
+def sweep_grid(
+    bars: Union[np.ndarray, Sequence],
+    combinations: List[Dict],
+    fee_rate: float = 0.001,
+    processes: Optional[int] = None
+) -> List[Dict]:
+    """
+    Evaluate grid parameter combinations over a price series
+    
+    The combinations are split into one chunk per process and simulated
+    in a process pool; each chunk is vectorized over its combinations.
+    
+    Args:
+        bars: Prices, or rows of [timestamp_ms, open, high, low, close, volume]
+        combinations: Parameter sets, see grid_combinations
+        fee_rate: Fee as a fraction of the traded cost
+        processes: Number of worker processes, defaults to the CPU count
+        
+    Returns:
+        List[Dict]: Fills, realized and unrealized PnL, inventory, return and
+        max drawdown per combination, in the same order
+    """
+    if not combinations:
+        return []
+    
+    started_at = time.monotonic()
+    path = price_path(bars)
+    if len(path) < 2:
+        raise ValueError("At least two prices are required")
+    
+    processes = max(1, min(processes or os.cpu_count() or 1, len(combinations)))
+    chunk_size = -(-len(combinations) // processes)
+    chunks = [combinations[i:i + chunk_size] for i in range(0, len(combinations), chunk_size)]
+    
+    if len(chunks) == 1:
+        results = simulate_grids(path, chunks[0], fee_rate)
+    else:
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=len(chunks), mp_context=context) as executor:
+            results = [
+                result
+                for chunk in executor.map(simulate_grids, [path] * len(chunks), chunks, [fee_rate] * len(chunks))
+                for result in chunk
+            ]
+    
+    logger.info(
+        f"Swept {len(combinations)} grid combinations over {len(path)} turning points "
+        f"in {time.monotonic() - started_at:.2f}s with {len(chunks)} processes"
+    )
+    return results
\ No newline at end of file
@@ -0,0 +1,480 @@
+import os
+import logging
+import numpy as np
+from pathlib import Path
+from urllib.parse import quote, unquote
+from typing import Dict, List, Optional, Any, Tuple, Union, Sequence
+from config import DATA_DIR
+
+logger = logging.getLogger("history_store")
+
+# Directory holding the market history
+HISTORY_DIR = DATA_DIR / "history"
+
+# Milliseconds per day partition
+DAY_MS = 86400 * 1000
+
+# Column layout of each kind of data. Every column is stored in its own
+# file of raw little-endian values, so reads map the files instead of parsing.
+SCHEMAS: Dict[str, np.dtype] = {
+    "ohlcv": np.dtype([
+        ("timestamp", "<i8"),
+        ("open", "<f8"),
+        ("high", "<f8"),
+        ("low", "<f8"),
+        ("close", "<f8"),
+        ("volume", "<f8")
+    ]),
+    "tickers": np.dtype([
+        ("timestamp", "<i8"),
+        ("bid", "<f8"),
+        ("bid_size", "<f8"),
+        ("ask", "<f8"),
+        ("ask_size", "<f8"),
+        ("last", "<f8"),
+        ("base_volume", "<f8")
+    ]),
+    "trades": np.dtype([
+        ("timestamp", "<i8"),
+        ("price", "<f8"),
+        ("amount", "<f8"),
+        # 1 buy, -1 sell, 0 unknown
+        ("side", "<i1"),
+        ("id", "S32")
+    ])
+}
+
+# Kinds with at most one row per timestamp
+UNIQUE_TIMESTAMPS = ("ohlcv",)
+
+def _value(value: Any) -> float:
+    return float(value) if value is not None else np.nan
+
+class HistoryStore:
+    """
+    Append-only columnar store of market history
+    
+    Data is partitioned as ``<kind>/<exchange>/<symbol>/<YYYY-MM-DD>/`` with
+    one file per column. Rows are appended in time order; rows older than
+    what a partition already holds are dropped, and trades at its last
+    timestamp are matched by id, so re-running a download does not
+    duplicate data. Reads memory-map the column files and slice
+    them by timestamp with a binary search.
+    """
+    def __init__(self, root: Path = HISTORY_DIR):
+        """
+        Initialize the store
+        
+        Args:
+            root: Directory of the store
+        """
+        self.root = Path(root)
+    
+    @staticmethod
+    def _schema(kind: str) -> np.dtype:
+        schema = SCHEMAS.get(kind)
+        if schema is None:
+            raise ValueError(f"Unknown history kind {kind}, expected one of {', '.join(SCHEMAS)}")
+        return schema
+    
+    def get_path(self, kind: str, exchange_id: str, symbol: str, day: Optional[str] = None) -> Path:
+        """
+        Get the directory of a data set or one of its day partitions
+        
+        Args:
+            kind: "ohlcv", "tickers" or "trades"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            day: Partition date as YYYY-MM-DD
+            
+        Returns:
+            Path: Directory
+        """
+        path = self.root / kind / exchange_id / quote(symbol, safe="")
+        return path / day if day else path
+    
+    @staticmethod
+    def _day(day_index: int) -> str:
+        return str(np.datetime64(int(day_index), "D"))
+    
+    def _rows(self, path: Path, schema: np.dtype) -> int:
+        """
+        Count the complete rows of a partition
+        
+        Columns of a write interrupted by a crash can differ in length; only
+        rows present in every column count.
+        
+        Args:
+            path: Partition directory
+            schema: Column layout
+            
+        Returns:
+            int: Number of rows
+        """
+        counts = []
+        for name in schema.names:
+            column = path / f"{name}.bin"
+            counts.append(column.stat().st_size // schema[name].itemsize if column.exists() else 0)
+        return min(counts)
+    
+    def _last_timestamp(self, path: Path, rows: int) -> Optional[int]:
+        if not rows:
+            return None
+        with open(path / "timestamp.bin", "rb") as f:
+            f.seek((rows - 1) * 8)
+            return int(np.frombuffer(f.read(8), dtype="<i8")[0])
+    
+    def _boundary_ids(self, path: Path, schema: np.dtype, rows: int, last: int) -> np.ndarray:
+        """
+        Get the ids of the stored rows at the last timestamp of a partition
+        
+        Args:
+            path: Partition directory
+            schema: Column layout
+            rows: Number of complete rows
+            last: Last stored timestamp
+            
+        Returns:
+            np.ndarray: Ids of the rows with that timestamp
+        """
+        timestamps = self._map(path, "timestamp", schema["timestamp"], rows)
+        start = int(np.searchsorted(timestamps, last, side="left"))
+        return np.array(self._map(path, "id", schema["id"], rows)[start:])
+    
+    def append(self, kind: str, exchange_id: str, symbol: str, rows: Union[np.ndarray, Dict[str, Sequence]]) -> int:
+        """
+        Append rows to a data set
+        
+        Args:
+            kind: "ohlcv", "tickers" or "trades"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            rows: Structured array with the kind's columns, or a dict of column arrays
+            
+        Returns:
+            int: Number of rows written
+        """
+        schema = self._schema(kind)
+        if isinstance(rows, dict):
+            data = np.zeros(len(rows["timestamp"]), dtype=schema)
+            for name in schema.names:
+                if name in rows:
+                    data[name] = rows[name]
+        else:
+            data = np.asarray(rows).astype(schema, copy=False)
+        
+        if not len(data):
+            return 0
+        data = data[np.argsort(data["timestamp"], kind="stable")]
+        
+        written = 0
+        days = data["timestamp"] // DAY_MS
+        bounds = np.flatnonzero(np.diff(days)) + 1
+        for chunk in np.split(data, bounds):
+            written += self._append_partition(kind, exchange_id, symbol, schema, chunk)
+        return written
+    
+    def _append_partition(self, kind: str, exchange_id: str, symbol: str, schema: np.dtype, data: np.ndarray) -> int:
+        """
+        Append rows of one day
+        
+        Args:
+            kind: Kind of data
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            schema: Column layout
+            data: Rows sorted by timestamp, all on the same day
+            
+        Returns:
+            int: Number of rows written
+        """
+        path = self.get_path(kind, exchange_id, symbol, self._day(data["timestamp"][0] // DAY_MS))
+        path.mkdir(exist_ok=True, parents=True)
+        
+        rows = self._rows(path, schema)
+        
+        # Cut off a torn write so all columns line up again
+        for name in schema.names:
+            column = path / f"{name}.bin"
+            if column.exists() and column.stat().st_size != rows * schema[name].itemsize:
+                os.truncate(column, rows * schema[name].itemsize)
+        
+        last = self._last_timestamp(path, rows)
+        if last is not None:
+            if kind in UNIQUE_TIMESTAMPS:
+                keep = data["timestamp"] > last
+            elif "id" in schema.names:
+                # Rows at the stored last timestamp are new unless their id is stored
+                keep = data["timestamp"] > last
+                boundary = data["timestamp"] == last
+                if boundary.any():
+                    keep[boundary] = ~np.isin(data["id"][boundary], self._boundary_ids(path, schema, rows, last))
+            else:
+                keep = data["timestamp"] >= last
+            if not keep.all():
+                logger.debug(f"Dropped {int((~keep).sum())} {kind} rows of {symbol} on {exchange_id} already stored")
+                data = data[keep]
+            if not len(data):
+                return 0
+        
+        # The timestamp column goes last, a row only counts once it is complete
+        for name in sorted(schema.names, key=lambda name: name == "timestamp"):
+            with open(path / f"{name}.bin", "ab") as f:
+                f.write(np.ascontiguousarray(data[name]).tobytes())
+        return len(data)
+    
+    def append_ohlcv(self, exchange_id: str, symbol: str, candles: List[List[float]]) -> int:
+        """
+        Append candles as returned by ccxt fetch_ohlcv
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            candles: Rows of [timestamp, open, high, low, close, volume]
+            
+        Returns:
+            int: Number of rows written
+        """
+        if not len(candles):
+            return 0
+        candles = np.asarray(candles, dtype=np.float64)
+        return self.append("ohlcv", exchange_id, symbol, {
+            "timestamp": candles[:, 0].astype(np.int64),
+            "open": candles[:, 1],
+            "high": candles[:, 2],
+            "low": candles[:, 3],
+            "close": candles[:, 4],
+            "volume": candles[:, 5]
+        })
+    
+    def append_tickers(self, exchange_id: str, symbol: str, tickers: List[Dict]) -> int:
+        """
+        Append ccxt-style tickers, skipping ones without a timestamp
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            tickers: Tickers
+            
+        Returns:
+            int: Number of rows written
+        """
+        tickers = [ticker for ticker in tickers if ticker.get("timestamp") is not None]
+        return self.append("tickers", exchange_id, symbol, {
+            "timestamp": [ticker["timestamp"] for ticker in tickers],
+            "bid": [_value(ticker.get("bid")) for ticker in tickers],
+            "bid_size": [_value(ticker.get("bidVolume")) for ticker in tickers],
+            "ask": [_value(ticker.get("ask")) for ticker in tickers],
+            "ask_size": [_value(ticker.get("askVolume")) for ticker in tickers],
+            "last": [_value(ticker.get("last")) for ticker in tickers],
+            "base_volume": [_value(ticker.get("baseVolume")) for ticker in tickers]
+        })
+    
+    def append_trades(self, exchange_id: str, symbol: str, trades: List[Dict]) -> int:
+        """
+        Append public trades as returned by ccxt fetch_trades
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            trades: Trades
+            
+        Returns:
+            int: Number of rows written
+        """
+        trades = [trade for trade in trades if trade.get("timestamp") is not None]
+        sides = {"buy": 1, "sell": -1}
+        return self.append("trades", exchange_id, symbol, {
+            "timestamp": [trade["timestamp"] for trade in trades],
+            "price": [_value(trade.get("price")) for trade in trades],
+            "amount": [_value(trade.get("amount")) for trade in trades],
+            "side": [sides.get(trade.get("side"), 0) for trade in trades],
+            "id": [str(trade.get("id") or "").encode()[:32] for trade in trades]
+        })
+    
+    def get_days(self, kind: str, exchange_id: str, symbol: str) -> List[str]:
+        """
+        List the day partitions of a data set
+        
+        Args:
+            kind: "ohlcv", "tickers" or "trades"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            List[str]: Dates as YYYY-MM-DD in ascending order
+        """
+        path = self.get_path(kind, exchange_id, symbol)
+        if not path.exists():
+            return []
+        return sorted(entry.name for entry in path.iterdir() if entry.is_dir())
+    
+    def _map(self, path: Path, name: str, dtype: np.dtype, rows: int) -> np.ndarray:
+        if not rows:
+            return np.empty(0, dtype=dtype)
+        return np.memmap(path / f"{name}.bin", dtype=dtype, mode="r", shape=(rows,))
+    
+    def read(
+        self,
+        kind: str,
+        exchange_id: str,
+        symbol: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        columns: Optional[List[str]] = None
+    ) -> Dict[str, np.ndarray]:
+        """
+        Read a time range of a data set
+        
+        Only the day partitions overlapping the range are opened. A range
+        within one day returns read-only views of the memory-mapped files;
+        longer ranges are concatenated into new arrays.
+        
+        Args:
+            kind: "ohlcv", "tickers" or "trades"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            start: First timestamp in milliseconds, inclusive
+            end: Last timestamp in milliseconds, exclusive
+            columns: Columns to read, defaults to all
+            
+        Returns:
+            Dict[str, np.ndarray]: Column name to values
+        """
+        schema = self._schema(kind)
+        columns = columns or list(schema.names)
+        if "timestamp" not in columns:
+            columns = ["timestamp"] + columns
+        for name in columns:
+            if name not in schema.names:
+                raise ValueError(f"Unknown {kind} column {name}")
+        
+        first_day = self._day(start // DAY_MS) if start is not None else None
+        last_day = self._day((end - 1) // DAY_MS) if end is not None else None
+        
+        parts: Dict[str, List[np.ndarray]] = {name: [] for name in columns}
+        for day in self.get_days(kind, exchange_id, symbol):
+            if (first_day and day < first_day) or (last_day and day > last_day):
+                continue
+            
+            path = self.get_path(kind, exchange_id, symbol, day)
+            rows = self._rows(path, schema)
+            timestamps = self._map(path, "timestamp", schema["timestamp"], rows)
+            lo = int(np.searchsorted(timestamps, start, side="left")) if start is not None else 0
+            hi = int(np.searchsorted(timestamps, end, side="left")) if end is not None else rows
+            if hi <= lo:
+                continue
+            
+            for name in columns:
+                parts[name].append(self._map(path, name, schema[name], rows)[lo:hi])
+        
+        return {
+            name: (chunks[0] if len(chunks) == 1 else np.concatenate(chunks) if chunks else np.empty(0, dtype=schema[name]))
+            for name, chunks in parts.items()
+        }
+    
+    def read_frame(
+        self,
+        kind: str,
+        exchange_id: str,
+        symbol: str,
+        start: Optional[int] = None,
+        end: Optional[int] = None,
+        columns: Optional[List[str]] = None
+    ) -> Any:
+        """
+        Read a time range of a data set as a pandas DataFrame
+        
+        Args:
+            kind: "ohlcv", "tickers" or "trades"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            start: First timestamp in milliseconds, inclusive
+            end: Last timestamp in milliseconds, exclusive
+            columns: Columns to read, defaults to all
+            
+        Returns:
+            pandas.DataFrame: Rows indexed by UTC time
+        """
+        import pandas as pd
+        
+        data = self.read(kind, exchange_id, symbol, start, end, columns)
+        if "id" in data:
+            data["id"] = np.char.decode(data["id"])
+        frame = pd.DataFrame(data)
+        frame.index = pd.to_datetime(frame["timestamp"], unit="ms", utc=True)
+        frame.index.name = "time"
+        return frame
+    
+    def read_ohlcv(self, exchange_id: str, symbol: str, start: Optional[int] = None, end: Optional[int] = None) -> np.ndarray:
+        """
+        Read candles in the layout of ccxt fetch_ohlcv, as used by the backtester
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            start: First timestamp in milliseconds, inclusive
+            end: Last timestamp in milliseconds, exclusive
+            
+        Returns:
+            np.ndarray: Rows of [timestamp, open, high, low, close, volume]
+        """
+        data = self.read("ohlcv", exchange_id, symbol, start, end)
+        return np.column_stack([data[name].astype(np.float64) for name in SCHEMAS["ohlcv"].names])
+    
+    def get_range(self, kind: str, exchange_id: str, symbol: str) -> Optional[Tuple[int, int]]:
+        """
+        Get the first and last stored timestamp of a data set
+        
+        Args:
+            kind: "ohlcv", "tickers" or "trades"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            Tuple of (first, last) timestamps in milliseconds, or None if empty
+        """
+        schema = self._schema(kind)
+        first = last = None
+        for day in self.get_days(kind, exchange_id, symbol):
+            path = self.get_path(kind, exchange_id, symbol, day)
+            rows = self._rows(path, schema)
+            if not rows:
+                continue
+            if first is None:
+                first = int(self._map(path, "timestamp", schema["timestamp"], rows)[0])
+            last = self._last_timestamp(path, rows)
+        return (first, last) if first is not None else None
+    
+    def list_datasets(self) -> List[Dict]:
+        """
+        List all stored data sets
+        
+        Returns:
+            List[Dict]: Kind, exchange, symbol, number of days, rows and bytes on disk
+        """
+        datasets = []
+        if not self.root.exists():
+            return datasets
+        
+        for kind_dir in sorted(self.root.iterdir()):
+            if kind_dir.name not in SCHEMAS:
+                continue
+            schema = SCHEMAS[kind_dir.name]
+            for exchange_dir in sorted(entry for entry in kind_dir.iterdir() if entry.is_dir()):
+                for symbol_dir in sorted(entry for entry in exchange_dir.iterdir() if entry.is_dir()):
+                    days = sorted(entry for entry in symbol_dir.iterdir() if entry.is_dir())
+                    datasets.append({
+                        "kind": kind_dir.name,
+                        "exchange_id": exchange_dir.name,
+                        "symbol": unquote(symbol_dir.name),
+                        "days": len(days),
+                        "first_day": days[0].name if days else None,
+                        "last_day": days[-1].name if days else None,
+                        "rows": sum(self._rows(day, schema) for day in days),
+                        "bytes": sum(column.stat().st_size for day in days for column in day.iterdir())
+                    })
+        return datasets
+
+# Create a global instance of the history store
+history_store = HistoryStore()
\ No newline at end of file
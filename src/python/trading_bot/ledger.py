@@ -0,0 +1,257 @@
+import numpy as np
+from collections import deque
+from typing import Dict, List, Optional, Any, Tuple
+from clock import SYSTEM_CLOCK
+
+# Amounts below this are treated as zero when matching lots
+EPSILON = 1e-12
+
+class Ledger:
+    """
+    Fill ledger with FIFO lot matching and running PnL
+    
+    Every (exchange, symbol) keeps a queue of open lots. A fill first closes
+    lots on the opposite side, oldest first, realizing their PnL, and opens
+    a lot with what is left. Each lot is opened and closed once, and
+    realized and unrealized PnL, fees, equity peak and drawdown are running
+    totals, so a fill or a price update costs O(1) amortized and reading
+    them costs nothing. Equity is PnL in quote currency, starting at zero.
+    
+    The equity history is kept in a fixed number of points: points closer
+    than ``resolution`` seconds are merged, and when the buffer is full
+    every other point is dropped and the resolution doubles.
+    """
+    def __init__(self, clock: Any = SYSTEM_CLOCK, capital: Optional[float] = None, resolution: float = 60.0, max_points: int = 512):
+        """
+        Initialize the ledger
+        
+        Args:
+            clock: Clock timestamping the equity history
+            capital: Capital the strategy trades with, used for drawdown percentages
+            resolution: Initial seconds between equity points
+            max_points: Capacity of the equity history
+        """
+        self.clock = clock
+        self.capital = capital
+        self.resolution = resolution
+        self.markets: Dict[Tuple[str, str], Dict] = {}
+        
+        self.fills = 0
+        self.round_trips = 0
+        self.wins = 0
+        self.realized_pnl = 0.0
+        self.unrealized_pnl = 0.0
+        self.fees = 0.0
+        self.peak_equity = 0.0
+        self.max_drawdown = 0.0
+        
+        self.times = np.zeros(max_points)
+        self.values = np.zeros(max_points)
+        self.points = 0
+    
+    def _market(self, exchange_id: str, symbol: str) -> Dict:
+        key = (exchange_id, symbol)
+        market = self.markets.get(key)
+        if market is None:
+            market = self.markets[key] = {
+                # Signed open lots as [amount, price], all on the same side
+                "lots": deque(),
+                "position": 0.0,
+                "cost": 0.0,
+                "mark": None,
+                "unrealized": 0.0,
+                "realized": 0.0,
+                "fees": 0.0
+            }
+        return market
+    
+    def record_fill(
+        self,
+        exchange_id: str,
+        symbol: str,
+        side: str,
+        amount: float,
+        price: float,
+        fee: float = 0.0
+    ) -> float:
+        """
+        Book a fill
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            side: "buy" or "sell"
+            amount: Filled amount in base currency
+            price: Fill price
+            fee: Fee in quote currency
+            
+        Returns:
+            float: PnL realized by the fill, before fees
+        """
+        if amount <= 0 or price <= 0:
+            return 0.0
+        
+        market = self._market(exchange_id, symbol)
+        lots = market["lots"]
+        remaining = amount if side == "buy" else -amount
+        realized = 0.0
+        closed = False
+        
+        while lots and abs(remaining) > EPSILON and (lots[0][0] > 0) != (remaining > 0):
+            lot = lots[0]
+            direction = 1 if lot[0] > 0 else -1
+            matched = min(abs(lot[0]), abs(remaining))
+            realized += direction * (price - lot[1]) * matched
+            market["cost"] -= direction * matched * lot[1]
+            lot[0] -= direction * matched
+            remaining += direction * matched
+            closed = True
+            if abs(lot[0]) <= EPSILON:
+                lots.popleft()
+        
+        if abs(remaining) > EPSILON:
+            lots.append([remaining, price])
+            market["cost"] += remaining * price
+        
+        if lots:
+            market["position"] += amount if side == "buy" else -amount
+        else:
+            # Drop the rounding error of a flat position
+            market["position"] = market["cost"] = 0.0
+        
+        market["realized"] += realized
+        market["fees"] += fee
+        self.realized_pnl += realized
+        self.fees += fee
+        self.fills += 1
+        if closed:
+            self.round_trips += 1
+            if realized - fee > 0:
+                self.wins += 1
+        
+        self._revalue(market, price)
+        return realized
+    
+    def mark(self, exchange_id: str, symbol: str, price: float) -> None:
+        """
+        Revalue a market's open position at a new price
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            price: Current price, e.g. the mid or last price
+        """
+        market = self.markets.get((exchange_id, symbol))
+        if market is None or not price or price == market["mark"]:
+            return
+        self._revalue(market, price)
+    
+    def _revalue(self, market: Dict, price: float) -> None:
+        """
+        Update unrealized PnL, peak and drawdown after a change of a market
+        
+        Args:
+            market: Market state
+            price: Mark price
+        """
+        market["mark"] = price
+        unrealized = market["position"] * price - market["cost"]
+        self.unrealized_pnl += unrealized - market["unrealized"]
+        market["unrealized"] = unrealized
+        
+        equity = self.get_equity()
+        self.peak_equity = max(self.peak_equity, equity)
+        self.max_drawdown = max(self.max_drawdown, self.peak_equity - equity)
+        self._record(self.clock.time(), equity)
+    
+    def _record(self, now: float, equity: float) -> None:
+        """
+        Add a point to the equity history
+        
+        Args:
+            now: Unix time
+            equity: Equity at that time
+        """
+        if self.points and now - self.times[self.points - 1] < self.resolution:
+            self.values[self.points - 1] = equity
+            return
+        
+        if self.points == len(self.times):
+            # Halve the history and its resolution
+            kept = self.points // 2
+            self.times[:kept] = self.times[1:self.points:2]
+            self.values[:kept] = self.values[1:self.points:2]
+            self.points = kept
+            self.resolution *= 2
+        
+        self.times[self.points] = now
+        self.values[self.points] = equity
+        self.points += 1
+    
+    def get_equity(self) -> float:
+        """
+        Get realized plus unrealized PnL net of fees
+        
+        Returns:
+            float: Equity in quote currency
+        """
+        return self.realized_pnl + self.unrealized_pnl - self.fees
+    
+    def get_summary(self) -> Dict:
+        """
+        Get the running totals
+        
+        Returns:
+            Dict: Fills, round trips, win rate, PnL, fees, equity and drawdown
+        """
+        equity = self.get_equity()
+        drawdown = self.peak_equity - equity
+        base = (self.capital or 0.0) + self.peak_equity
+        return {
+            "trades": self.fills,
+            "round_trips": self.round_trips,
+            "wins": self.wins,
+            "win_rate": self.wins / self.round_trips * 100 if self.round_trips else 0.0,
+            "realized_pnl": self.realized_pnl,
+            "unrealized_pnl": self.unrealized_pnl,
+            "fees": self.fees,
+            "profit_loss": equity,
+            "peak_equity": self.peak_equity,
+            "drawdown": drawdown,
+            "max_drawdown": self.max_drawdown,
+            "max_drawdown_pct": self.max_drawdown / base * 100 if self.capital and base > 0 else None
+        }
+    
+    def get_positions(self) -> List[Dict]:
+        """
+        Get the open position and PnL of every traded market
+        
+        Returns:
+            List[Dict]: One entry per (exchange, symbol)
+        """
+        return [
+            {
+                "exchange_id": exchange_id,
+                "symbol": symbol,
+                "position": market["position"],
+                "average_price": market["cost"] / market["position"] if market["position"] else None,
+                "mark": market["mark"],
+                "open_lots": len(market["lots"]),
+                "realized_pnl": market["realized"],
+                "unrealized_pnl": market["unrealized"],
+                "fees": market["fees"]
+            }
+            for (exchange_id, symbol), market in self.markets.items()
+        ]
+    
+    def get_equity_series(self) -> Dict[str, List[float]]:
+        """
+        Get the equity history
+        
+        Returns:
+            Dict: "times" (Unix seconds) and "values" lists
+        """
+        return {
+            "times": self.times[:self.points].tolist(),
+            "values": self.values[:self.points].tolist()
+        }
\ No newline at end of file
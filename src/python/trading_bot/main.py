@@ -30,6 +30,10 @@ async def initialize():
     """Initialize the trading bot"""
     logger.info("Initializing trading bot...")
     
+    # Persist strategy state so a restart adopts the open orders
+    if config.global_settings.get("state_store", True):
+        exchange_manager.enable_state_store()
+    
     # Initialize exchanges
     for exchange_config in config.exchanges:
         if exchange_config.enabled:
@@ -41,7 +45,7 @@ async def initialize():
     
     # Initialize active strategy if configured
     if config.active_strategy:
-        success = strategy_manager.set_active_strategy(
+        success = await strategy_manager.set_active_strategy(
             strategy_id=config.active_strategy,
             exchange_manager=exchange_manager,
             parameters=config.strategy_params
@@ -52,6 +56,39 @@ async def initialize():
         else:
             logger.error(f"Failed to initialize strategy: {config.active_strategy}")
     
+    # Publish quotes to shared memory for local consumers if configured
+    if config.global_settings.get("market_bus"):
+        exchange_manager.enable_market_bus(config.global_settings.get("market_bus_name"))
+    
+    # Record quotes of the configured markets to disk
+    recorder_markets = config.global_settings.get("recorder_markets")
+    if recorder_markets:
+        exchange_manager.start_recorder(
+            [(market["exchange_id"], market["symbol"]) for market in recorder_markets],
+            order_book_depth=config.global_settings.get("recorder_order_book_depth", 10)
+        )
+    
+    # Shard named strategy instances across worker processes if configured
+    num_workers = config.global_settings.get("strategy_workers", 0)
+    if num_workers:
+        strategy_manager.start_workers(exchange_manager, num_workers)
+        logger.info(f"Running strategy instances in {num_workers} worker processes")
+    
+    # Initialize named strategy instances
+    for instance in config.strategy_instances:
+        success = await strategy_manager.deploy_instance(
+            name=instance["name"],
+            strategy_id=instance["strategy_id"],
+            exchange_manager=exchange_manager,
+            parameters=instance.get("parameters", {}),
+            start=instance.get("autostart", True)
+        )
+        
+        if success:
+            logger.info(f"Initialized strategy instance: {instance['name']}")
+        else:
+            logger.error(f"Failed to initialize strategy instance: {instance['name']}")
+    
     logger.info("Trading bot initialized")
 
 async def start_bot():
@@ -73,14 +110,12 @@ async def stop_bot():
     """Stop the trading bot"""
     logger.info("Stopping trading bot...")
     
-    # Stop active strategy if running
-    if strategy_manager.get_active_strategy():
-        success = strategy_manager.stop_active_strategy()
-        
-        if success:
-            logger.info("Stopped active strategy")
-        else:
-            logger.error("Failed to stop active strategy")
+    # Stop all running strategy instances, including the active strategy
+    await strategy_manager.stop_all()
+    logger.info("Stopped strategy instances")
+    
+    # Close pooled exchange sessions
+    await exchange_manager.close()
     
     logger.info("Trading bot stopped")
 
@@ -119,11 +154,14 @@ def parse_args():
     parser.add_argument("--api", action="store_true", help="Run the API server")
     parser.add_argument("--host", type=str, default="0.0.0.0", help="API server host")
     parser.add_argument("--port", type=int, default=8000, help="API server port")
+    parser.add_argument("--workers", type=int, default=None, help="Number of strategy worker processes (0 runs instances in-process)")
     return parser.parse_args()
 
 if __name__ == "__main__":
     # Parse command line arguments
     args = parse_args()
+    if args.workers is not None:
+        config.global_settings["strategy_workers"] = args.workers
     
     # Register signal handlers
     signal.signal(signal.SIGINT, signal_handler)
@@ -0,0 +1,437 @@
+import os
+import time
+import logging
+import multiprocessing
+from multiprocessing import resource_tracker
+from multiprocessing.shared_memory import SharedMemory
+import numpy as np
+from typing import Dict, List, Optional, Any, Tuple, Set
+
+logger = logging.getLogger("market_bus")
+
+# Prefix of the shared memory segment name, followed by the writer's pid
+BUS_NAME_PREFIX = "wattxchange_market_bus"
+
+# Longest exchange and symbol names a record holds, in bytes
+MAX_EXCHANGE_BYTES = 16
+MAX_SYMBOL_BYTES = 32
+
+# Record kinds
+KIND_TICKER = 1
+KIND_BOOK_TOP = 2
+
+# Fixed record layout. ``version`` is a per-slot seqlock: it is odd while
+# the slot is being written and 2 * seq once record ``seq`` is complete.
+RECORD_DTYPE = np.dtype([
+    ("version", "<u8"),
+    ("seq", "<u8"),
+    ("kind", "<u1"),
+    ("exchange", f"S{MAX_EXCHANGE_BYTES}"),
+    ("symbol", f"S{MAX_SYMBOL_BYTES}"),
+    ("timestamp", "<i8"),
+    ("received_at", "<f8"),
+    ("bid", "<f8"),
+    ("bid_size", "<f8"),
+    ("ask", "<f8"),
+    ("ask_size", "<f8"),
+    ("last", "<f8"),
+    ("base_volume", "<f8")
+], align=True)
+
+# Header: sequence number of the last complete record, ring capacity and writer process
+HEADER_DTYPE = np.dtype([
+    ("head", "<u8"),
+    ("capacity", "<u8"),
+    ("writer_pid", "<u8")
+], align=True)
+HEADER_SIZE = 64
+
+def default_bus_name(pid: Optional[int] = None) -> str:
+    """
+    Get the segment name of the bus written by a process
+    
+    Args:
+        pid: Process ID of the writer, defaults to the current process
+        
+    Returns:
+        str: Segment name
+    """
+    return f"{BUS_NAME_PREFIX}_{pid or os.getpid()}"
+
+def _pid_alive(pid: int) -> bool:
+    """
+    Check whether a process exists
+    
+    Args:
+        pid: Process ID
+        
+    Returns:
+        bool: True if the process is running
+    """
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        return True
+    return True
+
+def _value(value: Any) -> float:
+    """
+    Convert an optional number to a float, NaN if missing
+    
+    Args:
+        value: Number or None
+        
+    Returns:
+        float: Value
+    """
+    return float(value) if value is not None else np.nan
+
+def _optional(value: float) -> Optional[float]:
+    """
+    Convert a stored float back to an optional number
+    
+    Args:
+        value: Stored value
+        
+    Returns:
+        float: Value or None if NaN
+    """
+    return None if np.isnan(value) else float(value)
+
+def _map(shm: SharedMemory) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Map the header and the record ring of a bus segment
+    
+    Args:
+        shm: Shared memory segment
+        
+    Returns:
+        Tuple of (header, records) arrays backed by the segment
+    """
+    header = np.ndarray((), dtype=HEADER_DTYPE, buffer=shm.buf)
+    capacity = int(header["capacity"])
+    records = np.ndarray((capacity,), dtype=RECORD_DTYPE, buffer=shm.buf, offset=HEADER_SIZE)
+    return header, records
+
+def record_to_ticker(record: np.void) -> Dict:
+    """
+    Convert a record to a ccxt-style ticker
+    
+    Args:
+        record: Record read from the bus
+        
+    Returns:
+        Dict: Ticker
+    """
+    timestamp = int(record["timestamp"])
+    return {
+        "symbol": record["symbol"].decode(),
+        "timestamp": timestamp if timestamp >= 0 else None,
+        "bid": _optional(record["bid"]),
+        "bidVolume": _optional(record["bid_size"]),
+        "ask": _optional(record["ask"]),
+        "askVolume": _optional(record["ask_size"]),
+        "last": _optional(record["last"]),
+        "baseVolume": _optional(record["base_volume"])
+    }
+
+class MarketDataBus:
+    """
+    Single-writer market data ring buffer in shared memory
+    
+    Tickers and order book tops are written as fixed-layout records into a
+    NumPy structured array backed by a shared memory segment. Any number of
+    processes on the host can attach a MarketDataReader by name and read
+    the records without pickling or copying through a pipe. Every record
+    carries a sequence number, so readers can detect records they missed
+    because the ring wrapped around.
+    
+    Exchange and symbol names longer than a record holds are not published,
+    since cutting them short could make two markets share a key.
+    """
+    def __init__(self, name: Optional[str] = None, capacity: int = 65536):
+        """
+        Create the bus, replacing a stale segment with the same name
+        
+        Args:
+            name: Name of the shared memory segment, defaults to one derived from the pid
+            capacity: Number of records in the ring
+            
+        Raises:
+            FileExistsError: If a running process writes a bus with the same name
+        """
+        name = name or default_bus_name()
+        size = HEADER_SIZE + capacity * RECORD_DTYPE.itemsize
+        try:
+            self.shm = SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            existing = SharedMemory(name=name)
+            writer_pid = 0
+            if existing.size >= HEADER_SIZE:
+                writer_pid = int(np.ndarray((), dtype=HEADER_DTYPE, buffer=existing.buf)["writer_pid"])
+            if writer_pid and writer_pid != os.getpid() and _pid_alive(writer_pid):
+                # Keep this process's resource tracker from removing it at exit
+                existing.close()
+                resource_tracker.unregister(existing._name, "shared_memory")
+                raise FileExistsError(f"Market data bus {name} is in use by process {writer_pid}")
+            
+            # Left behind by a writer that did not shut down
+            existing.close()
+            existing.unlink()
+            self.shm = SharedMemory(name=name, create=True, size=size)
+        
+        self.name = name
+        self.capacity = capacity
+        header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        header["head"] = 0
+        header["capacity"] = capacity
+        header["writer_pid"] = os.getpid()
+        self.header, self.records = _map(self.shm)
+        self.records["version"] = 0
+        self.seq = 0
+        self.published = 0
+        self.rejected: Set[Tuple[str, str]] = set()
+    
+    def publish(
+        self,
+        kind: int,
+        exchange_id: str,
+        symbol: str,
+        bid: Optional[float] = None,
+        bid_size: Optional[float] = None,
+        ask: Optional[float] = None,
+        ask_size: Optional[float] = None,
+        last: Optional[float] = None,
+        base_volume: Optional[float] = None,
+        timestamp: Optional[int] = None
+    ) -> Optional[int]:
+        """
+        Write a record
+        
+        Args:
+            kind: KIND_TICKER or KIND_BOOK_TOP
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            bid: Best bid price
+            bid_size: Best bid size
+            ask: Best ask price
+            ask_size: Best ask size
+            last: Last trade price
+            base_volume: 24h volume in base currency
+            timestamp: Exchange timestamp in milliseconds
+            
+        Returns:
+            int: Sequence number of the record, or None if a name is too long
+        """
+        exchange = exchange_id.encode()
+        name = symbol.encode()
+        if len(exchange) > MAX_EXCHANGE_BYTES or len(name) > MAX_SYMBOL_BYTES:
+            if (exchange_id, symbol) not in self.rejected:
+                self.rejected.add((exchange_id, symbol))
+                logger.warning(
+                    f"Not publishing {symbol} on {exchange_id} to the market data bus, "
+                    f"names are limited to {MAX_EXCHANGE_BYTES} and {MAX_SYMBOL_BYTES} bytes"
+                )
+            return None
+        
+        seq = self.seq + 1
+        record = self.records[(seq - 1) % self.capacity]
+        
+        record["version"] = 2 * seq - 1
+        record["seq"] = seq
+        record["kind"] = kind
+        record["exchange"] = exchange
+        record["symbol"] = name
+        record["timestamp"] = timestamp if timestamp is not None else -1
+        record["received_at"] = time.time()
+        record["bid"] = _value(bid)
+        record["bid_size"] = _value(bid_size)
+        record["ask"] = _value(ask)
+        record["ask_size"] = _value(ask_size)
+        record["last"] = _value(last)
+        record["base_volume"] = _value(base_volume)
+        record["version"] = 2 * seq
+        
+        self.seq = seq
+        self.header["head"] = seq
+        self.published += 1
+        return seq
+    
+    def publish_ticker(self, exchange_id: str, symbol: str, ticker: Dict) -> Optional[int]:
+        """
+        Write a ticker as produced by ExchangeManager.fetch_ticker
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            ticker: Ticker
+            
+        Returns:
+            int: Sequence number of the record, or None if it was not published
+        """
+        return self.publish(
+            KIND_TICKER,
+            exchange_id,
+            symbol,
+            bid=ticker.get("bid"),
+            bid_size=ticker.get("bidVolume"),
+            ask=ticker.get("ask"),
+            ask_size=ticker.get("askVolume"),
+            last=ticker.get("last"),
+            base_volume=ticker.get("baseVolume"),
+            timestamp=ticker.get("timestamp")
+        )
+    
+    def publish_book_top(self, exchange_id: str, symbol: str, order_book: Any) -> Optional[int]:
+        """
+        Write the best bid and ask of an order book
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            order_book: Normalized order book
+            
+        Returns:
+            int: Sequence number of the record, or None if the book is empty or was not published
+        """
+        top = order_book.top(1)
+        bids, asks = top["bids"], top["asks"]
+        if not len(bids) and not len(asks):
+            return None
+        
+        return self.publish(
+            KIND_BOOK_TOP,
+            exchange_id,
+            symbol,
+            bid=bids[0][0] if len(bids) else None,
+            bid_size=bids[0][1] if len(bids) else None,
+            ask=asks[0][0] if len(asks) else None,
+            ask_size=asks[0][1] if len(asks) else None,
+            timestamp=order_book.timestamp
+        )
+    
+    def on_quote(self, kind: str, exchange_id: str, symbol: str, data: Any) -> None:
+        """
+        Quote store listener publishing every update
+        
+        Args:
+            kind: "ticker" or "order_book"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            data: Ticker or order book
+        """
+        if kind == "ticker":
+            self.publish_ticker(exchange_id, symbol, data)
+        else:
+            self.publish_book_top(exchange_id, symbol, data)
+    
+    def get_status(self) -> Dict:
+        """
+        Get the state of the bus
+        
+        Returns:
+            Dict: Name, capacity, record size and last sequence number
+        """
+        return {
+            "name": self.name,
+            "capacity": self.capacity,
+            "record_size": RECORD_DTYPE.itemsize,
+            "head": self.seq,
+            "published": self.published,
+            "rejected": sorted(f"{exchange_id}:{symbol}" for exchange_id, symbol in self.rejected)
+        }
+    
+    def close(self) -> None:
+        """
+        Release and remove the shared memory segment
+        """
+        self.header = None
+        self.records = None
+        self.shm.close()
+        try:
+            self.shm.unlink()
+        except FileNotFoundError:
+            pass
+
+class MarketDataReader:
+    """
+    Reader attached to a MarketDataBus by name
+    
+    Each reader keeps its own cursor and starts at the current head. Reads
+    copy only the records published since the previous poll.
+    """
+    def __init__(self, name: str):
+        """
+        Attach to a bus
+        
+        Args:
+            name: Name of the shared memory segment, see default_bus_name
+        """
+        self.shm = SharedMemory(name=name)
+        self.name = name
+        self.header, self.records = _map(self.shm)
+        
+        # Processes outside the writer's process tree have their own resource
+        # tracker, which would remove the writer's segment when they exit
+        writer_pid = int(self.header["writer_pid"])
+        parent = multiprocessing.parent_process()
+        if os.getpid() != writer_pid and (parent is None or parent.pid != writer_pid):
+            resource_tracker.unregister(self.shm._name, "shared_memory")
+        
+        self.capacity = len(self.records)
+        self.cursor = int(self.header["head"])
+        self.received = 0
+        self.missed = 0
+    
+    def poll(self) -> np.ndarray:
+        """
+        Read the records published since the last poll
+        
+        Records overwritten before they could be read are skipped and
+        counted in ``missed``.
+        
+        Returns:
+            np.ndarray: Records in sequence order
+        """
+        head = int(self.header["head"])
+        if head <= self.cursor:
+            return self.records[:0].copy()
+        
+        start = max(self.cursor + 1, head - self.capacity + 1)
+        seqs = np.arange(start, head + 1, dtype=np.uint64)
+        slots = (seqs - 1) % self.capacity
+        
+        batch = self.records[slots]
+        # A slot rewritten during the copy has a different version afterwards
+        valid = (batch["version"] == 2 * seqs) & (self.records["version"][slots] == batch["version"])
+        
+        batch = batch[valid]
+        self.missed += (head - self.cursor) - len(batch)
+        self.received += len(batch)
+        self.cursor = head
+        return batch
+    
+    def get_status(self) -> Dict:
+        """
+        Get the reader's position and loss counters
+        
+        Returns:
+            Dict: Cursor, received and missed record counts
+        """
+        return {
+            "name": self.name,
+            "cursor": self.cursor,
+            "head": int(self.header["head"]),
+            "received": self.received,
+            "missed": self.missed
+        }
+    
+    def close(self) -> None:
+        """
+        Detach from the bus
+        """
+        self.header = None
+        self.records = None
+        self.shm.close()
\ No newline at end of file
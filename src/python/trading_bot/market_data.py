@@ -0,0 +1,323 @@
+import time
+import logging
+import asyncio
+from typing import Dict, List, Optional, Any, Tuple, Callable
+from order_book import OrderBook
+
+logger = logging.getLogger("market_data")
+
+class QuoteStore:
+    """
+    In-memory store of the latest tickers and order books
+    
+    Streaming feeds write into the store and ExchangeManager reads from it,
+    so consumers of a subscribed market never touch the network. Listeners
+    are called synchronously on every update.
+    """
+    def __init__(self):
+        self.tickers: Dict[Tuple[str, str], Tuple[float, Dict]] = {}
+        self.order_books: Dict[Tuple[str, str], Tuple[float, Any]] = {}
+        self.listeners: List[Callable[[str, str, str, Any], None]] = []
+    
+    def add_listener(self, listener: Callable[[str, str, str, Any], None]) -> None:
+        """
+        Register a callback for store updates
+        
+        Args:
+            listener: Called as listener(kind, exchange_id, symbol, data) where kind is "ticker" or "order_book"
+        """
+        self.listeners.append(listener)
+    
+    def remove_listener(self, listener: Callable[[str, str, str, Any], None]) -> None:
+        """
+        Unregister a callback
+        
+        Args:
+            listener: Previously registered callback
+        """
+        if listener in self.listeners:
+            self.listeners.remove(listener)
+    
+    def _notify(self, kind: str, exchange_id: str, symbol: str, data: Any) -> None:
+        """
+        Call all listeners, isolating their errors from the feed
+        
+        Args:
+            kind: "ticker" or "order_book"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            data: Updated ticker or order book
+        """
+        for listener in list(self.listeners):
+            try:
+                listener(kind, exchange_id, symbol, data)
+            except Exception as e:
+                logger.error(f"Quote store listener failed: {str(e)}")
+    
+    def put_ticker(self, exchange_id: str, symbol: str, ticker: Dict) -> None:
+        """
+        Store the latest ticker for a market
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            ticker: Ticker
+        """
+        self.tickers[(exchange_id, symbol)] = (time.monotonic(), ticker)
+        self._notify("ticker", exchange_id, symbol, ticker)
+    
+    def put_order_book(self, exchange_id: str, symbol: str, order_book: OrderBook) -> None:
+        """
+        Store the latest order book for a market
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            order_book: Normalized order book
+        """
+        self.order_books[(exchange_id, symbol)] = (time.monotonic(), order_book)
+        self._notify("order_book", exchange_id, symbol, order_book)
+    
+    def get_ticker(self, exchange_id: str, symbol: str) -> Optional[Tuple[float, Dict]]:
+        """
+        Get the latest ticker for a market
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            Tuple of (age in seconds, ticker) or None if not stored
+        """
+        entry = self.tickers.get((exchange_id, symbol))
+        if not entry:
+            return None
+        return time.monotonic() - entry[0], entry[1]
+    
+    def get_order_book(self, exchange_id: str, symbol: str) -> Optional[Tuple[float, Any]]:
+        """
+        Get the latest order book for a market
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            Tuple of (age in seconds, order book) or None if not stored
+        """
+        entry = self.order_books.get((exchange_id, symbol))
+        if not entry:
+            return None
+        return time.monotonic() - entry[0], entry[1]
+    
+    def discard(self, kind: str, exchange_id: str, symbol: str) -> None:
+        """
+        Remove a stored ticker or order book
+        
+        Args:
+            kind: "ticker" or "order_book"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+        """
+        store = self.tickers if kind == "ticker" else self.order_books
+        store.pop((exchange_id, symbol), None)
+
+class MarketDataFeed:
+    """
+    Keeps one market's ticker or order book up to date in a QuoteStore
+    
+    A websocket stream is used when the exchange has one. Otherwise, or if
+    the stream keeps failing, the feed polls the REST API adaptively: the
+    interval halves when the data changed and grows by half when it did not,
+    bounded by ``min_interval`` and ``max_interval``.
+    
+    Readers only use feed data younger than the exchange's ticker TTL, so
+    with ``max_age`` set the polling interval is also kept below it. A
+    quiet market then costs one request per TTL instead of backing off to
+    ``max_interval``, but readers are served from the store rather than
+    sending requests of their own on top of the poller's.
+    """
+    # Consecutive websocket errors before falling back to REST polling
+    MAX_STREAM_ERRORS = 3
+    
+    def __init__(
+        self,
+        exchange_manager: Any,
+        exchange_id: str,
+        symbol: str,
+        kind: str = "ticker",
+        limit: Optional[int] = None,
+        min_interval: float = 1.0,
+        max_interval: float = 15.0,
+        max_age: Optional[float] = None
+    ):
+        """
+        Initialize the feed
+        
+        Args:
+            exchange_manager: Exchange manager instance
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            kind: "ticker" or "order_book"
+            limit: Order book depth
+            min_interval: Shortest REST polling interval in seconds
+            max_interval: Longest REST polling interval in seconds
+            max_age: Age in seconds at which readers stop using the feed's data
+        """
+        self.exchange_manager = exchange_manager
+        self.exchange_id = exchange_id
+        self.symbol = symbol
+        self.kind = kind
+        self.limit = limit
+        self.max_interval = max_interval
+        # Leave room for the request's latency before polled data expires
+        self.max_poll_interval = min(max_interval, max_age * 0.8) if max_age else max_interval
+        self.min_interval = min(min_interval, self.max_poll_interval)
+        self.interval = self.min_interval
+        self.mode: Optional[str] = None
+        self.task: Optional[asyncio.Task] = None
+        self.subscribers = 0
+        self.updates = 0
+        self.errors = 0
+    
+    def start(self) -> None:
+        """
+        Start the feed task
+        """
+        if self.task is None or self.task.done():
+            self.task = asyncio.ensure_future(self._run())
+    
+    async def stop(self) -> None:
+        """
+        Stop the feed task
+        """
+        if self.task:
+            self.task.cancel()
+            await asyncio.gather(self.task, return_exceptions=True)
+            self.task = None
+    
+    def is_live(self) -> bool:
+        """
+        Check whether the feed is running
+        
+        Returns:
+            bool: True if the feed task is running
+        """
+        return self.task is not None and not self.task.done()
+    
+    def is_streaming(self) -> bool:
+        """
+        Check whether updates are pushed over a websocket
+        
+        Returns:
+            bool: True if the feed is live and streaming
+        """
+        return self.is_live() and self.mode == "websocket"
+    
+    def _store(self, data: Any) -> None:
+        """
+        Write an update into the quote store
+        
+        Args:
+            data: Ticker or order book
+        """
+        store = self.exchange_manager.quote_store
+        if self.kind == "ticker":
+            store.put_ticker(self.exchange_id, self.symbol, data)
+        else:
+            store.put_order_book(self.exchange_id, self.symbol, OrderBook.from_ccxt(data, self.exchange_id))
+        self.updates += 1
+    
+    async def _run(self) -> None:
+        """
+        Main loop of the feed
+        """
+        client = self.exchange_manager.get_stream_client(self.exchange_id)
+        watch_method = "watchTicker" if self.kind == "ticker" else "watchOrderBook"
+        
+        if client is not None and client.has.get(watch_method):
+            await self._stream(client)
+        
+        await self._poll()
+    
+    async def _stream(self, client: Any) -> None:
+        """
+        Receive updates over a websocket until it fails repeatedly
+        
+        Args:
+            client: ccxt.pro exchange instance
+        """
+        self.mode = "websocket"
+        failures = 0
+        
+        while failures < self.MAX_STREAM_ERRORS:
+            try:
+                if self.kind == "ticker":
+                    data = await client.watch_ticker(self.symbol)
+                else:
+                    data = await client.watch_order_book(self.symbol, self.limit)
+                self._store(data)
+                self.mode = "websocket"
+                failures = 0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Stored data is no longer known to be current
+                self.mode = "reconnecting"
+                failures += 1
+                self.errors += 1
+                logger.warning(f"Stream error for {self.kind} {self.symbol} on {self.exchange_id}: {str(e)}")
+                await asyncio.sleep(min(self.max_interval, 2 ** failures))
+        
+        logger.warning(f"Falling back to REST polling for {self.kind} {self.symbol} on {self.exchange_id}")
+    
+    async def _poll(self) -> None:
+        """
+        Poll the REST API with an adaptive interval
+        """
+        self.mode = "polling"
+        previous = None
+        
+        while True:
+            try:
+                if self.kind == "ticker":
+                    data = await self.exchange_manager._call(self.exchange_id, "fetch_ticker", self.symbol)
+                    fingerprint = (data.get("bid"), data.get("ask"), data.get("last"))
+                else:
+                    data = await self.exchange_manager._call(self.exchange_id, "fetch_order_book", self.symbol, self.limit)
+                    fingerprint = (data["bids"][:1], data["asks"][:1], data.get("nonce"))
+                
+                self._store(data)
+                
+                if fingerprint != previous:
+                    self.interval = max(self.min_interval, self.interval / 2)
+                else:
+                    self.interval = min(self.max_poll_interval, self.interval * 1.5)
+                previous = fingerprint
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.errors += 1
+                self.interval = self.max_interval
+                logger.error(f"Polling error for {self.kind} {self.symbol} on {self.exchange_id}: {str(e)}")
+            
+            await asyncio.sleep(self.interval)
+    
+    def get_status(self) -> Dict:
+        """
+        Get the feed status
+        
+        Returns:
+            Dict: Feed status
+        """
+        return {
+            "exchange_id": self.exchange_id,
+            "symbol": self.symbol,
+            "kind": self.kind,
+            "mode": self.mode,
+            "live": self.is_live(),
+            "interval": self.interval if self.mode == "polling" else None,
+            "subscribers": self.subscribers,
+            "updates": self.updates,
+            "errors": self.errors
+        }
\ No newline at end of file
@@ -0,0 +1,202 @@
+import os
+import time
+import json
+import logging
+from pathlib import Path
+from typing import Dict, List, Optional, Any, Tuple
+from config import DATA_DIR
+
+logger = logging.getLogger("market_index")
+
+# Directory holding one market metadata file per exchange
+MARKETS_DIR = DATA_DIR / "markets"
+
+class MarketIndex:
+    """
+    Market metadata of one exchange, indexed for O(1) lookups
+    
+    Markets are indexed by symbol, by exchange market id and by base and
+    quote currency. The index is persisted under ``DATA_DIR/markets`` so a
+    cold start can reuse it instead of downloading every market again.
+    Sandbox markets are cached apart from live ones.
+    """
+    def __init__(self, exchange_id: str, markets: List[Dict], fetched_at: Optional[float] = None, sandbox: bool = False):
+        """
+        Build the index
+        
+        Args:
+            exchange_id: ID of the exchange
+            markets: Markets as returned by ccxt fetch_markets
+            fetched_at: Unix time the markets were downloaded, defaults to now
+            sandbox: Whether the markets are those of the exchange's sandbox
+        """
+        self.exchange_id = exchange_id
+        self.markets = markets
+        self.sandbox = sandbox
+        self.fetched_at = fetched_at if fetched_at is not None else time.time()
+        
+        self.by_symbol: Dict[str, Dict] = {}
+        self.by_id: Dict[str, Dict] = {}
+        self.by_base: Dict[str, List[Dict]] = {}
+        self.by_quote: Dict[str, List[Dict]] = {}
+        self.by_pair: Dict[Tuple[str, str], Dict] = {}
+        
+        for market in markets:
+            symbol = market.get("symbol")
+            base = market.get("base")
+            quote = market.get("quote")
+            
+            if symbol:
+                self.by_symbol[symbol] = market
+            if market.get("id") is not None:
+                # Keep the first market for ids shared across market types
+                self.by_id.setdefault(market["id"], market)
+            if base:
+                self.by_base.setdefault(base, []).append(market)
+            if quote:
+                self.by_quote.setdefault(quote, []).append(market)
+            if base and quote:
+                self.by_pair.setdefault((base, quote), market)
+    
+    def __len__(self) -> int:
+        return len(self.markets)
+    
+    def has_symbol(self, symbol: str) -> bool:
+        """
+        Check whether the exchange lists a symbol
+        
+        Args:
+            symbol: Market symbol
+            
+        Returns:
+            bool: True if the symbol is listed
+        """
+        return symbol in self.by_symbol
+    
+    def get(self, symbol: str) -> Optional[Dict]:
+        """
+        Get a market by symbol
+        
+        Args:
+            symbol: Market symbol
+            
+        Returns:
+            Dict: Market or None if not listed
+        """
+        return self.by_symbol.get(symbol)
+    
+    def get_by_id(self, market_id: str) -> Optional[Dict]:
+        """
+        Get a market by exchange market id
+        
+        Args:
+            market_id: Exchange-specific market id
+            
+        Returns:
+            Dict: Market or None if not listed
+        """
+        return self.by_id.get(market_id)
+    
+    def get_pair(self, base: str, quote: str) -> Optional[Dict]:
+        """
+        Get the market trading base against quote
+        
+        Args:
+            base: Base currency code
+            quote: Quote currency code
+            
+        Returns:
+            Dict: Market or None if not listed
+        """
+        return self.by_pair.get((base, quote))
+    
+    def markets_for_base(self, base: str) -> List[Dict]:
+        """
+        Get all markets with the given base currency
+        
+        Args:
+            base: Base currency code
+            
+        Returns:
+            List[Dict]: Markets
+        """
+        return self.by_base.get(base, [])
+    
+    def markets_for_quote(self, quote: str) -> List[Dict]:
+        """
+        Get all markets with the given quote currency
+        
+        Args:
+            quote: Quote currency code
+            
+        Returns:
+            List[Dict]: Markets
+        """
+        return self.by_quote.get(quote, [])
+    
+    def is_stale(self, max_age: float) -> bool:
+        """
+        Check whether the index is older than the refresh window
+        
+        Args:
+            max_age: Refresh window in seconds
+            
+        Returns:
+            bool: True if the markets should be downloaded again
+        """
+        return time.time() - self.fetched_at > max_age
+    
+    @staticmethod
+    def get_path(exchange_id: str, sandbox: bool = False) -> Path:
+        """
+        Get the cache file of an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            sandbox: Whether to get the file of the sandbox markets
+            
+        Returns:
+            Path: Cache file path
+        """
+        return MARKETS_DIR / (f"{exchange_id}-sandbox.json" if sandbox else f"{exchange_id}.json")
+    
+    def save(self) -> None:
+        """
+        Persist the index to its cache file
+        """
+        path = self.get_path(self.exchange_id, self.sandbox)
+        path.parent.mkdir(exist_ok=True, parents=True)
+        
+        # Write to a temporary file first so a crash never leaves a truncated cache
+        temp_path = path.with_suffix(".tmp")
+        with open(temp_path, 'w') as f:
+            json.dump({
+                "exchange_id": self.exchange_id,
+                "fetched_at": self.fetched_at,
+                "markets": self.markets
+            }, f)
+        os.replace(temp_path, path)
+    
+    @classmethod
+    def load(cls, exchange_id: str, sandbox: bool = False) -> Optional['MarketIndex']:
+        """
+        Load the persisted index of an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            sandbox: Whether to load the sandbox markets
+            
+        Returns:
+            MarketIndex: Index or None if there is no usable cache file
+        """
+        path = cls.get_path(exchange_id, sandbox)
+        if not path.exists():
+            return None
+        
+        try:
+            with open(path, 'r') as f:
+                data = json.load(f)
+            return cls(exchange_id, data["markets"], data["fetched_at"], sandbox)
+        except Exception as e:
+            logger.warning(f"Ignoring unreadable market cache {path}: {str(e)}")
+            return None
\ No newline at end of file
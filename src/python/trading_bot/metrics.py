@@ -0,0 +1,379 @@
+import bisect
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, List, Optional, Any, Tuple, Sequence
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+def _escape(value: str) -> str:
+    """
+    Escape a label value for the Prometheus text format
+    
+    Args:
+        value: Label value
+        
+    Returns:
+        str: Escaped value
+    """
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: Optional[Tuple[str, str]] = None) -> str:
+    """
+    Format a label set as {name="value",...}
+    
+    Args:
+        names: Label names
+        values: Label values
+        extra: Additional (name, value) pair, e.g. the histogram bucket bound
+        
+    Returns:
+        str: Formatted labels, empty if there are none
+    """
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(f'{extra[0]}="{extra[1]}"')
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+def _format_value(value: float) -> str:
+    """
+    Format a sample value
+    
+    Args:
+        value: Sample value
+        
+    Returns:
+        str: Formatted value
+    """
+    if value == float("inf"):
+        return "+Inf"
+    return repr(float(value))
+
+class Metric(ABC):
+    """
+    Base class of labelled metrics
+    """
+    type_name = "untyped"
+    
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        """
+        Initialize the metric
+        
+        Args:
+            name: Metric name
+            description: Help text
+            labels: Label names
+        """
+        self.name = name
+        self.description = description
+        self.label_names = tuple(labels)
+        self.lock = threading.Lock()
+    
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        """
+        Get the label values of a sample in label name order
+        
+        Args:
+            labels: Label name to value
+            
+        Returns:
+            Tuple of label values
+        """
+        return tuple(str(labels.get(name, "")) for name in self.label_names)
+    
+    def render(self) -> List[str]:
+        """
+        Render the metric in the Prometheus text format
+        
+        Returns:
+            List[str]: Lines
+        """
+        return [
+            f"# HELP {self.name} {self.description}",
+            f"# TYPE {self.name} {self.type_name}"
+        ] + self._samples()
+    
+    @abstractmethod
+    def _samples(self) -> List[str]:
+        """
+        Render the samples of the metric
+        
+        Returns:
+            List[str]: One line per sample
+        """
+        pass
+
+class Counter(Metric):
+    """
+    Monotonically increasing counter
+    """
+    type_name = "counter"
+    
+    def __init__(self, name: str, description: str, labels: Sequence[str] = ()):
+        super().__init__(name, description, labels)
+        self.values: Dict[Tuple[str, ...], float] = {}
+    
+    def inc(self, amount: float = 1.0, **labels) -> None:
+        """
+        Increment the counter
+        
+        Args:
+            amount: Increment
+            **labels: Label values
+        """
+        key = self._key(labels)
+        with self.lock:
+            self.values[key] = self.values.get(key, 0.0) + amount
+    
+    def get(self, **labels) -> float:
+        """
+        Get the current value
+        
+        Args:
+            **labels: Label values
+            
+        Returns:
+            float: Counter value
+        """
+        return self.values.get(self._key(labels), 0.0)
+    
+    def _samples(self) -> List[str]:
+        with self.lock:
+            items = list(self.values.items())
+        return [f"{self.name}{_format_labels(self.label_names, key)} {_format_value(value)}" for key, value in items]
+
+class Gauge(Counter):
+    """
+    Value that can go up and down
+    """
+    type_name = "gauge"
+    
+    def set(self, value: float, **labels) -> None:
+        """
+        Set the gauge
+        
+        Args:
+            value: New value
+            **labels: Label values
+        """
+        with self.lock:
+            self.values[self._key(labels)] = value
+
+class Histogram(Metric):
+    """
+    Histogram with fixed buckets
+    """
+    type_name = "histogram"
+    
+    def __init__(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS):
+        """
+        Initialize the histogram
+        
+        Args:
+            name: Metric name
+            description: Help text
+            labels: Label names
+            buckets: Ascending upper bounds, +Inf is added automatically
+        """
+        super().__init__(name, description, labels)
+        self.buckets = tuple(sorted(buckets))
+        # Per label set: non-cumulative bucket counts (last one is +Inf), sum and count
+        self.values: Dict[Tuple[str, ...], List] = {}
+    
+    def observe(self, value: float, **labels) -> None:
+        """
+        Record an observation
+        
+        Args:
+            value: Observed value
+            **labels: Label values
+        """
+        key = self._key(labels)
+        index = bisect.bisect_left(self.buckets, value)
+        with self.lock:
+            entry = self.values.get(key)
+            if entry is None:
+                entry = self.values[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            entry[0][index] += 1
+            entry[1] += value
+            entry[2] += 1
+    
+    def get(self, **labels) -> Dict[str, float]:
+        """
+        Get the sum and count of observations
+        
+        Args:
+            **labels: Label values
+            
+        Returns:
+            Dict: "sum" and "count"
+        """
+        entry = self.values.get(self._key(labels))
+        if not entry:
+            return {"sum": 0.0, "count": 0}
+        return {"sum": entry[1], "count": entry[2]}
+    
+    def _samples(self) -> List[str]:
+        with self.lock:
+            items = [(key, list(entry[0]), entry[1], entry[2]) for key, entry in self.values.items()]
+        
+        lines = []
+        for key, counts, total, count in items:
+            cumulative = 0
+            for bound, bucket_count in zip(self.buckets + (float("inf"),), counts):
+                cumulative += bucket_count
+                labels = _format_labels(self.label_names, key, ("le", _format_value(bound)))
+                lines.append(f"{self.name}_bucket{labels} {cumulative}")
+            labels = _format_labels(self.label_names, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(total)}")
+            lines.append(f"{self.name}_count{labels} {count}")
+        return lines
+
+class Registry:
+    """
+    Collection of metrics rendered together
+    """
+    def __init__(self):
+        self.metrics: Dict[str, Metric] = {}
+    
+    def register(self, metric: Metric) -> Metric:
+        """
+        Add a metric, returning the existing one if the name is taken
+        
+        Args:
+            metric: Metric to add
+            
+        Returns:
+            Metric: Registered metric
+        """
+        return self.metrics.setdefault(metric.name, metric)
+    
+    def counter(self, name: str, description: str, labels: Sequence[str] = ()) -> Counter:
+        """Create and register a counter"""
+        return self.register(Counter(name, description, labels))
+    
+    def gauge(self, name: str, description: str, labels: Sequence[str] = ()) -> Gauge:
+        """Create and register a gauge"""
+        return self.register(Gauge(name, description, labels))
+    
+    def histogram(self, name: str, description: str, labels: Sequence[str] = (), buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        """Create and register a histogram"""
+        return self.register(Histogram(name, description, labels, buckets))
+    
+    def render(self) -> str:
+        """
+        Render all metrics in the Prometheus text exposition format
+        
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        for metric in self.metrics.values():
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+# Global registry and the metrics recorded by the bot
+registry = Registry()
+
+exchange_request_duration = registry.histogram(
+    "exchange_request_duration_seconds",
+    "Latency of exchange API calls",
+    ("exchange", "method")
+)
+exchange_requests = registry.counter(
+    "exchange_requests_total",
+    "Exchange API calls",
+    ("exchange", "method")
+)
+exchange_errors = registry.counter(
+    "exchange_errors_total",
+    "Exchange API calls that raised an error",
+    ("exchange", "method", "error")
+)
+exchange_timeouts = registry.counter(
+    "exchange_timeouts_total",
+    "Exchange API calls that timed out",
+    ("exchange", "method")
+)
+rate_limit_wait = registry.histogram(
+    "exchange_rate_limit_wait_seconds",
+    "Time spent queued in the exchange rate limiter",
+    ("exchange", "lane")
+)
+strategy_tick_duration = registry.histogram(
+    "strategy_tick_duration_seconds",
+    "Duration of strategy ticks",
+    ("strategy",)
+)
+strategy_tick_errors = registry.counter(
+    "strategy_tick_errors_total",
+    "Strategy ticks that raised an error",
+    ("strategy",)
+)
+strategy_ticks = registry.counter(
+    "strategy_ticks_total",
+    "Strategy ticks by what triggered them",
+    ("strategy", "trigger")
+)
+strategy_tick_lateness = registry.histogram(
+    "strategy_tick_lateness_seconds",
+    "Delay between a timer tick's scheduled slot and its start",
+    ("strategy",)
+)
+strategy_tick_overruns = registry.counter(
+    "strategy_tick_overruns_total",
+    "Strategy ticks that took longer than the tick interval",
+    ("strategy",)
+)
+strategy_missed_ticks = registry.counter(
+    "strategy_missed_ticks_total",
+    "Timer slots skipped because the previous tick overran",
+    ("strategy",)
+)
+recorder_records = registry.counter(
+    "recorder_records_total",
+    "Market data snapshots captured by the recorder",
+    ("exchange", "kind")
+)
+recorder_dropped = registry.counter(
+    "recorder_dropped_records_total",
+    "Snapshots dropped because the recorder buffer was full",
+    ("exchange", "kind")
+)
+recorder_capture_duration = registry.histogram(
+    "recorder_capture_duration_seconds",
+    "Event loop time spent capturing one snapshot",
+    (),
+    (0.00001, 0.000025, 0.00005, 0.0001, 0.00025, 0.0005, 0.001, 0.005)
+)
+recorder_flush_duration = registry.histogram(
+    "recorder_flush_duration_seconds",
+    "Time to compress and write one batch of snapshots",
+    ()
+)
+recorder_bytes_written = registry.counter(
+    "recorder_bytes_written_total",
+    "Compressed bytes written by the recorder",
+    ("kind",)
+)
+recorder_buffered = registry.gauge(
+    "recorder_buffered_records",
+    "Snapshots waiting to be written",
+    ()
+)
+backfill_rows = registry.counter(
+    "backfill_rows_total",
+    "Rows of history downloaded into the history store",
+    ("exchange", "kind")
+)
+state_commit_duration = registry.histogram(
+    "state_commit_duration_seconds",
+    "Time to commit one batch of strategy state changes",
+    (),
+    (0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 1.0)
+)
+state_rows_written = registry.counter(
+    "state_rows_written_total",
+    "Strategy state rows written or deleted",
+    ()
+)
\ No newline at end of file
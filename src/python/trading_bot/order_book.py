@@ -0,0 +1,380 @@
+import time
+import numpy as np
+from typing import Dict, List, Optional, Any, Tuple, Iterable
+
+class BookSide:
+    """
+    One side of an L2 order book held in contiguous, sorted NumPy arrays
+    
+    Levels are kept best-first: descending prices for bids, ascending for
+    asks. Lookups use a binary search on ``keys``, which is the price for
+    asks and the negated price for bids so it is always ascending.
+    """
+    def __init__(self, descending: bool):
+        """
+        Initialize an empty side
+        
+        Args:
+            descending: True for bids, False for asks
+        """
+        self.descending = descending
+        self.keys = np.empty(0, dtype=np.float64)
+        self.sizes = np.empty(0, dtype=np.float64)
+    
+    @property
+    def prices(self) -> np.ndarray:
+        """
+        Level prices, best first
+        """
+        return -self.keys if self.descending else self.keys
+    
+    def __len__(self) -> int:
+        return len(self.keys)
+    
+    def _to_keys(self, prices: np.ndarray) -> np.ndarray:
+        """
+        Convert prices to ascending sort keys
+        
+        Args:
+            prices: Level prices
+            
+        Returns:
+            np.ndarray: Sort keys
+        """
+        return -prices if self.descending else prices
+    
+    def set_levels(self, prices: Iterable[float], sizes: Iterable[float]) -> None:
+        """
+        Replace all levels
+        
+        Args:
+            prices: Level prices in any order
+            sizes: Level sizes, levels with a size of zero are dropped
+        """
+        keys = self._to_keys(np.asarray(prices, dtype=np.float64))
+        sizes = np.asarray(sizes, dtype=np.float64)
+        
+        keep = sizes > 0
+        keys, sizes = keys[keep], sizes[keep]
+        
+        order = np.argsort(keys, kind="stable")
+        self.keys = keys[order]
+        self.sizes = sizes[order]
+    
+    def update(self, price: float, size: float) -> None:
+        """
+        Set the size of one level, removing it if the size is zero
+        
+        Args:
+            price: Level price
+            size: New level size
+        """
+        key = -price if self.descending else price
+        index = int(np.searchsorted(self.keys, key))
+        exists = index < len(self.keys) and self.keys[index] == key
+        
+        if size <= 0:
+            if exists:
+                self.keys = np.delete(self.keys, index)
+                self.sizes = np.delete(self.sizes, index)
+        elif exists:
+            self.sizes[index] = size
+        else:
+            self.keys = np.insert(self.keys, index, key)
+            self.sizes = np.insert(self.sizes, index, size)
+    
+    def update_many(self, prices: Iterable[float], sizes: Iterable[float]) -> None:
+        """
+        Apply a batch of level updates in one merge
+        
+        When a price appears more than once, the last update wins.
+        
+        Args:
+            prices: Level prices
+            sizes: New level sizes, zero removes the level
+        """
+        keys = self._to_keys(np.asarray(prices, dtype=np.float64))
+        sizes = np.asarray(sizes, dtype=np.float64)
+        if len(keys) == 0:
+            return
+        
+        # Keep the last update for each price
+        reversed_keys = keys[::-1]
+        unique_keys, first = np.unique(reversed_keys, return_index=True)
+        unique_sizes = sizes[::-1][first]
+        
+        untouched = ~np.isin(self.keys, unique_keys)
+        additions = unique_sizes > 0
+        
+        merged_keys = np.concatenate((self.keys[untouched], unique_keys[additions]))
+        merged_sizes = np.concatenate((self.sizes[untouched], unique_sizes[additions]))
+        
+        order = np.argsort(merged_keys, kind="stable")
+        self.keys = merged_keys[order]
+        self.sizes = merged_sizes[order]
+    
+    def top(self, n: int) -> np.ndarray:
+        """
+        Get the best levels
+        
+        Args:
+            n: Number of levels
+            
+        Returns:
+            np.ndarray: Array of shape (n, 2) with price and size columns
+        """
+        return np.column_stack((self.prices[:n], self.sizes[:n]))
+    
+    def cumulative_depth(self, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the cumulative size and notional from the best level outwards
+        
+        Args:
+            n: Number of levels, defaults to all
+            
+        Returns:
+            Tuple of (cumulative size, cumulative notional) arrays
+        """
+        prices = self.prices[:n]
+        sizes = self.sizes[:n]
+        return np.cumsum(sizes), np.cumsum(prices * sizes)
+    
+    def vwap(self, amount: float) -> Optional[float]:
+        """
+        Get the average price of consuming ``amount`` from the best level outwards
+        
+        Args:
+            amount: Size to consume in base currency
+            
+        Returns:
+            float: Volume-weighted average price or None if the side is too thin
+        """
+        if amount <= 0 or len(self.keys) == 0:
+            return None
+        
+        prices = self.prices
+        cumulative = np.cumsum(self.sizes)
+        last = int(np.searchsorted(cumulative, amount))
+        if last >= len(cumulative):
+            return None
+        
+        filled_before = cumulative[last - 1] if last > 0 else 0.0
+        cost = float(np.dot(prices[:last], self.sizes[:last])) + (amount - filled_before) * prices[last]
+        return cost / amount
+
+class OrderBook:
+    """
+    Incrementally maintained L2 order book
+    
+    Exchange order books (from ccxt, websocket streams or custom exchanges
+    such as TradeOgre) are normalized into this structure once, so consumers
+    can query the top of book, depth and fill prices without re-sorting or
+    re-scanning lists of ``[price, amount]`` pairs.
+    """
+    def __init__(self, symbol: Optional[str] = None, exchange_id: Optional[str] = None):
+        """
+        Initialize an empty order book
+        
+        Args:
+            symbol: Market symbol
+            exchange_id: ID of the exchange
+        """
+        self.symbol = symbol
+        self.exchange_id = exchange_id
+        self.bids = BookSide(descending=True)
+        self.asks = BookSide(descending=False)
+        self.timestamp: Optional[int] = None
+        self.nonce: Optional[int] = None
+    
+    @classmethod
+    def from_ccxt(cls, order_book: Dict, exchange_id: Optional[str] = None) -> 'OrderBook':
+        """
+        Build an order book from a ccxt-style dict
+        
+        Args:
+            order_book: Dict with "bids" and "asks" lists of [price, amount]
+            exchange_id: ID of the exchange
+            
+        Returns:
+            OrderBook: Normalized order book
+        """
+        book = cls(order_book.get("symbol"), exchange_id)
+        book.apply_snapshot(
+            order_book.get("bids", []),
+            order_book.get("asks", []),
+            timestamp=order_book.get("timestamp"),
+            nonce=order_book.get("nonce")
+        )
+        return book
+    
+    @staticmethod
+    def _split(levels: Any) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Split [price, amount, ...] levels into price and size arrays
+        
+        Args:
+            levels: Sequence of levels or an (n, 2) array
+            
+        Returns:
+            Tuple of (prices, sizes)
+        """
+        if len(levels) == 0:
+            return np.empty(0), np.empty(0)
+        if isinstance(levels, np.ndarray):
+            array = levels.astype(np.float64, copy=False)
+        else:
+            array = np.asarray([level[:2] for level in levels], dtype=np.float64)
+        return array[:, 0], array[:, 1]
+    
+    def apply_snapshot(
+        self,
+        bids: Any,
+        asks: Any,
+        timestamp: Optional[int] = None,
+        nonce: Optional[int] = None
+    ) -> None:
+        """
+        Replace the whole book
+        
+        Args:
+            bids: Bid levels as [price, amount] pairs
+            asks: Ask levels as [price, amount] pairs
+            timestamp: Exchange timestamp in milliseconds
+            nonce: Exchange sequence number
+        """
+        self.bids.set_levels(*self._split(bids))
+        self.asks.set_levels(*self._split(asks))
+        self.timestamp = timestamp if timestamp is not None else int(time.time() * 1000)
+        self.nonce = nonce
+    
+    def apply_delta(self, side: str, price: float, size: float) -> None:
+        """
+        Update one level
+        
+        Args:
+            side: "bids" or "asks"
+            price: Level price
+            size: New level size, zero removes the level
+        """
+        self._side(side).update(price, size)
+    
+    def apply_deltas(
+        self,
+        bids: Any = (),
+        asks: Any = (),
+        timestamp: Optional[int] = None,
+        nonce: Optional[int] = None
+    ) -> None:
+        """
+        Apply a batch of incremental updates
+        
+        Args:
+            bids: Bid updates as [price, size] pairs, size zero removes the level
+            asks: Ask updates as [price, size] pairs, size zero removes the level
+            timestamp: Exchange timestamp in milliseconds
+            nonce: Exchange sequence number
+        """
+        if len(bids):
+            self.bids.update_many(*self._split(bids))
+        if len(asks):
+            self.asks.update_many(*self._split(asks))
+        if timestamp is not None:
+            self.timestamp = timestamp
+        if nonce is not None:
+            self.nonce = nonce
+    
+    def _side(self, side: str) -> BookSide:
+        """
+        Get a book side by name
+        
+        Args:
+            side: "bids"/"buy" or "asks"/"sell"
+            
+        Returns:
+            BookSide: Book side
+        """
+        if side in ("bids", "bid", "buy"):
+            return self.bids
+        if side in ("asks", "ask", "sell"):
+            return self.asks
+        raise ValueError(f"Unknown order book side: {side}")
+    
+    @property
+    def best_bid(self) -> Optional[float]:
+        return float(self.bids.prices[0]) if len(self.bids) else None
+    
+    @property
+    def best_ask(self) -> Optional[float]:
+        return float(self.asks.prices[0]) if len(self.asks) else None
+    
+    @property
+    def mid_price(self) -> Optional[float]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return (self.best_bid + self.best_ask) / 2
+    
+    @property
+    def spread(self) -> Optional[float]:
+        if self.best_bid is None or self.best_ask is None:
+            return None
+        return self.best_ask - self.best_bid
+    
+    def top(self, n: int = 1) -> Dict[str, np.ndarray]:
+        """
+        Get the best levels of both sides
+        
+        Args:
+            n: Number of levels per side
+            
+        Returns:
+            Dict: "bids" and "asks" arrays of shape (n, 2)
+        """
+        return {"bids": self.bids.top(n), "asks": self.asks.top(n)}
+    
+    def cumulative_depth(self, side: str, n: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Get the cumulative size and notional of one side
+        
+        Args:
+            side: "bids" or "asks"
+            n: Number of levels, defaults to all
+            
+        Returns:
+            Tuple of (cumulative size, cumulative notional) arrays
+        """
+        return self._side(side).cumulative_depth(n)
+    
+    def vwap(self, side: str, amount: float) -> Optional[float]:
+        """
+        Get the average fill price of a market order
+        
+        Args:
+            side: Order side, "buy" consumes asks and "sell" consumes bids
+            amount: Order size in base currency
+            
+        Returns:
+            float: Volume-weighted average price or None if the book is too thin
+        """
+        if side == "buy":
+            return self.asks.vwap(amount)
+        if side == "sell":
+            return self.bids.vwap(amount)
+        raise ValueError(f"Unknown order side: {side}")
+    
+    def to_dict(self, limit: Optional[int] = None) -> Dict:
+        """
+        Convert the book to a ccxt-style dict
+        
+        Args:
+            limit: Maximum number of levels per side
+            
+        Returns:
+            Dict: Order book with "bids" and "asks" lists of [price, amount]
+        """
+        return {
+            "symbol": self.symbol,
+            "timestamp": self.timestamp,
+            "nonce": self.nonce,
+            "bids": self.bids.top(limit if limit is not None else len(self.bids)).tolist(),
+            "asks": self.asks.top(limit if limit is not None else len(self.asks)).tolist()
+        }
\ No newline at end of file
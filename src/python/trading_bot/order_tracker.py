@@ -0,0 +1,204 @@
+import time
+import logging
+import asyncio
+from typing import Dict, List, Optional, Any, Set
+
+logger = logging.getLogger("order_tracker")
+
+# Order statuses after which an order is no longer tracked
+FINAL_STATUSES = ("closed", "canceled", "cancelled", "expired", "rejected")
+
+# Fraction of an order that must be filled by trades to count as closed
+FILL_TOLERANCE = 1e-9
+
+class OrderTracker:
+    """
+    Reconciles the state of many orders on one (exchange, symbol) in batch
+    
+    Each reconcile takes one open-orders snapshot. Only tracked orders that
+    disappeared from it are looked up, with one closed-orders query (or one
+    my-trades query) starting at a ``since`` cursor. Individual fetch_order
+    calls are the last resort for orders neither query resolved.
+    """
+    def __init__(self, exchange_manager: Any, exchange_id: str, symbol: str, max_concurrency: int = 5):
+        """
+        Initialize the tracker
+        
+        Args:
+            exchange_manager: Exchange manager instance
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            max_concurrency: Cap on concurrent fetch_order fallbacks
+        """
+        self.exchange_manager = exchange_manager
+        self.exchange_id = exchange_id
+        self.symbol = symbol
+        self.max_concurrency = max_concurrency
+        self.orders: Dict[str, Dict] = {}
+        self.open_ids: Set[str] = set()
+        self.trades_since: Optional[int] = None
+        self.filled: Dict[str, float] = {}
+    
+    def track(self, order: Dict) -> None:
+        """
+        Start tracking a placed order
+        
+        Args:
+            order: Order as returned by create_order
+        """
+        order_id = str(order["id"])
+        self.orders[order_id] = dict(order, timestamp=order.get("timestamp") or int(time.time() * 1000))
+        self.open_ids.add(order_id)
+        if self.trades_since is None:
+            self.trades_since = self.orders[order_id]["timestamp"]
+    
+    def untrack(self, order_id: str) -> None:
+        """
+        Stop tracking an order
+        
+        Args:
+            order_id: ID of the order
+        """
+        order_id = str(order_id)
+        self.orders.pop(order_id, None)
+        self.open_ids.discard(order_id)
+        self.filled.pop(order_id, None)
+    
+    def get(self, order_id: str) -> Optional[Dict]:
+        """
+        Get the last known state of a tracked order
+        
+        Args:
+            order_id: ID of the order
+            
+        Returns:
+            Dict: Order or None if not tracked
+        """
+        return self.orders.get(str(order_id))
+    
+    def _orders_since(self) -> Optional[int]:
+        """
+        Get the cursor for closed-order queries
+        
+        Exchanges filter orders by creation time, so the query must reach
+        back to the oldest order that is still open.
+        
+        Returns:
+            int: Timestamp in milliseconds or None if nothing is open
+        """
+        timestamps = [self.orders[order_id]["timestamp"] for order_id in self.open_ids]
+        return min(timestamps) if timestamps else None
+    
+    def _apply(self, order: Dict, resolved: List[Dict]) -> None:
+        """
+        Record a fetched order state, collecting orders that became final
+        
+        Args:
+            order: Order as returned by ccxt
+            resolved: List collecting final orders
+        """
+        order_id = str(order.get("id"))
+        if order_id not in self.open_ids:
+            return
+        
+        self.orders[order_id].update({key: value for key, value in order.items() if value is not None})
+        if order.get("status") in FINAL_STATUSES:
+            self.open_ids.discard(order_id)
+            self.filled.pop(order_id, None)
+            resolved.append(self.orders.pop(order_id))
+    
+    async def reconcile(self) -> List[Dict]:
+        """
+        Bring all tracked orders up to date
+        
+        Returns:
+            List[Dict]: Orders that were filled, cancelled or otherwise
+            finalized since the last reconcile. They are no longer tracked.
+        """
+        if not self.open_ids:
+            return []
+        
+        manager = self.exchange_manager
+        exchange = manager.get_exchange(self.exchange_id)
+        if not exchange:
+            logger.error(f"Exchange {self.exchange_id} not found")
+            return []
+        
+        # An empty snapshot from a failed request must not look like every order closed
+        try:
+            open_orders = await manager._call(self.exchange_id, "fetch_open_orders", self.symbol)
+        except Exception as e:
+            logger.error(f"Failed to fetch open orders for {self.symbol} from {self.exchange_id}: {str(e)}")
+            return []
+        manager._track_orders(self.exchange_id, open_orders)
+        
+        resolved: List[Dict] = []
+        snapshot = {str(order.get("id")): order for order in open_orders}
+        for order_id in list(self.open_ids):
+            if order_id in snapshot:
+                self.orders[order_id].update(
+                    {key: value for key, value in snapshot[order_id].items() if value is not None}
+                )
+        
+        missing = self.open_ids - snapshot.keys()
+        if not missing:
+            return resolved
+        
+        if exchange.has.get("fetchClosedOrders"):
+            try:
+                closed = await manager._call(self.exchange_id, "fetch_closed_orders", self.symbol, self._orders_since())
+                for order in manager._track_orders(self.exchange_id, closed):
+                    self._apply(order, resolved)
+            except Exception as e:
+                logger.error(f"Failed to fetch closed orders for {self.symbol} from {self.exchange_id}: {str(e)}")
+        elif exchange.has.get("fetchMyTrades"):
+            try:
+                trades = await manager._call(self.exchange_id, "fetch_my_trades", self.symbol, self.trades_since)
+                self._apply_trades(trades, resolved)
+            except Exception as e:
+                logger.error(f"Failed to fetch trades for {self.symbol} from {self.exchange_id}: {str(e)}")
+        
+        missing &= self.open_ids
+        if missing and exchange.has.get("fetchOrder"):
+            semaphore = asyncio.Semaphore(self.max_concurrency)
+            
+            async def fetch_one(order_id: str) -> Dict:
+                async with semaphore:
+                    return await manager.fetch_order(self.exchange_id, order_id, self.symbol)
+            
+            for order in await asyncio.gather(*(fetch_one(order_id) for order_id in missing)):
+                if order:
+                    self._apply(order, resolved)
+        
+        unresolved = missing & self.open_ids
+        if unresolved:
+            logger.warning(f"Could not resolve {len(unresolved)} orders for {self.symbol} on {self.exchange_id}")
+        
+        return resolved
+    
+    def _apply_trades(self, trades: List[Dict], resolved: List[Dict]) -> None:
+        """
+        Accumulate fills from trades and close fully filled orders
+        
+        Args:
+            trades: Trades as returned by ccxt fetch_my_trades
+            resolved: List collecting final orders
+        """
+        seen: Set[str] = set()
+        for trade in trades:
+            timestamp = trade.get("timestamp")
+            if timestamp is not None:
+                self.trades_since = max(self.trades_since or 0, timestamp + 1)
+            
+            order_id = str(trade.get("order"))
+            if order_id not in self.open_ids or trade.get("id") in seen:
+                continue
+            seen.add(trade.get("id"))
+            self.filled[order_id] = self.filled.get(order_id, 0.0) + (trade.get("amount") or 0.0)
+        
+        for order_id, filled in list(self.filled.items()):
+            amount = self.orders[order_id].get("amount") or 0.0
+            if amount and filled >= amount * (1 - FILL_TOLERANCE):
+                order = {"id": order_id, "status": "closed", "filled": filled, "remaining": 0.0}
+                self.exchange_manager.balance_tracker.on_order(self.exchange_id, order)
+                self._apply(order, resolved)
\ No newline at end of file
@@ -0,0 +1,190 @@
+import time
+import heapq
+import asyncio
+import itertools
+import contextvars
+from typing import Dict, List, Optional, Any, Tuple, Callable
+
+# Request lanes in priority order, lower value is served first
+LANES = {
+    "cancel": 0,
+    "create": 1,
+    "read": 2,
+    # Bulk history downloads only use capacity nothing else is waiting for
+    "backfill": 3,
+}
+
+# Lane of the exchange call being made, read by ExchangeThrottle
+request_lane: contextvars.ContextVar = contextvars.ContextVar("request_lane", default="read")
+
+class TokenBucket:
+    """
+    Token-bucket rate limiter with priority lanes
+    
+    Tokens refill continuously at ``rate`` per second up to ``capacity``.
+    Requests that cannot be served immediately wait in a priority queue, so
+    a queued cancel is always released before a queued order creation, and
+    an order creation before a read, regardless of arrival order. A request
+    costing more than ``capacity`` is released once the bucket is full and
+    leaves it in debt.
+    """
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Initialize the limiter
+        
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+        self.waiters: List[Tuple[int, int, float, float, asyncio.Future]] = []
+        self.counter = itertools.count()
+        self.dispatcher: Optional[asyncio.Task] = None
+        self.lane_stats = {
+            lane: {"acquired": 0, "total_wait": 0.0, "max_wait": 0.0}
+            for lane in LANES
+        }
+    
+    def _refill(self) -> None:
+        """
+        Add the tokens accrued since the last refill
+        """
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated_at) * self.rate)
+        self.updated_at = now
+    
+    def _record(self, lane: str, wait: float) -> None:
+        """
+        Record a served request
+        
+        Args:
+            lane: Request lane
+            wait: Time spent queued in seconds
+        """
+        stats = self.lane_stats[lane]
+        stats["acquired"] += 1
+        stats["total_wait"] += wait
+        stats["max_wait"] = max(stats["max_wait"], wait)
+    
+    async def acquire(self, lane: str = "read", cost: float = 1.0) -> float:
+        """
+        Wait until a request may be sent
+        
+        Args:
+            lane: Request lane (cancel, create, read or backfill)
+            cost: Number of tokens the request consumes
+            
+        Returns:
+            float: Time spent waiting in seconds
+        """
+        if lane not in LANES:
+            raise ValueError(f"Unknown rate limit lane: {lane}")
+        
+        self._refill()
+        if not self.waiters and self.tokens >= min(cost, self.capacity):
+            self.tokens -= cost
+            self._record(lane, 0.0)
+            return 0.0
+        
+        future = asyncio.get_running_loop().create_future()
+        enqueued_at = time.monotonic()
+        heapq.heappush(self.waiters, (LANES[lane], next(self.counter), cost, enqueued_at, future))
+        
+        if self.dispatcher is None or self.dispatcher.done():
+            self.dispatcher = asyncio.ensure_future(self._dispatch())
+        
+        await future
+        wait = time.monotonic() - enqueued_at
+        self._record(lane, wait)
+        return wait
+    
+    async def _dispatch(self) -> None:
+        """
+        Release queued requests in priority order as tokens become available
+        """
+        while self.waiters:
+            # Drop requests whose callers gave up waiting
+            if self.waiters[0][4].done():
+                heapq.heappop(self.waiters)
+                continue
+            
+            self._refill()
+            cost = self.waiters[0][2]
+            needed = min(cost, self.capacity)
+            if self.tokens >= needed:
+                self.tokens -= cost
+                heapq.heappop(self.waiters)[4].set_result(None)
+                continue
+            
+            await asyncio.sleep((needed - self.tokens) / self.rate)
+    
+    def get_queue_depth(self) -> Dict[str, int]:
+        """
+        Get the number of queued requests per lane
+        
+        Returns:
+            Dict[str, int]: Lane to queue depth
+        """
+        depth = {lane: 0 for lane in LANES}
+        names = {priority: lane for lane, priority in LANES.items()}
+        for priority, _, _, _, future in self.waiters:
+            if not future.done():
+                depth[names[priority]] += 1
+        return depth
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get limiter statistics
+        
+        Returns:
+            Dict: Rate, available tokens, queue depth and wait times per lane
+        """
+        self._refill()
+        depth = self.get_queue_depth()
+        lanes = {}
+        for lane, stats in self.lane_stats.items():
+            lanes[lane] = {
+                "queued": depth[lane],
+                "acquired": stats["acquired"],
+                "avg_wait": stats["total_wait"] / stats["acquired"] if stats["acquired"] else 0.0,
+                "max_wait": stats["max_wait"]
+            }
+        return {
+            "rate": self.rate,
+            "capacity": self.capacity,
+            "tokens": self.tokens,
+            "lanes": lanes
+        }
+
+class ExchangeThrottle:
+    """
+    ccxt throttle hook charging every HTTP request to a TokenBucket
+    
+    ccxt awaits its ``throttle`` before each request with the endpoint's
+    cost weight, including the requests it makes on its own, such as
+    loading markets or the pages of a multi-request method. Installed in
+    place of ccxt's throttler, it makes the bucket see all of them. The
+    lane is the one the caller set in ``request_lane``.
+    """
+    def __init__(self, bucket: TokenBucket, on_wait: Optional[Callable[[str, float], None]] = None):
+        """
+        Initialize the hook
+        
+        Args:
+            bucket: Bucket of the exchange
+            on_wait: Called with the lane and the wait of every request
+        """
+        self.bucket = bucket
+        self.on_wait = on_wait
+        # Set by ccxt when it opens its session, unused
+        self.loop = None
+    
+    async def __call__(self, cost: Optional[float] = None) -> float:
+        lane = request_lane.get()
+        wait = await self.bucket.acquire(lane, 1.0 if cost is None else cost)
+        if self.on_wait:
+            self.on_wait(lane, wait)
+        return wait
\ No newline at end of file
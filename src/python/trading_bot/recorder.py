@@ -0,0 +1,347 @@
+import re
+import gzip
+import zlib
+import time
+import logging
+import asyncio
+import numpy as np
+from pathlib import Path
+from urllib.parse import quote
+from typing import Dict, List, Optional, Any, Tuple
+from config import DATA_DIR
+import metrics
+
+logger = logging.getLogger("recorder")
+
+# Directory holding the recordings
+RECORDINGS_DIR = DATA_DIR / "recordings"
+
+# Record layout of ticker snapshots
+TICKER_DTYPE = np.dtype([
+    ("timestamp", "<i8"),
+    ("received_at", "<f8"),
+    ("bid", "<f8"),
+    ("bid_size", "<f8"),
+    ("ask", "<f8"),
+    ("ask_size", "<f8"),
+    ("last", "<f8"),
+    ("base_volume", "<f8")
+])
+
+def book_dtype(depth: int) -> np.dtype:
+    """
+    Get the record layout of order book snapshots
+    
+    Args:
+        depth: Number of levels per side, missing levels are NaN
+        
+    Returns:
+        np.dtype: Record layout
+    """
+    return np.dtype([
+        ("timestamp", "<i8"),
+        ("received_at", "<f8"),
+        ("bids", "<f8", (depth, 2)),
+        ("asks", "<f8", (depth, 2))
+    ])
+
+def _value(value: Any) -> float:
+    return float(value) if value is not None else np.nan
+
+def read_recording(path: Path) -> np.ndarray:
+    """
+    Read a recording file
+    
+    Files are concatenated gzip members of raw records, one member per
+    flush. Members are decoded one at a time, so a member cut short by a
+    crash is ignored and every complete member before it is kept.
+    
+    Args:
+        path: File written by MarketRecorder, e.g. ticker-20240101T000000.bin.gz or book10-20240101T000000.bin.gz
+        
+    Returns:
+        np.ndarray: Structured array of the snapshots
+    """
+    path = Path(path)
+    match = re.match(r"(ticker|book(\d+))-", path.name)
+    if not match:
+        raise ValueError(f"Not a recording file: {path}")
+    dtype = TICKER_DTYPE if match.group(1) == "ticker" else book_dtype(int(match.group(2)))
+    
+    with open(path, "rb") as f:
+        remaining = f.read()
+    
+    members = []
+    while remaining:
+        decoder = zlib.decompressobj(wbits=31)
+        try:
+            member = decoder.decompress(remaining)
+        except zlib.error as e:
+            logger.warning(f"Ignoring corrupt end of recording {path}: {str(e)}")
+            break
+        if not decoder.eof:
+            logger.warning(f"Ignoring truncated end of recording {path}")
+            break
+        members.append(member[:len(member) - len(member) % dtype.itemsize])
+        remaining = decoder.unused_data
+    
+    return np.frombuffer(b"".join(members), dtype=dtype)
+
+class MarketRecorder:
+    """
+    Records ticker and order book snapshots of selected markets
+    
+    The recorder subscribes the markets on the shared ExchangeManager and
+    listens to its quote store, so it reuses the feeds strategies already
+    run instead of making requests of its own. Snapshots are buffered in
+    memory and written in batches by a background task: each batch is
+    compressed off the event loop and appended as one gzip member to a
+    file per market and kind, rotated every ``rotate_interval`` seconds.
+    """
+    def __init__(
+        self,
+        exchange_manager: Any,
+        markets: List[Tuple[str, str]],
+        directory: Path = RECORDINGS_DIR,
+        order_book_depth: int = 10,
+        flush_interval: float = 10.0,
+        flush_records: int = 50000,
+        max_buffered: int = 1000000,
+        rotate_interval: float = 3600.0,
+        compress_level: int = 6
+    ):
+        """
+        Initialize the recorder
+        
+        Args:
+            exchange_manager: Exchange manager instance
+            markets: (exchange_id, symbol) pairs to record
+            directory: Directory of the recordings
+            order_book_depth: Levels per side kept of each order book, 0 records tickers only
+            flush_interval: Maximum seconds between writes
+            flush_records: Buffered snapshots that trigger an early write
+            max_buffered: Snapshots kept in memory before new ones are dropped
+            rotate_interval: Seconds covered by one file
+            compress_level: gzip compression level
+        """
+        self.exchange_manager = exchange_manager
+        self.markets = {(exchange_id, symbol) for exchange_id, symbol in markets}
+        self.directory = Path(directory)
+        self.order_book_depth = order_book_depth
+        self.flush_interval = flush_interval
+        self.flush_records = flush_records
+        self.max_buffered = max_buffered
+        self.rotate_interval = rotate_interval
+        self.compress_level = compress_level
+        
+        self.buffers: Dict[Tuple[str, str, str], List[tuple]] = {}
+        self.buffered = 0
+        self.flush_event = asyncio.Event()
+        self.task: Optional[asyncio.Task] = None
+        # Executor write in progress, outlives a cancelled flush
+        self.writing: Optional[asyncio.Future] = None
+        self.subscriptions: List[Tuple[str, str, str]] = []
+        self.stats = {"records": 0, "dropped": 0, "flushes": 0, "bytes": 0, "capture_seconds": 0.0, "flush_seconds": 0.0}
+    
+    def start(self) -> None:
+        """
+        Subscribe the markets and start writing in the background
+        """
+        if self.task:
+            return
+        
+        manager = self.exchange_manager
+        for exchange_id, symbol in sorted(self.markets):
+            if manager.subscribe_ticker(exchange_id, symbol):
+                self.subscriptions.append(("ticker", exchange_id, symbol))
+            if self.order_book_depth and manager.subscribe_order_book(exchange_id, symbol, limit=max(self.order_book_depth, 20)):
+                self.subscriptions.append(("order_book", exchange_id, symbol))
+        
+        manager.quote_store.add_listener(self.on_quote)
+        self.task = asyncio.ensure_future(self._run())
+        logger.info(f"Recording {len(self.markets)} markets to {self.directory}")
+    
+    async def stop(self) -> None:
+        """
+        Stop recording, write what is buffered and release the subscriptions
+        """
+        if not self.task:
+            return
+        
+        manager = self.exchange_manager
+        manager.quote_store.remove_listener(self.on_quote)
+        self.task.cancel()
+        await asyncio.gather(self.task, return_exceptions=True)
+        self.task = None
+        await self.flush()
+        
+        for kind, exchange_id, symbol in self.subscriptions:
+            if kind == "ticker":
+                await manager.unsubscribe_ticker(exchange_id, symbol)
+            else:
+                await manager.unsubscribe_order_book(exchange_id, symbol)
+        self.subscriptions = []
+        logger.info("Recorder stopped")
+    
+    def on_quote(self, kind: str, exchange_id: str, symbol: str, data: Any) -> None:
+        """
+        Quote store listener buffering one snapshot
+        
+        Args:
+            kind: "ticker" or "order_book"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            data: Ticker or order book
+        """
+        if (exchange_id, symbol) not in self.markets or (kind == "order_book" and not self.order_book_depth):
+            return
+        
+        started_at = time.perf_counter()
+        if self.buffered >= self.max_buffered:
+            self.stats["dropped"] += 1
+            metrics.recorder_dropped.inc(exchange=exchange_id, kind=kind)
+            return
+        
+        received_at = time.time()
+        if kind == "ticker":
+            timestamp = data.get("timestamp")
+            record = (
+                timestamp if timestamp is not None else int(received_at * 1000),
+                received_at,
+                _value(data.get("bid")),
+                _value(data.get("bidVolume")),
+                _value(data.get("ask")),
+                _value(data.get("askVolume")),
+                _value(data.get("last")),
+                _value(data.get("baseVolume"))
+            )
+        else:
+            depth = self.order_book_depth
+            top = data.top(depth)
+            bids = np.full((depth, 2), np.nan)
+            asks = np.full((depth, 2), np.nan)
+            bids[:len(top["bids"])] = top["bids"]
+            asks[:len(top["asks"])] = top["asks"]
+            timestamp = data.timestamp
+            record = (timestamp if timestamp is not None else int(received_at * 1000), received_at, bids, asks)
+        
+        self.buffers.setdefault((kind, exchange_id, symbol), []).append(record)
+        self.buffered += 1
+        if self.buffered >= self.flush_records:
+            self.flush_event.set()
+        
+        elapsed = time.perf_counter() - started_at
+        self.stats["records"] += 1
+        self.stats["capture_seconds"] += elapsed
+        metrics.recorder_records.inc(exchange=exchange_id, kind=kind)
+        metrics.recorder_capture_duration.observe(elapsed)
+        metrics.recorder_buffered.set(self.buffered)
+    
+    async def _run(self) -> None:
+        """
+        Background loop writing the buffers
+        """
+        while True:
+            try:
+                await asyncio.wait_for(self.flush_event.wait(), timeout=self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self.flush_event.clear()
+            
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Failed to write recordings: {str(e)}")
+    
+    async def flush(self) -> None:
+        """
+        Write all buffered snapshots
+        """
+        # Appends to the same file must not overlap
+        if self.writing:
+            await asyncio.gather(self.writing, return_exceptions=True)
+            self.writing = None
+        
+        if not self.buffered:
+            return
+        
+        batches, self.buffers, self.buffered = self.buffers, {}, 0
+        metrics.recorder_buffered.set(0)
+        
+        started_at = time.monotonic()
+        loop = asyncio.get_running_loop()
+        self.writing = loop.run_in_executor(None, self._write, batches)
+        await asyncio.shield(self.writing)
+        self.writing = None
+        duration = time.monotonic() - started_at
+        
+        self.stats["flushes"] += 1
+        self.stats["flush_seconds"] += duration
+        metrics.recorder_flush_duration.observe(duration)
+    
+    def get_path(self, kind: str, exchange_id: str, symbol: str, now: float) -> Path:
+        """
+        Get the file a snapshot taken at a time goes to
+        
+        Args:
+            kind: "ticker" or "order_book"
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            now: Unix time
+            
+        Returns:
+            Path: Recording file
+        """
+        started = int(now // self.rotate_interval * self.rotate_interval)
+        name = "ticker" if kind == "ticker" else f"book{self.order_book_depth}"
+        stamp = time.strftime("%Y%m%dT%H%M%S", time.gmtime(started))
+        return self.directory / exchange_id / quote(symbol, safe="") / f"{name}-{stamp}.bin.gz"
+    
+    def _write(self, batches: Dict[Tuple[str, str, str], List[tuple]]) -> int:
+        """
+        Compress and append batches, runs in an executor thread
+        
+        Each snapshot goes to the file of the period it was received in, so
+        a batch spanning a rotation is split across two files.
+        
+        Args:
+            batches: (kind, exchange_id, symbol) to buffered records
+            
+        Returns:
+            int: Compressed bytes written
+        """
+        written = 0
+        for (kind, exchange_id, symbol), records in batches.items():
+            dtype = TICKER_DTYPE if kind == "ticker" else book_dtype(self.order_book_depth)
+            data = np.array(records, dtype=dtype)
+            periods = np.floor(data["received_at"] / self.rotate_interval)
+            
+            for period in np.unique(periods):
+                payload = gzip.compress(data[periods == period].tobytes(), compresslevel=self.compress_level)
+                
+                path = self.get_path(kind, exchange_id, symbol, period * self.rotate_interval)
+                path.parent.mkdir(exist_ok=True, parents=True)
+                with open(path, "ab") as f:
+                    f.write(payload)
+                
+                written += len(payload)
+                self.stats["bytes"] += len(payload)
+                metrics.recorder_bytes_written.inc(len(payload), kind=kind)
+        return written
+    
+    def get_status(self) -> Dict:
+        """
+        Get the recorder's markets and overhead
+        
+        Returns:
+            Dict: Markets, buffered snapshots and capture and write counters
+        """
+        records = self.stats["records"]
+        return {
+            "running": self.task is not None,
+            "directory": str(self.directory),
+            "markets": [{"exchange_id": exchange_id, "symbol": symbol} for exchange_id, symbol in sorted(self.markets)],
+            "buffered": self.buffered,
+            **self.stats,
+            "capture_seconds_per_record": self.stats["capture_seconds"] / records if records else 0.0
+        }
\ No newline at end of file
@@ -0,0 +1,298 @@
+import json
+import time
+import logging
+import asyncio
+from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Optional, Any, Set, Tuple
+from sqlalchemy import create_engine, event, MetaData, Table, Column, String, Text, Float, select, delete, and_, bindparam
+from sqlalchemy.dialects.sqlite import insert
+from config import DATA_DIR
+import metrics
+
+logger = logging.getLogger("state_store")
+
+# SQLite database holding the state of strategy instances
+STATE_DB = DATA_DIR / "state.db"
+
+metadata = MetaData()
+
+# One row per item of state, so a change only rewrites what changed
+strategy_state = Table(
+    "strategy_state",
+    metadata,
+    Column("namespace", String, primary_key=True),
+    Column("key", String, primary_key=True),
+    Column("value", Text, nullable=False),
+    Column("updated_at", Float, nullable=False)
+)
+
+def _configure_connection(connection: Any, record: Any) -> None:
+    """
+    Put new SQLite connections in WAL mode
+    
+    Readers do not block the writer in WAL mode, and with synchronous=NORMAL
+    a commit only waits for the log append, not for a checkpoint.
+    """
+    cursor = connection.cursor()
+    cursor.execute("PRAGMA journal_mode=WAL")
+    cursor.execute("PRAGMA synchronous=NORMAL")
+    cursor.execute("PRAGMA busy_timeout=5000")
+    cursor.close()
+
+class StateStore:
+    """
+    Crash-safe key-value store for strategy state, backed by SQLite
+    
+    Every strategy instance owns a namespace of JSON values. Writes are
+    staged in memory and committed together by a background flush
+    ``flush_interval`` seconds after the first of them, so many updates in
+    one tick cost one transaction and a key written repeatedly is stored
+    once. Commits and reads run on a dedicated thread, never on the event
+    loop. Without a running event loop writes are committed immediately.
+    """
+    def __init__(self, path: Path = STATE_DB, flush_interval: float = 0.25):
+        """
+        Initialize the store
+        
+        Args:
+            path: SQLite database file
+            flush_interval: Seconds between a write and its commit
+        """
+        self.path = Path(path)
+        self.flush_interval = flush_interval
+        self.path.parent.mkdir(exist_ok=True, parents=True)
+        
+        self.engine = create_engine(f"sqlite:///{self.path}", connect_args={"check_same_thread": False})
+        event.listen(self.engine, "connect", _configure_connection)
+        metadata.create_all(self.engine)
+        
+        # One thread keeps commits in order and off the event loop
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="state-store")
+        self.pending: Dict[Tuple[str, str], Optional[str]] = {}
+        self.cleared: Set[str] = set()
+        self.flush_task: Optional[asyncio.Task] = None
+        self.stats = {"commits": 0, "rows": 0, "errors": 0, "last_commit_duration": 0.0}
+    
+    def put(self, namespace: str, key: str, value: Any) -> None:
+        """
+        Stage a value for the next commit
+        
+        Args:
+            namespace: Owner of the value, usually a strategy instance name
+            key: Key within the namespace
+            value: JSON-serializable value
+        """
+        self.pending[(namespace, key)] = json.dumps(value, default=str)
+        self._schedule()
+    
+    def delete(self, namespace: str, key: str) -> None:
+        """
+        Stage the removal of a value
+        
+        Args:
+            namespace: Owner of the value
+            key: Key within the namespace
+        """
+        self.pending[(namespace, key)] = None
+        self._schedule()
+    
+    def clear(self, namespace: str) -> None:
+        """
+        Stage the removal of a whole namespace
+        
+        Args:
+            namespace: Namespace to remove
+        """
+        self.pending = {item: value for item, value in self.pending.items() if item[0] != namespace}
+        self.cleared.add(namespace)
+        self._schedule()
+    
+    async def load(self, namespace: str) -> Dict[str, Any]:
+        """
+        Read all values of a namespace, including staged writes
+        
+        Args:
+            namespace: Namespace to read
+            
+        Returns:
+            Dict[str, Any]: Key to value
+        """
+        loop = asyncio.get_running_loop()
+        rows = await loop.run_in_executor(self.executor, self._load, namespace)
+        
+        if namespace in self.cleared:
+            rows = {}
+        for (item_namespace, key), value in self.pending.items():
+            if item_namespace != namespace:
+                continue
+            if value is None:
+                rows.pop(key, None)
+            else:
+                rows[key] = value
+        return {key: json.loads(value) for key, value in rows.items()}
+    
+    def _load(self, namespace: str) -> Dict[str, str]:
+        """
+        Read the committed values of a namespace, runs on the store's thread
+        
+        Args:
+            namespace: Namespace to read
+            
+        Returns:
+            Dict[str, str]: Key to JSON value
+        """
+        with self.engine.connect() as connection:
+            result = connection.execute(
+                select(strategy_state.c.key, strategy_state.c.value).where(strategy_state.c.namespace == namespace)
+            )
+            return {key: value for key, value in result}
+    
+    def _schedule(self) -> None:
+        """
+        Make sure a flush is coming
+        """
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            self.flush_sync()
+            return
+        
+        if self.flush_task is None or self.flush_task.done():
+            self.flush_task = loop.create_task(self._flush_later())
+    
+    async def _flush_later(self) -> None:
+        """
+        Commit the staged writes after the flush interval
+        
+        Writes staged while a commit runs find this task still running and
+        schedule nothing, so it keeps flushing until nothing is staged. A
+        batch that failed to commit waits for the next write instead.
+        """
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            errors = self.stats["errors"]
+            await self.flush()
+            if self.stats["errors"] != errors or not (self.pending or self.cleared):
+                return
+    
+    def _take(self) -> Tuple[Set[str], Dict[Tuple[str, str], Optional[str]]]:
+        cleared, batch = self.cleared, self.pending
+        self.cleared, self.pending = set(), {}
+        return cleared, batch
+    
+    def _restore(self, cleared: Set[str], batch: Dict[Tuple[str, str], Optional[str]]) -> None:
+        """
+        Put back a batch that failed to commit, keeping newer writes
+        
+        Args:
+            cleared: Namespaces of the batch to remove
+            batch: Staged values of the batch
+        """
+        for item, value in batch.items():
+            if item[0] not in self.cleared:
+                self.pending.setdefault(item, value)
+        self.cleared |= cleared
+    
+    async def flush(self) -> None:
+        """
+        Commit all staged writes in one transaction
+        """
+        cleared, batch = self._take()
+        if not cleared and not batch:
+            return
+        
+        loop = asyncio.get_running_loop()
+        try:
+            await loop.run_in_executor(self.executor, self._commit, cleared, batch)
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Failed to commit {len(batch)} state changes: {str(e)}")
+            self._restore(cleared, batch)
+    
+    def flush_sync(self) -> None:
+        """
+        Commit all staged writes, blocking the caller
+        """
+        cleared, batch = self._take()
+        if not cleared and not batch:
+            return
+        
+        try:
+            self.executor.submit(self._commit, cleared, batch).result()
+        except Exception as e:
+            self.stats["errors"] += 1
+            logger.error(f"Failed to commit {len(batch)} state changes: {str(e)}")
+            self._restore(cleared, batch)
+    
+    def _commit(self, cleared: Set[str], batch: Dict[Tuple[str, str], Optional[str]]) -> None:
+        """
+        Write a batch, runs on the store's thread
+        
+        Args:
+            cleared: Namespaces to remove before writing
+            batch: (namespace, key) to JSON value, None removes the key
+        """
+        started_at = time.monotonic()
+        now = time.time()
+        upserts = [
+            {"namespace": namespace, "key": key, "value": value, "updated_at": now}
+            for (namespace, key), value in batch.items() if value is not None
+        ]
+        deletes = [
+            {"item_namespace": namespace, "item_key": key}
+            for (namespace, key), value in batch.items() if value is None
+        ]
+        
+        with self.engine.begin() as connection:
+            for namespace in cleared:
+                connection.execute(delete(strategy_state).where(strategy_state.c.namespace == namespace))
+            
+            if upserts:
+                statement = insert(strategy_state)
+                statement = statement.on_conflict_do_update(
+                    index_elements=[strategy_state.c.namespace, strategy_state.c.key],
+                    set_={"value": statement.excluded.value, "updated_at": statement.excluded.updated_at}
+                )
+                connection.execute(statement, upserts)
+            
+            if deletes:
+                connection.execute(
+                    delete(strategy_state).where(and_(
+                        strategy_state.c.namespace == bindparam("item_namespace"),
+                        strategy_state.c.key == bindparam("item_key")
+                    )),
+                    deletes
+                )
+        
+        duration = time.monotonic() - started_at
+        self.stats["commits"] += 1
+        self.stats["rows"] += len(batch)
+        self.stats["last_commit_duration"] = duration
+        metrics.state_commit_duration.observe(duration)
+        metrics.state_rows_written.inc(len(batch))
+    
+    async def close(self) -> None:
+        """
+        Commit what is staged and release the database
+        """
+        if self.flush_task and not self.flush_task.done():
+            self.flush_task.cancel()
+            await asyncio.gather(self.flush_task, return_exceptions=True)
+        await self.flush()
+        
+        self.executor.shutdown(wait=True)
+        self.engine.dispose()
+    
+    def get_status(self) -> Dict:
+        """
+        Get the store's path, staged writes and commit counters
+        
+        Returns:
+            Dict: Store status
+        """
+        return {
+            "path": str(self.path),
+            "pending": len(self.pending),
+            **self.stats
+        }
\ No newline at end of file
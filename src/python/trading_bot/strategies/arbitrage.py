@@ -59,6 +59,53 @@ class ArbitrageStrategy(BaseStrategy):
                 "description": "Interval between strategy updates in seconds",
                 "default": 10,
                 "min": 1
+            },
+            "quote_timeout": {
+                "type": "float",
+                "description": "Timeout for fetching a quote from one exchange in seconds",
+                "default": 5.0,
+                "min": 0.1
+            },
+            "max_quote_age": {
+                "type": "float",
+                "description": "Maximum age of a cached quote in seconds",
+                "default": 1.0,
+                "min": 0
+            },
+            "max_quote_skew": {
+                "type": "float",
+                "description": "Maximum time between the two quotes of an opportunity in seconds",
+                "default": 2.0,
+                "min": 0
+            },
+            "stream_quotes": {
+                "type": "boolean",
+                "description": "Keep quotes updated through streaming subscriptions instead of polling on each tick",
+                "default": True
+            },
+            "quote_trigger_bps": {
+                "type": "float",
+                "description": "Run a tick as soon as a streamed quote moves this many basis points (0 disables)",
+                "default": 5.0,
+                "min": 0
+            },
+            "tick_jitter": {
+                "type": "float",
+                "description": "Random delay of up to this many seconds added to each timer tick",
+                "default": 0.0,
+                "min": 0
+            },
+            "status_retries": {
+                "type": "integer",
+                "description": "Attempts to fetch the state of an order before unwinding a leg",
+                "default": 3,
+                "min": 1
+            },
+            "status_retry_delay": {
+                "type": "float",
+                "description": "Delay before the second state fetch in seconds, doubled for each further one",
+                "default": 0.5,
+                "min": 0
             }
         }
     
@@ -86,10 +133,29 @@ class ArbitrageStrategy(BaseStrategy):
         # Set default parameters if not provided
         self.parameters.setdefault("min_profit_percent", 1.0)
         self.parameters.setdefault("tick_interval", 10)
+        self.parameters.setdefault("quote_timeout", 5.0)
+        self.parameters.setdefault("max_quote_age", 1.0)
+        self.parameters.setdefault("max_quote_skew", 2.0)
+        self.parameters.setdefault("stream_quotes", True)
+        self.parameters.setdefault("quote_trigger_bps", 5.0)
+        self.parameters.setdefault("status_retries", 3)
+        self.parameters.setdefault("status_retry_delay", 0.5)
         
         # Initialize strategy state
         self.last_prices = {}
         self.active_arbitrages = []
+        self.execution_stats = {}
+        self.subscriptions = []
+        self.balance_exchanges = []
+    
+    def get_performance(self) -> Dict:
+        """
+        Get the strategy performance metrics, including leg execution statistics
+        
+        Returns:
+            Dict: Performance metrics
+        """
+        return dict(super().get_performance(), execution=self.get_execution_stats())
     
     async def on_start(self) -> None:
         """
@@ -98,12 +164,33 @@ class ArbitrageStrategy(BaseStrategy):
         self.logger.info(f"Starting Arbitrage strategy for {self.parameters['symbol']} on {', '.join(self.parameters['exchanges'])}")
         
         # Check if all exchanges support the symbol
-        for exchange_id in self.parameters["exchanges"]:
-            markets = await self.exchange_manager.fetch_markets(exchange_id)
-            symbols = [market["symbol"] for market in markets]
-            
-            if self.parameters["symbol"] not in symbols:
+        indexes = await asyncio.gather(*(
+            self.exchange_manager.load_market_index(exchange_id)
+            for exchange_id in self.parameters["exchanges"]
+        ))
+        for exchange_id, index in zip(self.parameters["exchanges"], indexes):
+            if index is None or not index.has_symbol(self.parameters["symbol"]):
                 self.logger.warning(f"Exchange {exchange_id} does not support {self.parameters['symbol']}")
+            elif self.parameters["stream_quotes"]:
+                if self.exchange_manager.subscribe_ticker(exchange_id, self.parameters["symbol"]):
+                    self.subscriptions.append((exchange_id, self.parameters["symbol"]))
+                
+                # React to quote moves instead of waiting for the next timer tick
+                if self.parameters["quote_trigger_bps"]:
+                    self.watch_quote(exchange_id, self.parameters["symbol"], self.parameters["quote_trigger_bps"])
+        
+        # Orders are sized from locally tracked balances
+        for exchange_id in self.parameters["exchanges"]:
+            if self.exchange_manager.track_balances(exchange_id):
+                self.balance_exchanges.append(exchange_id)
+            self.watch_fills(exchange_id)
+        
+        # Resume the arbitrages a previous run left open, the next tick checks their legs
+        state = await self.load_state()
+        resumed = [value for key, value in state.items() if key.startswith("arbitrage:") and value["status"] in ("active", "unresolved")]
+        if resumed:
+            self.active_arbitrages.extend(resumed)
+            self.logger.info(f"Resumed {len(resumed)} active or unresolved arbitrages from the previous run")
     
     async def on_stop(self) -> None:
         """
@@ -111,10 +198,46 @@ class ArbitrageStrategy(BaseStrategy):
         """
         self.logger.info("Stopping Arbitrage strategy")
         
-        # Cancel any active arbitrage orders
-        for arbitrage in self.active_arbitrages:
-            if arbitrage["status"] == "active":
-                await self.cancel_arbitrage(arbitrage)
+        # Release only the feeds this instance holds, others may share them
+        for exchange_id, symbol in self.subscriptions:
+            await self.exchange_manager.unsubscribe_ticker(exchange_id, symbol)
+        self.subscriptions = []
+        for exchange_id in self.balance_exchanges:
+            await self.exchange_manager.untrack_balances(exchange_id)
+        self.balance_exchanges = []
+        
+        # Cancel any active arbitrage orders, one batch per exchange
+        active = [arbitrage for arbitrage in self.active_arbitrages if arbitrage["status"] == "active"]
+        if not active:
+            return
+        
+        order_ids: Dict[str, List[str]] = {}
+        for arbitrage in active:
+            order_ids.setdefault(arbitrage["buy_exchange"], []).append(arbitrage["buy_order_id"])
+            order_ids.setdefault(arbitrage["sell_exchange"], []).append(arbitrage["sell_order_id"])
+        
+        results = await asyncio.gather(*(
+            self.exchange_manager.cancel_orders(exchange_id, ids, self.parameters["symbol"])
+            for exchange_id, ids in order_ids.items()
+        ))
+        cancelled = {
+            (exchange_id, str(order_id))
+            for exchange_id, ids in zip(order_ids, results) for order_id in ids
+        }
+        
+        # Arbitrages with a leg that may still be live stay active and persisted for the next start
+        stopped = [
+            arbitrage for arbitrage in active
+            if (arbitrage["buy_exchange"], str(arbitrage["buy_order_id"])) in cancelled
+            and (arbitrage["sell_exchange"], str(arbitrage["sell_order_id"])) in cancelled
+        ]
+        for arbitrage in stopped:
+            arbitrage["status"] = "cancelled"
+            self.delete_state(f"arbitrage:{arbitrage['id']}")
+        
+        self.logger.info(f"Cancelled {len(stopped)} of {len(active)} active arbitrages")
+        if len(stopped) < len(active):
+            self.logger.warning(f"{len(active) - len(stopped)} arbitrages could not be cancelled and are kept for the next start")
     
     async def tick(self) -> None:
         """
@@ -139,24 +262,61 @@ class ArbitrageStrategy(BaseStrategy):
     async def update_prices(self) -> None:
         """
         Update prices for all exchanges
+        
+        All exchanges are queried concurrently so their quotes are taken at
+        nearly the same moment.
+        """
+        await asyncio.gather(*(
+            self.update_price(exchange_id) for exchange_id in self.parameters["exchanges"]
+        ))
+    
+    async def update_price(self, exchange_id: str) -> None:
+        """
+        Update the quote of one exchange
+        
+        Each quote records when the request was sent, when the response was
+        received, and when its data was actually received from the exchange
+        (earlier than the response if it was served from the ticker cache).
+        
+        Args:
+            exchange_id: ID of the exchange
         """
         symbol = self.parameters["symbol"]
         
-        for exchange_id in self.parameters["exchanges"]:
-            try:
-                ticker = await self.exchange_manager.fetch_ticker(exchange_id, symbol)
-                
-                if ticker:
-                    self.last_prices[exchange_id] = {
-                        "bid": ticker.get("bid", 0),
-                        "ask": ticker.get("ask", 0),
-                        "last": ticker.get("last", 0),
-                        "timestamp": time.time()
-                    }
-                    self.logger.debug(f"{exchange_id} {symbol}: Bid={ticker.get('bid')}, Ask={ticker.get('ask')}")
+        try:
+            sent_at = self.clock.time()
+            ticker = await asyncio.wait_for(
+                self.exchange_manager.fetch_ticker(
+                    exchange_id, symbol, max_age=self.parameters["max_quote_age"]
+                ),
+                timeout=self.parameters["quote_timeout"]
+            )
+            received_at = self.clock.time()
             
-            except Exception as e:
-                self.logger.error(f"Error fetching price for {symbol} on {exchange_id}: {str(e)}")
+            if ticker:
+                age = self.exchange_manager.get_ticker_age(exchange_id, symbol) or 0.0
+                self.last_prices[exchange_id] = {
+                    "bid": ticker.get("bid") or 0,
+                    "ask": ticker.get("ask") or 0,
+                    "last": ticker.get("last") or 0,
+                    "sent_at": sent_at,
+                    "received_at": received_at,
+                    "timestamp": received_at - age
+                }
+                self.logger.debug(f"{exchange_id} {symbol}: Bid={ticker.get('bid')}, Ask={ticker.get('ask')}")
+                
+                # Revalue inventory held on this exchange at the mid
+                if ticker.get("bid") and ticker.get("ask"):
+                    self.mark_price(exchange_id, symbol, (ticker["bid"] + ticker["ask"]) / 2)
+            else:
+                self.last_prices.pop(exchange_id, None)
+        
+        except asyncio.TimeoutError:
+            self.last_prices.pop(exchange_id, None)
+            self.logger.warning(f"Timed out fetching price for {symbol} on {exchange_id}")
+        except Exception as e:
+            self.last_prices.pop(exchange_id, None)
+            self.logger.error(f"Error fetching price for {symbol} on {exchange_id}: {str(e)}")
     
     def find_arbitrage_opportunities(self) -> List[Dict]:
         """
@@ -168,6 +328,7 @@ class ArbitrageStrategy(BaseStrategy):
         opportunities = []
         symbol = self.parameters["symbol"]
         min_profit_percent = self.parameters["min_profit_percent"]
+        max_quote_skew = self.parameters["max_quote_skew"]
         
         # Check all exchange pairs
         exchanges = self.parameters["exchanges"]
@@ -180,6 +341,12 @@ class ArbitrageStrategy(BaseStrategy):
                 if exchange1 not in self.last_prices or exchange2 not in self.last_prices:
                     continue
                 
+                # Skip if the quotes were taken too far apart to be comparable
+                quote_skew = abs(self.last_prices[exchange1]["timestamp"] - self.last_prices[exchange2]["timestamp"])
+                if quote_skew > max_quote_skew:
+                    self.logger.debug(f"Skipping {exchange1}/{exchange2}: quotes are {quote_skew:.3f}s apart")
+                    continue
+                
                 # Get bid and ask prices
                 bid1 = self.last_prices[exchange1]["bid"]
                 ask1 = self.last_prices[exchange1]["ask"]
@@ -187,7 +354,7 @@ class ArbitrageStrategy(BaseStrategy):
                 ask2 = self.last_prices[exchange2]["ask"]
                 
                 # Check if we can buy on exchange1 and sell on exchange2
-                if bid2 > ask1:
+                if ask1 > 0 and bid2 > ask1:
                     profit_percent = ((bid2 / ask1) - 1) * 100
                     
                     if profit_percent >= min_profit_percent:
@@ -197,12 +364,13 @@ class ArbitrageStrategy(BaseStrategy):
                             "buy_price": ask1,
                             "sell_price": bid2,
                             "profit_percent": profit_percent,
+                            "quote_skew": quote_skew,
                             "symbol": symbol
                         })
                         self.logger.info(f"Found arbitrage opportunity: Buy on {exchange1} at {ask1}, Sell on {exchange2} at {bid2}, Profit: {profit_percent:.2f}%")
                 
                 # Check if we can buy on exchange2 and sell on exchange1
-                if bid1 > ask2:
+                if ask2 > 0 and bid1 > ask2:
                     profit_percent = ((bid1 / ask2) - 1) * 100
                     
                     if profit_percent >= min_profit_percent:
@@ -212,6 +380,7 @@ class ArbitrageStrategy(BaseStrategy):
                             "buy_price": ask2,
                             "sell_price": bid1,
                             "profit_percent": profit_percent,
+                            "quote_skew": quote_skew,
                             "symbol": symbol
                         })
                         self.logger.info(f"Found arbitrage opportunity: Buy on {exchange2} at {ask2}, Sell on {exchange1} at {bid1}, Profit: {profit_percent:.2f}%")
@@ -240,20 +409,25 @@ class ArbitrageStrategy(BaseStrategy):
         # Calculate order size
         max_order_size = self.parameters["max_order_size"]
         
-        # Check balances on both exchanges
-        buy_balance = await self.exchange_manager.fetch_balance(buy_exchange)
-        sell_balance = await self.exchange_manager.fetch_balance(sell_exchange)
-        
         symbol = opportunity["symbol"]
         base_currency, quote_currency = symbol.split('/')
         
+        # Check balances on both exchanges from local state
+        quote_balance = self.exchange_manager.get_free_balance(buy_exchange, quote_currency)
+        base_balance = self.exchange_manager.get_free_balance(sell_exchange, base_currency)
+        
+        # Fall back to fetching if the balance sync has not completed yet
+        if quote_balance is None or base_balance is None:
+            await asyncio.gather(
+                self.exchange_manager.fetch_balance(buy_exchange),
+                self.exchange_manager.fetch_balance(sell_exchange)
+            )
+            quote_balance = self.exchange_manager.get_free_balance(buy_exchange, quote_currency) or 0
+            base_balance = self.exchange_manager.get_free_balance(sell_exchange, base_currency) or 0
+        
         # Check if we have enough quote currency on buy exchange
-        quote_balance = buy_balance.get(quote_currency, {}).get("free", 0)
         max_buy_amount = quote_balance / opportunity["buy_price"]
         
-        # Check if we have enough base currency on sell exchange
-        base_balance = sell_balance.get(base_currency, {}).get("free", 0)
-        
         # Use the minimum of all constraints
         order_size = min(max_order_size, max_buy_amount, base_balance)
         
@@ -261,45 +435,17 @@ class ArbitrageStrategy(BaseStrategy):
             self.logger.warning(f"Insufficient balance for arbitrage")
             return
         
-        # Create buy order
-        buy_order = await self.exchange_manager.create_order(
-            exchange_id=buy_exchange,
-            symbol=symbol,
-            order_type="limit",
-            side="buy",
-            amount=order_size,
-            price=opportunity["buy_price"]
-        )
-        
-        if not buy_order:
-            self.logger.error(f"Failed to create buy order on {buy_exchange}")
-            return
-        
-        # Create sell order
-        sell_order = await self.exchange_manager.create_order(
-            exchange_id=sell_exchange,
-            symbol=symbol,
-            order_type="limit",
-            side="sell",
-            amount=order_size,
-            price=opportunity["sell_price"]
+        # Send both legs at the same time to minimize leg skew
+        buy_leg, sell_leg = await asyncio.gather(
+            self.submit_leg(buy_exchange, symbol, "buy", order_size, opportunity["buy_price"]),
+            self.submit_leg(sell_exchange, symbol, "sell", order_size, opportunity["sell_price"])
         )
-        
-        if not sell_order:
-            self.logger.error(f"Failed to create sell order on {sell_exchange}")
-            
-            # Cancel buy order if sell order fails
-            await self.exchange_manager.cancel_order(
-                exchange_id=buy_exchange,
-                order_id=buy_order.get("id"),
-                symbol=symbol
-            )
-            
-            return
+        buy_order = buy_leg.pop("order")
+        sell_order = sell_leg.pop("order")
         
         # Record the arbitrage
         arbitrage = {
-            "id": f"arb_{time.time()}",
+            "id": f"arb_{self.clock.time()}",
             "buy_exchange": buy_exchange,
             "sell_exchange": sell_exchange,
             "buy_order_id": buy_order.get("id"),
@@ -310,32 +456,252 @@ class ArbitrageStrategy(BaseStrategy):
             "sell_price": opportunity["sell_price"],
             "profit_percent": opportunity["profit_percent"],
             "status": "active",
-            "timestamp": time.time()
+            "timestamp": self.clock.time(),
+            "legs": {"buy": buy_leg, "sell": sell_leg},
+            "submit_skew": abs(buy_leg["submitted_at"] - sell_leg["submitted_at"]),
+            "ack_skew": abs(buy_leg["acked_at"] - sell_leg["acked_at"])
         }
+        self.record_execution(arbitrage)
+        
+        if not buy_order and not sell_order:
+            self.logger.error(f"Failed to create both legs on {buy_exchange} and {sell_exchange}")
+            return
+        
+        # One leg failed, unwind the other so we are not left with a directional position
+        if not buy_order or not sell_order:
+            failed, exchange_id, order = ("sell", buy_exchange, buy_order) if buy_order else ("buy", sell_exchange, sell_order)
+            self.logger.error(f"Failed to create {failed} leg, compensating on {exchange_id}")
+            arbitrage["compensation"] = await self.compensate_leg(exchange_id, symbol, order)
+            self.active_arbitrages.append(arbitrage)
+            if arbitrage["compensation"]["resolved"]:
+                arbitrage["status"] = "failed"
+            else:
+                # Picked up again by update_active_arbitrages, also after a restart
+                arbitrage["status"] = "unresolved"
+                self.save_state(f"arbitrage:{arbitrage['id']}", arbitrage)
+            return
         
         self.active_arbitrages.append(arbitrage)
-        self.logger.info(f"Executed arbitrage: {arbitrage['id']}")
+        self.save_state(f"arbitrage:{arbitrage['id']}", arbitrage)
+        self.logger.info(f"Executed arbitrage: {arbitrage['id']} (ack skew {arbitrage['ack_skew'] * 1000:.1f} ms)")
+    
+    async def submit_leg(self, exchange_id: str, symbol: str, side: str, amount: float, price: float) -> Dict:
+        """
+        Submit one leg of an arbitrage and time it
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol to trade
+            side: Order side (buy, sell)
+            amount: Order amount in base currency
+            price: Limit price
+            
+        Returns:
+            Dict: Leg details with the order ({} on failure) and submit/ack times
+        """
+        submitted_at = self.clock.time()
+        order = await self.exchange_manager.create_order(
+            exchange_id=exchange_id,
+            symbol=symbol,
+            order_type="limit",
+            side=side,
+            amount=amount,
+            price=price
+        )
+        acked_at = self.clock.time()
+        
+        return {
+            "exchange_id": exchange_id,
+            "order": order,
+            "order_id": order.get("id"),
+            "submitted_at": submitted_at,
+            "acked_at": acked_at,
+            "latency": acked_at - submitted_at
+        }
+    
+    async def fetch_order_state(self, exchange_id: str, order_id: str, symbol: str) -> Dict:
+        """
+        Fetch the state of an order, retrying with exponential backoff
+        
+        Args:
+            exchange_id: ID of the exchange
+            order_id: ID of the order
+            symbol: Symbol of the order
+            
+        Returns:
+            Dict: Order, empty if every attempt failed
+        """
+        delay = self.parameters["status_retry_delay"]
+        for attempt in range(self.parameters["status_retries"]):
+            if attempt:
+                await self.clock.sleep(delay * 2 ** (attempt - 1))
+            order = await self.exchange_manager.fetch_order(exchange_id, order_id, symbol)
+            if order:
+                return order
+        return {}
+    
+    async def compensate_leg(
+        self,
+        exchange_id: str,
+        symbol: str,
+        order: Dict,
+        compensation: Optional[Dict] = None,
+        hedged: float = 0.0
+    ) -> Dict:
+        """
+        Unwind the leg that went through when the other leg failed
+        
+        The order is cancelled first. Once its state is confirmed final,
+        whatever it filled beyond ``hedged`` is offset with a market order on
+        the opposite side. An order whose state cannot be confirmed may still be open and
+        unfilled, so it is never offset blindly: the compensation is left
+        unresolved, as is an offset whose fill is not confirmed yet, and a
+        later call continues where this one stopped.
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol of the order
+            order: The successful leg's order
+            compensation: Unresolved compensation of an earlier call to continue
+            hedged: Amount the other leg filled before it failed, which already offsets this one
+            
+        Returns:
+            Dict: Compensation details, "resolved" is False until the leg is unwound
+        """
+        if compensation is None:
+            compensation = {
+                "exchange_id": exchange_id,
+                "order_id": order.get("id"),
+                "side": order.get("side"),
+                "cancelled": False,
+                "hedged": hedged,
+                "offset_amount": 0.0,
+                "resolved": False
+            }
+        order_id = compensation["order_id"]
+        
+        # The fill state after the cancel decides how much must be offset
+        if "filled" not in compensation:
+            if not compensation["cancelled"]:
+                cancelled = await self.exchange_manager.cancel_orders(exchange_id, [order_id], symbol)
+                compensation["cancelled"] = bool(cancelled)
+            
+            latest = await self.fetch_order_state(exchange_id, order_id, symbol)
+            if not latest or latest.get("status") == "open":
+                self.logger.error(f"Leg {order_id} on {exchange_id} may still be open, leaving it unresolved")
+                return compensation
+            
+            compensation["filled"] = latest.get("filled") or 0.0
+            self.record_fill(exchange_id, latest, symbol=symbol, side=compensation["side"])
+        
+        hedged = compensation.get("hedged", 0.0)
+        if compensation["filled"] < hedged:
+            self.logger.warning(f"The other leg of {order_id} filled {hedged - compensation['filled']} more, that inventory is left open")
+        filled = max(compensation["filled"] - hedged, 0.0)
+        if filled > 0:
+            offset_side = "sell" if compensation["side"] == "buy" else "buy"
+            offset = {}
+            if not compensation.get("offset_order_id"):
+                offset = await self.exchange_manager.create_order(
+                    exchange_id=exchange_id,
+                    symbol=symbol,
+                    order_type="market",
+                    side=offset_side,
+                    amount=filled
+                )
+                if not offset:
+                    self.logger.error(f"Failed to offset {filled} {symbol} on {exchange_id}, position is left open")
+                    return compensation
+                compensation["offset_order_id"] = offset.get("id")
+                compensation["offset_amount"] = filled
+            
+            # Market orders may be acknowledged before they fill
+            if not offset.get("filled"):
+                offset = await self.fetch_order_state(exchange_id, compensation["offset_order_id"], symbol)
+            if not offset.get("filled"):
+                self.logger.warning(f"Fill of offset {compensation['offset_order_id']} on {exchange_id} is not confirmed yet")
+                return compensation
+            
+            # The fill may come back without a price, assume the last price
+            last_price = self.last_prices.get(exchange_id, {}).get("last")
+            self.record_fill(exchange_id, offset, symbol=symbol, side=offset_side, price=last_price)
+        
+        compensation["resolved"] = True
+        self.logger.warning(f"Compensated leg {order_id} on {exchange_id}: cancelled={compensation['cancelled']}, offset={filled}")
+        return compensation
+    
+    def record_execution(self, arbitrage: Dict) -> None:
+        """
+        Aggregate leg latency and skew per venue pair
+        
+        Args:
+            arbitrage: Executed arbitrage with leg timings
+        """
+        pair = f"{arbitrage['buy_exchange']}->{arbitrage['sell_exchange']}"
+        stats = self.execution_stats.setdefault(pair, {
+            "executions": 0,
+            "failed_legs": 0,
+            "total_latency": {"buy": 0.0, "sell": 0.0},
+            "total_ack_skew": 0.0,
+            "max_ack_skew": 0.0
+        })
+        
+        stats["executions"] += 1
+        stats["failed_legs"] += sum(1 for leg in arbitrage["legs"].values() if leg["order_id"] is None)
+        for side, leg in arbitrage["legs"].items():
+            stats["total_latency"][side] += leg["latency"]
+        stats["total_ack_skew"] += arbitrage["ack_skew"]
+        stats["max_ack_skew"] = max(stats["max_ack_skew"], arbitrage["ack_skew"])
+    
+    def get_execution_stats(self) -> Dict:
+        """
+        Get average leg latency and skew per venue pair
+        
+        Returns:
+            Dict: Venue pair ("buy->sell") to execution statistics
+        """
+        return {
+            pair: {
+                "executions": stats["executions"],
+                "failed_legs": stats["failed_legs"],
+                "avg_buy_latency": stats["total_latency"]["buy"] / stats["executions"],
+                "avg_sell_latency": stats["total_latency"]["sell"] / stats["executions"],
+                "avg_ack_skew": stats["total_ack_skew"] / stats["executions"],
+                "max_ack_skew": stats["max_ack_skew"]
+            }
+            for pair, stats in self.execution_stats.items()
+        }
     
     async def update_active_arbitrages(self) -> None:
         """
-        Update the status of active arbitrages
+        Update the status of active arbitrages and retry unresolved compensations
         """
         for arbitrage in self.active_arbitrages:
-            if arbitrage["status"] != "active":
+            if arbitrage["status"] == "unresolved":
+                compensation = arbitrage["compensation"]
+                await self.compensate_leg(compensation["exchange_id"], arbitrage["symbol"], {}, compensation)
+                if compensation["resolved"]:
+                    arbitrage["status"] = "failed"
+                    self.delete_state(f"arbitrage:{arbitrage['id']}")
+                else:
+                    self.save_state(f"arbitrage:{arbitrage['id']}", arbitrage)
                 continue
             
-            # Check buy order status
-            buy_order = await self.exchange_manager.fetch_order(
-                exchange_id=arbitrage["buy_exchange"],
-                order_id=arbitrage["buy_order_id"],
-                symbol=arbitrage["symbol"]
-            )
+            if arbitrage["status"] != "active":
+                continue
             
-            # Check sell order status
-            sell_order = await self.exchange_manager.fetch_order(
-                exchange_id=arbitrage["sell_exchange"],
-                order_id=arbitrage["sell_order_id"],
-                symbol=arbitrage["symbol"]
+            # Check the status of both legs
+            buy_order, sell_order = await asyncio.gather(
+                self.exchange_manager.fetch_order(
+                    exchange_id=arbitrage["buy_exchange"],
+                    order_id=arbitrage["buy_order_id"],
+                    symbol=arbitrage["symbol"]
+                ),
+                self.exchange_manager.fetch_order(
+                    exchange_id=arbitrage["sell_exchange"],
+                    order_id=arbitrage["sell_order_id"],
+                    symbol=arbitrage["symbol"]
+                )
             )
             
             # If both orders are filled, the arbitrage is complete
@@ -343,6 +709,7 @@ class ArbitrageStrategy(BaseStrategy):
                 sell_order.get("status") == "closed"):
                 
                 arbitrage["status"] = "completed"
+                self.delete_state(f"arbitrage:{arbitrage['id']}")
                 
                 # Calculate actual profit
                 buy_cost = buy_order.get("cost", arbitrage["amount"] * arbitrage["buy_price"])
@@ -354,30 +721,59 @@ class ArbitrageStrategy(BaseStrategy):
                 
                 self.logger.info(f"Arbitrage {arbitrage['id']} completed with profit: {profit} ({arbitrage['actual_profit_percent']:.2f}%)")
                 
-                # Update performance metrics
-                self.update_performance(profit, profit > 0)
+                # Each leg changes the inventory of its own exchange
+                self.record_fill(arbitrage["buy_exchange"], buy_order, symbol=arbitrage["symbol"], side="buy", amount=arbitrage["amount"], price=arbitrage["buy_price"])
+                self.record_fill(arbitrage["sell_exchange"], sell_order, symbol=arbitrage["symbol"], side="sell", amount=arbitrage["amount"], price=arbitrage["sell_price"])
             
             # If either order is cancelled, the arbitrage failed
             elif (buy_order.get("status") == "canceled" or 
                   sell_order.get("status") == "canceled"):
                 
-                arbitrage["status"] = "failed"
                 self.logger.warning(f"Arbitrage {arbitrage['id']} failed: order was cancelled")
-                
-                # Cancel the other order if it's still open
-                if buy_order.get("status") != "canceled":
-                    await self.exchange_manager.cancel_order(
-                        exchange_id=arbitrage["buy_exchange"],
-                        order_id=arbitrage["buy_order_id"],
-                        symbol=arbitrage["symbol"]
-                    )
-                
-                if sell_order.get("status") != "canceled":
-                    await self.exchange_manager.cancel_order(
-                        exchange_id=arbitrage["sell_exchange"],
-                        order_id=arbitrage["sell_order_id"],
-                        symbol=arbitrage["symbol"]
-                    )
+                await self.unwind_cancelled(arbitrage, buy_order, sell_order)
+    
+    async def unwind_cancelled(self, arbitrage: Dict, buy_order: Dict, sell_order: Dict) -> None:
+        """
+        Unwind an arbitrage whose leg was cancelled
+        
+        The cancelled leg's fill is booked, and the other leg is compensated
+        for what it filled beyond that, so no one-sided inventory is left.
+        If both legs are cancelled, the one that filled more is compensated.
+        
+        Args:
+            arbitrage: Arbitrage details
+            buy_order: Latest state of the buy leg
+            sell_order: Latest state of the sell leg
+        """
+        legs = {"buy": buy_order, "sell": sell_order}
+        if buy_order.get("status") == "canceled" and sell_order.get("status") == "canceled":
+            exposed = "buy" if (buy_order.get("filled") or 0.0) >= (sell_order.get("filled") or 0.0) else "sell"
+        else:
+            exposed = "sell" if buy_order.get("status") == "canceled" else "buy"
+        hedging = "sell" if exposed == "buy" else "buy"
+        
+        # The compensation books the exposed leg's fill once its state is final
+        self.record_fill(
+            arbitrage[f"{hedging}_exchange"],
+            legs[hedging],
+            symbol=arbitrage["symbol"],
+            side=hedging,
+            price=arbitrage[f"{hedging}_price"]
+        )
+        
+        arbitrage["compensation"] = await self.compensate_leg(
+            arbitrage[f"{exposed}_exchange"],
+            arbitrage["symbol"],
+            {"id": arbitrage[f"{exposed}_order_id"], "side": exposed},
+            hedged=legs[hedging].get("filled") or 0.0
+        )
+        if arbitrage["compensation"]["resolved"]:
+            arbitrage["status"] = "failed"
+            self.delete_state(f"arbitrage:{arbitrage['id']}")
+        else:
+            # Retried by update_active_arbitrages, also after a restart
+            arbitrage["status"] = "unresolved"
+            self.save_state(f"arbitrage:{arbitrage['id']}", arbitrage)
     
     async def cancel_arbitrage(self, arbitrage: Dict) -> None:
         """
@@ -401,6 +797,7 @@ class ArbitrageStrategy(BaseStrategy):
         )
         
         arbitrage["status"] = "cancelled"
+        self.delete_state(f"arbitrage:{arbitrage['id']}")
         self.logger.info(f"Cancelled arbitrage: {arbitrage['id']}")
     
     async def log_status(self) -> None:
@@ -410,8 +807,9 @@ class ArbitrageStrategy(BaseStrategy):
         active_count = sum(1 for arb in self.active_arbitrages if arb["status"] == "active")
         completed_count = sum(1 for arb in self.active_arbitrages if arb["status"] == "completed")
         failed_count = sum(1 for arb in self.active_arbitrages if arb["status"] in ["failed", "cancelled"])
+        unresolved_count = sum(1 for arb in self.active_arbitrages if arb["status"] == "unresolved")
         
-        self.logger.info(f"Arbitrage status: {active_count} active, {completed_count} completed, {failed_count} failed")
+        self.logger.info(f"Arbitrage status: {active_count} active, {completed_count} completed, {failed_count} failed, {unresolved_count} unresolved")
         
         if completed_count > 0:
             total_profit = sum(arb.get("actual_profit", 0) for arb in self.active_arbitrages if arb["status"] == "completed")
@@ -4,6 +4,7 @@ import asyncio
 import math
 from typing import Dict, List, Optional, Any
 from base_strategy import BaseStrategy
+from order_tracker import OrderTracker
 
 class GridTradingStrategy(BaseStrategy):
     """
@@ -69,6 +70,17 @@ class GridTradingStrategy(BaseStrategy):
                 "description": "Interval between strategy updates in seconds",
                 "default": 60,
                 "min": 10
+            },
+            "tick_jitter": {
+                "type": "float",
+                "description": "Random delay of up to this many seconds added to each timer tick",
+                "default": 0.0,
+                "min": 0
+            },
+            "cancel_on_stop": {
+                "type": "boolean",
+                "description": "Cancel the grid orders when the strategy stops, otherwise the next start adopts them",
+                "default": True
             }
         }
     
@@ -92,11 +104,14 @@ class GridTradingStrategy(BaseStrategy):
         # Set default parameters if not provided
         self.parameters.setdefault("grid_levels", 10)
         self.parameters.setdefault("tick_interval", 60)
+        self.parameters.setdefault("cancel_on_stop", True)
         
         # Initialize strategy state
         self.grid_orders = []
         self.order_status = {}
         self.last_price = None
+        self.order_tracker = OrderTracker(exchange_manager, self.parameters["exchange_id"], self.parameters["symbol"])
+        self.ledger.capital = self.parameters["total_investment"]
     
     async def on_start(self) -> None:
         """
@@ -107,8 +122,9 @@ class GridTradingStrategy(BaseStrategy):
         # Calculate grid levels
         await self.calculate_grid_levels()
         
-        # Create initial grid orders
-        await self.create_grid_orders()
+        # Adopt the orders of a previous run, otherwise place a new grid
+        if not await self.restore_grid():
+            await self.create_grid_orders()
     
     async def on_stop(self) -> None:
         """
@@ -116,8 +132,9 @@ class GridTradingStrategy(BaseStrategy):
         """
         self.logger.info("Stopping Grid Trading strategy")
         
-        # Cancel all open orders
-        await self.cancel_all_orders()
+        # Cancel all open orders unless the next start should adopt them
+        if self.parameters["cancel_on_stop"]:
+            await self.cancel_all_orders()
     
     async def tick(self) -> None:
         """
@@ -126,12 +143,34 @@ class GridTradingStrategy(BaseStrategy):
         # Update order status
         await self.update_order_status()
         
+        # Revalue the inventory so PnL and drawdown move between fills
+        await self.update_mark()
+        
         # Check if any orders need to be replaced
         await self.check_and_replace_filled_orders()
         
         # Log current status
         await self.log_status()
     
+    async def update_mark(self) -> None:
+        """
+        Mark the grid's position at the mid price
+        
+        The ticker is served from the quote store while it is fresh, so this
+        only takes a request when no feed is streaming the market.
+        """
+        exchange_id = self.parameters["exchange_id"]
+        symbol = self.parameters["symbol"]
+        
+        ticker = await self.exchange_manager.fetch_ticker(exchange_id, symbol)
+        if not ticker:
+            return
+        
+        if ticker.get("bid") and ticker.get("ask"):
+            self.mark_price(exchange_id, symbol, (ticker["bid"] + ticker["ask"]) / 2)
+        elif ticker.get("last"):
+            self.mark_price(exchange_id, symbol, ticker["last"])
+    
     async def calculate_grid_levels(self) -> None:
         """
         Calculate price levels for the grid
@@ -157,6 +196,53 @@ class GridTradingStrategy(BaseStrategy):
         self.logger.info(f"Grid calculated with {grid_levels} levels from {lower_price} to {upper_price}")
         self.logger.info(f"Price step: {price_step}, Order size: {self.order_size}")
     
+    def get_grid_signature(self) -> Dict:
+        """
+        Get the parameters that define the grid's orders
+        
+        Returns:
+            Dict: Market, bounds, levels and investment
+        """
+        keys = ("exchange_id", "symbol", "lower_price", "upper_price", "grid_levels", "total_investment")
+        return {key: self.parameters[key] for key in keys}
+    
+    async def restore_grid(self) -> bool:
+        """
+        Adopt the grid orders saved by a previous run
+        
+        The saved orders are tracked again as they are; the first reconcile
+        finds the ones that filled or were cancelled in the meantime, so a
+        restart takes no requests per order. Orders of a grid with other
+        parameters are cancelled instead.
+        
+        Returns:
+            bool: True if a saved grid was adopted
+        """
+        state = await self.load_state()
+        saved = [value for key, value in state.items() if key.startswith("order:")]
+        if not saved:
+            return False
+        
+        grid = state.get("grid") or {}
+        previous = grid.get("parameters")
+        if previous != self.get_grid_signature():
+            open_ids = [order["id"] for order in saved if order["status"] == "open"]
+            if previous and open_ids:
+                self.logger.warning(f"Grid parameters changed, cancelling {len(open_ids)} orders of the previous grid")
+                await self.exchange_manager.cancel_orders(previous["exchange_id"], open_ids, previous["symbol"])
+            self.clear_state()
+            return False
+        
+        self.last_price = grid.get("last_price")
+        self.grid_orders = sorted(saved, key=lambda order: order["level"])
+        for order in self.grid_orders:
+            if order["status"] == "open":
+                self.order_tracker.track(order)
+        
+        adopted = sum(1 for order in self.grid_orders if order["status"] == "open")
+        self.logger.info(f"Adopted {adopted} open grid orders from the previous run")
+        return True
+    
     async def create_grid_orders(self) -> None:
         """
         Create initial grid orders
@@ -176,91 +262,81 @@ class GridTradingStrategy(BaseStrategy):
             return
         
         self.last_price = current_price
+        self.save_state("grid", {"parameters": self.get_grid_signature(), "last_price": current_price})
         
-        # Create buy orders below current price
-        for price in self.grid_prices:
-            if price < current_price:
-                # Calculate amount in base currency
-                amount = self.order_size / price
-                
-                # Create buy order
-                order = await self.exchange_manager.create_order(
-                    exchange_id=exchange_id,
-                    symbol=symbol,
-                    order_type="limit",
-                    side="buy",
-                    amount=amount,
-                    price=price
-                )
-                
-                if order:
-                    self.grid_orders.append({
-                        "id": order.get("id"),
-                        "price": price,
-                        "side": "buy",
-                        "status": "open"
-                    })
-                    self.logger.info(f"Created buy order at price {price}")
-        
-        # Create sell orders above current price
-        for price in self.grid_prices:
-            if price > current_price:
+        # Buy orders below current price, sell orders above it
+        requests = []
+        levels = []
+        for level, price in enumerate(self.grid_prices):
+            if price == current_price:
+                continue
+            levels.append(level)
+            requests.append({
+                "symbol": symbol,
+                "type": "limit",
+                "side": "buy" if price < current_price else "sell",
                 # Calculate amount in base currency
-                amount = self.order_size / price
-                
-                # Create sell order
-                order = await self.exchange_manager.create_order(
-                    exchange_id=exchange_id,
-                    symbol=symbol,
-                    order_type="limit",
-                    side="sell",
-                    amount=amount,
-                    price=price
-                )
-                
-                if order:
-                    self.grid_orders.append({
-                        "id": order.get("id"),
-                        "price": price,
-                        "side": "sell",
-                        "status": "open"
-                    })
-                    self.logger.info(f"Created sell order at price {price}")
+                "amount": self.order_size / price,
+                "price": price
+            })
+        
+        # Place the whole grid in one batch
+        results = await self.exchange_manager.create_orders(exchange_id, requests)
+        
+        for level, request, order in zip(levels, requests, results):
+            if order.get("error"):
+                self.logger.error(f"Failed to create {request['side']} order at price {request['price']}: {order['error']}")
+                continue
+            
+            self.order_tracker.track(order)
+            grid_order = {
+                "id": order.get("id"),
+                "level": level,
+                "price": request["price"],
+                "side": request["side"],
+                "amount": request["amount"],
+                "timestamp": order.get("timestamp"),
+                "status": "open"
+            }
+            self.grid_orders.append(grid_order)
+            self.save_state(f"order:{grid_order['id']}", grid_order)
+            self.logger.info(f"Created {request['side']} order at price {request['price']}")
     
     async def update_order_status(self) -> None:
         """
         Update the status of all grid orders
+        
+        All orders are reconciled in one batch by the order tracker.
         """
-        exchange_id = self.parameters["exchange_id"]
-        symbol = self.parameters["symbol"]
+        resolved = await self.order_tracker.reconcile()
+        if not resolved:
+            return
         
-        # Fetch open orders
-        open_orders = await self.exchange_manager.fetch_open_orders(exchange_id, symbol)
+        grid_by_id = {str(order["id"]): order for order in self.grid_orders}
         
-        # Update order status
-        open_order_ids = [order.get("id") for order in open_orders]
-        
-        for order in self.grid_orders:
-            if order["id"] in open_order_ids:
-                order["status"] = "open"
+        for order_details in resolved:
+            order = grid_by_id.get(str(order_details.get("id")))
+            if not order or order["status"] != "open":
+                continue
+            
+            # Book what filled, including the filled part of a cancelled order
+            self.record_fill(
+                self.parameters["exchange_id"],
+                order_details,
+                symbol=self.parameters["symbol"],
+                side=order["side"],
+                amount=order["amount"] if order_details.get("status") == "closed" else 0.0,
+                price=order["price"]
+            )
+            
+            if order_details.get("status") == "closed":
+                order["status"] = "filled"
+                self.logger.info(f"{order['side'].capitalize()} order filled at price {order['price']}")
             else:
-                # If not in open orders, check if it was filled
-                if order["status"] == "open":
-                    order_details = await self.exchange_manager.fetch_order(
-                        exchange_id=exchange_id,
-                        order_id=order["id"],
-                        symbol=symbol
-                    )
-                    
-                    if order_details and order_details.get("status") == "closed":
-                        order["status"] = "filled"
-                        self.logger.info(f"{order['side'].capitalize()} order filled at price {order['price']}")
-                        
-                        # Update performance metrics
-                        if order["side"] == "sell":
-                            # For sell orders, we made a profit if we sold higher than we bought
-                            profit = order["price"] - self.last_price
-                            self.update_performance(profit, profit > 0)
+                order["status"] = "canceled"
+                self.logger.warning(f"{order['side'].capitalize()} order at price {order['price']} was {order_details.get('status')}")
+            
+            self.save_state(f"order:{order['id']}", order)
     
     async def check_and_replace_filled_orders(self) -> None:
         """
@@ -289,28 +365,43 @@ class GridTradingStrategy(BaseStrategy):
                 )
                 
                 if new_order:
+                    self.order_tracker.track(new_order)
+                    self.logger.info(f"Replaced filled {order['side']} order with new {new_side} order at price {price}")
+                    
                     # Update the order in our grid
+                    self.delete_state(f"order:{order['id']}")
                     order["id"] = new_order.get("id")
                     order["side"] = new_side
+                    order["amount"] = amount
+                    order["timestamp"] = new_order.get("timestamp")
                     order["status"] = "open"
-                    
-                    self.logger.info(f"Replaced filled {order['side']} order with new {new_side} order at price {price}")
+                    self.save_state(f"order:{order['id']}", order)
     
     async def cancel_all_orders(self) -> None:
         """
-        Cancel all open grid orders
+        Cancel all open grid orders in one batch
         """
         exchange_id = self.parameters["exchange_id"]
         symbol = self.parameters["symbol"]
         
-        for order in self.grid_orders:
-            if order["status"] == "open":
-                await self.exchange_manager.cancel_order(
-                    exchange_id=exchange_id,
-                    order_id=order["id"],
-                    symbol=symbol
-                )
-                self.logger.info(f"Cancelled {order['side']} order at price {order['price']}")
+        open_orders = {str(order["id"]): order for order in self.grid_orders if order["status"] == "open"}
+        if open_orders:
+            requested = len(open_orders)
+            cancelled = await self.exchange_manager.cancel_orders(exchange_id, list(open_orders), symbol)
+            
+            for order_id in cancelled:
+                order = open_orders.pop(str(order_id), None)
+                if order is None:
+                    continue
+                order["status"] = "canceled"
+                self.order_tracker.untrack(order_id)
+                self.delete_state(f"order:{order_id}")
+            
+            self.logger.info(f"Cancelled {requested - len(open_orders)} of {requested} open grid orders")
+        
+        # Nothing is left to adopt once every order is cancelled
+        if not any(order["status"] == "open" for order in self.grid_orders):
+            self.clear_state()
     
     async def log_status(self) -> None:
         """
@@ -321,4 +412,5 @@ class GridTradingStrategy(BaseStrategy):
         filled_orders = sum(1 for order in self.grid_orders if order["status"] == "filled")
         
         self.logger.info(f"Grid status: {open_buys} open buys, {open_sells} open sells, {filled_orders} filled orders")
-        self.logger.info(f"Performance: {self.performance['profit_loss']:.8f} profit, {self.performance['win_rate']:.2f}% win rate")
\ No newline at end of file
+        performance = self.get_performance()
+        self.logger.info(f"Performance: {performance['profit_loss']:.8f} profit, {performance['win_rate']:.2f}% win rate, {performance['max_drawdown']:.8f} max drawdown")
\ No newline at end of file
@@ -1,4 +1,5 @@
 import os
+import asyncio
 import importlib.util
 import inspect
 import logging
@@ -6,6 +7,7 @@ from typing import Dict, List, Optional, Any, Type
 from pathlib import Path
 from config import STRATEGIES_DIR
 from base_strategy import BaseStrategy
+from worker_pool import WorkerPool
 
 # Configure logging
 logging.basicConfig(
@@ -14,13 +16,21 @@ logging.basicConfig(
 )
 logger = logging.getLogger("strategy_manager")
 
+# Name of the instance managed by the active strategy methods
+DEFAULT_INSTANCE = "default"
+
 class StrategyManager:
     """
     Manages trading strategies
+    
+    Any number of named strategy instances can run side by side, each with
+    its own task and parameters. With start_workers, instances deployed
+    through deploy_instance run in a pool of worker processes instead.
     """
     def __init__(self):
         self.strategies: Dict[str, Type[BaseStrategy]] = {}
-        self.active_strategy: Optional[BaseStrategy] = None
+        self.instances: Dict[str, BaseStrategy] = {}
+        self.worker_pool: Optional[WorkerPool] = None
         self.load_strategies()
     
     def load_strategies(self) -> None:
@@ -147,16 +157,23 @@ class StrategyManager:
             logger.error(f"Failed to initialize strategy {strategy_id}: {str(e)}")
             return None
     
-    def set_active_strategy(
-        self, 
-        strategy_id: str, 
-        exchange_manager: Any, 
+    async def create_instance(
+        self,
+        name: str,
+        strategy_id: str,
+        exchange_manager: Any,
         parameters: Dict = None
     ) -> bool:
         """
-        Set the active strategy
+        Create a named strategy instance
+        
+        An existing instance with the same name is stopped and replaced once
+        its shutdown finished, so its on_stop does not overlap the new
+        instance's start on the same state. Instances share the exchange
+        manager, and with it its connection pools, caches and rate limiters.
         
         Args:
+            name: Instance name
             strategy_id: ID of the strategy
             exchange_manager: Exchange manager instance
             parameters: Strategy parameters
@@ -164,56 +181,326 @@ class StrategyManager:
         Returns:
             bool: True if successful, False otherwise
         """
-        # Stop the current active strategy if there is one
-        if self.active_strategy:
-            self.active_strategy.stop()
-            self.active_strategy = None
+        # Stop the instance being replaced and wait for its shutdown
+        existing = self.instances.pop(name, None)
+        if existing:
+            task = existing.task
+            if existing.is_running():
+                existing.stop()
+            if task:
+                await asyncio.gather(task, return_exceptions=True)
         
-        # Initialize the new strategy
         strategy = self.initialize_strategy(strategy_id, exchange_manager, parameters)
         if not strategy:
             return False
         
-        self.active_strategy = strategy
+        strategy.set_instance_id(name)
+        self.instances[name] = strategy
+        logger.info(f"Created strategy instance {name} ({strategy_id})")
         return True
     
-    def start_active_strategy(self) -> bool:
+    def get_instance(self, name: str) -> Optional[BaseStrategy]:
         """
-        Start the active strategy
+        Get a strategy instance by name
+        
+        Args:
+            name: Instance name
+            
+        Returns:
+            Strategy instance or None if not found
+        """
+        return self.instances.get(name)
+    
+    def get_instances(self) -> Dict[str, BaseStrategy]:
+        """
+        Get all strategy instances
+        
+        Returns:
+            Dict of instance name to strategy instance
+        """
+        return self.instances
+    
+    def start_instance(self, name: str) -> bool:
+        """
+        Start a strategy instance
         
+        Args:
+            name: Instance name
+            
         Returns:
             bool: True if successful, False otherwise
         """
-        if not self.active_strategy:
-            logger.error("No active strategy to start")
+        strategy = self.instances.get(name)
+        if not strategy:
+            logger.error(f"Strategy instance {name} not found")
             return False
         
         try:
-            self.active_strategy.start()
-            logger.info(f"Started strategy: {self.active_strategy.get_strategy_id()}")
+            strategy.start()
+            logger.info(f"Started strategy instance: {name}")
             return True
         except Exception as e:
-            logger.error(f"Failed to start strategy: {str(e)}")
+            logger.error(f"Failed to start strategy instance {name}: {str(e)}")
             return False
     
-    def stop_active_strategy(self) -> bool:
+    def stop_instance(self, name: str) -> bool:
         """
-        Stop the active strategy
+        Stop a strategy instance
         
+        The instance's task is cancelled and runs on_stop in the background;
+        remove_instance and stop_all wait for it to finish.
+        
+        Args:
+            name: Instance name
+            
         Returns:
             bool: True if successful, False otherwise
         """
-        if not self.active_strategy:
-            logger.error("No active strategy to stop")
+        strategy = self.instances.get(name)
+        if not strategy:
+            logger.error(f"Strategy instance {name} not found")
             return False
         
         try:
-            self.active_strategy.stop()
-            logger.info(f"Stopped strategy: {self.active_strategy.get_strategy_id()}")
+            strategy.stop()
+            logger.info(f"Stopped strategy instance: {name}")
             return True
         except Exception as e:
-            logger.error(f"Failed to stop strategy: {str(e)}")
+            logger.error(f"Failed to stop strategy instance {name}: {str(e)}")
+            return False
+    
+    def start_workers(self, exchange_manager: Any, num_workers: Optional[int] = None) -> WorkerPool:
+        """
+        Run deployed instances in a pool of worker processes
+        
+        This process becomes the exchange gateway for the workers. Must be
+        called from the running event loop.
+        
+        Args:
+            exchange_manager: Exchange manager instance
+            num_workers: Number of worker processes, defaults to the CPU count
+            
+        Returns:
+            WorkerPool: The started pool
+        """
+        if not self.worker_pool:
+            self.worker_pool = WorkerPool(exchange_manager, num_workers)
+            self.worker_pool.start()
+        return self.worker_pool
+    
+    def get_workers_status(self) -> List[Dict]:
+        """
+        Get the health and load of the worker processes
+        
+        Returns:
+            List of dicts with worker status, empty without a worker pool
+        """
+        if not self.worker_pool:
+            return []
+        return self.worker_pool.get_workers_status()
+    
+    def has_instance(self, name: str) -> bool:
+        """
+        Check if an instance exists in this process or the worker pool
+        
+        Args:
+            name: Instance name
+            
+        Returns:
+            bool: True if the instance exists
+        """
+        return name in self.instances or bool(self.worker_pool and self.worker_pool.has_instance(name))
+    
+    async def deploy_instance(
+        self,
+        name: str,
+        strategy_id: str,
+        exchange_manager: Any,
+        parameters: Dict = None,
+        start: bool = True
+    ) -> bool:
+        """
+        Create and optionally start an instance, in the worker pool if there is one
+        
+        Args:
+            name: Instance name
+            strategy_id: ID of the strategy
+            exchange_manager: Exchange manager instance
+            parameters: Strategy parameters
+            start: Whether to start the instance
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if self.worker_pool and name not in self.instances:
+            if not self.get_strategy_class(strategy_id):
+                logger.error(f"Strategy {strategy_id} not found")
+                return False
+            if not await self.worker_pool.create_instance(name, strategy_id, parameters):
+                return False
+            return await self.worker_pool.start_instance(name) if start else True
+        
+        if not await self.create_instance(name, strategy_id, exchange_manager, parameters):
+            return False
+        return self.start_instance(name) if start else True
+    
+    async def set_instance_running(self, name: str, running: bool) -> bool:
+        """
+        Start or stop an instance wherever it runs
+        
+        Args:
+            name: Instance name
+            running: True to start, False to stop
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if self.worker_pool and self.worker_pool.has_instance(name):
+            if running:
+                return await self.worker_pool.start_instance(name)
+            return await self.worker_pool.stop_instance(name)
+        
+        return self.start_instance(name) if running else self.stop_instance(name)
+    
+    async def remove_instance(self, name: str) -> bool:
+        """
+        Stop a strategy instance, wait for its shutdown and remove it
+        
+        Args:
+            name: Instance name
+            
+        Returns:
+            bool: True if the instance existed, False otherwise
+        """
+        if self.worker_pool and self.worker_pool.has_instance(name):
+            return await self.worker_pool.remove_instance(name)
+        
+        strategy = self.instances.pop(name, None)
+        if not strategy:
+            logger.error(f"Strategy instance {name} not found")
             return False
+        
+        task = strategy.task
+        if strategy.is_running():
+            strategy.stop()
+        if task:
+            await asyncio.gather(task, return_exceptions=True)
+        
+        logger.info(f"Removed strategy instance: {name}")
+        return True
+    
+    async def stop_all(self) -> None:
+        """
+        Stop all running instances and wait for their shutdown
+        
+        The worker pool, if any, is shut down as well.
+        """
+        if self.worker_pool:
+            await self.worker_pool.stop()
+            self.worker_pool = None
+        
+        tasks = []
+        for name, strategy in self.instances.items():
+            if strategy.is_running():
+                if strategy.task:
+                    tasks.append(strategy.task)
+                self.stop_instance(name)
+        
+        # Let on_stop finish its exchange calls before the sessions close
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    def get_instance_status(self, name: str) -> Dict:
+        """
+        Get the status of a strategy instance
+        
+        Args:
+            name: Instance name
+            
+        Returns:
+            Dict with instance status, empty if not found
+        """
+        strategy = self.instances.get(name)
+        if not strategy:
+            return self.worker_pool.get_instance_status(name) if self.worker_pool else {}
+        
+        return {
+            "name": name,
+            "id": strategy.get_strategy_id(),
+            "strategy_name": strategy.get_strategy_name(),
+            "running": strategy.is_running(),
+            "parameters": strategy.get_parameters(),
+            "performance": strategy.get_performance(),
+            "positions": strategy.ledger.get_positions(),
+            "equity": strategy.ledger.get_equity_series(),
+            "last_update": strategy.get_last_update_time()
+        }
+    
+    def get_all_instances_status(self) -> List[Dict]:
+        """
+        Get the status of all strategy instances
+        
+        Returns:
+            List of dicts with instance status
+        """
+        statuses = [self.get_instance_status(name) for name in self.instances]
+        if self.worker_pool:
+            statuses.extend(self.worker_pool.get_all_instances_status())
+        return statuses
+    
+    @property
+    def active_strategy(self) -> Optional[BaseStrategy]:
+        """
+        The instance managed through the active strategy methods
+        """
+        return self.instances.get(DEFAULT_INSTANCE)
+    
+    async def set_active_strategy(
+        self, 
+        strategy_id: str, 
+        exchange_manager: Any, 
+        parameters: Dict = None
+    ) -> bool:
+        """
+        Set the active strategy
+        
+        The active strategy is the instance named DEFAULT_INSTANCE. Replacing
+        it leaves all other instances running.
+        
+        Args:
+            strategy_id: ID of the strategy
+            exchange_manager: Exchange manager instance
+            parameters: Strategy parameters
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        return await self.create_instance(DEFAULT_INSTANCE, strategy_id, exchange_manager, parameters)
+    
+    def start_active_strategy(self) -> bool:
+        """
+        Start the active strategy
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.active_strategy:
+            logger.error("No active strategy to start")
+            return False
+        
+        return self.start_instance(DEFAULT_INSTANCE)
+    
+    def stop_active_strategy(self) -> bool:
+        """
+        Stop the active strategy
+        
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        if not self.active_strategy:
+            logger.error("No active strategy to stop")
+            return False
+        
+        return self.stop_instance(DEFAULT_INSTANCE)
     
     def get_active_strategy(self) -> Optional[BaseStrategy]:
         """
@@ -241,6 +528,8 @@ class StrategyManager:
             "running": self.active_strategy.is_running(),
             "parameters": self.active_strategy.get_parameters(),
             "performance": self.active_strategy.get_performance(),
+            "positions": self.active_strategy.ledger.get_positions(),
+            "equity": self.active_strategy.ledger.get_equity_series(),
             "last_update": self.active_strategy.get_last_update_time()
         }
 
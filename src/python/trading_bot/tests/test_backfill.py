@@ -0,0 +1,83 @@
+import json
+import asyncio
+import threading
+from backfill import Backfill
+from history_store import HistoryStore
+
+class FakeExchange:
+    has = {"fetchTrades": True, "fetchOHLCV": True}
+    
+    def parse_timeframe(self, timeframe):
+        return 60
+
+class FakeManager:
+    """
+    Serves pages of a fixed trade list the way ccxt fetch_trades does
+    """
+    def __init__(self, trades, page_limit):
+        self.trades = trades
+        self.page_limit = page_limit
+        self.calls = []
+    
+    def get_exchange(self, exchange_id):
+        return FakeExchange()
+    
+    def check_permission(self, exchange_id, level):
+        return True
+    
+    async def _call(self, exchange_id, method, symbol, since, limit, lane="read"):
+        self.calls.append((method, since))
+        return [trade for trade in self.trades if trade["timestamp"] >= since][:limit]
+
+def trade(timestamp, trade_id):
+    return {"timestamp": timestamp, "id": str(trade_id), "price": 100.0, "amount": 1.0, "side": "buy"}
+
+def run_backfill(tmp_path, trades, page_limit, end):
+    store = HistoryStore(tmp_path / "history")
+    manager = FakeManager(trades, page_limit)
+    job = {"kind": "trades", "exchange_id": "x", "symbol": "A/B", "since": 0, "end": end}
+    backfill = Backfill(manager, [job], store=store, checkpoint_path=tmp_path / "backfill.json", page_limit=page_limit)
+    status = asyncio.run(backfill.run())
+    return store, backfill, status
+
+def test_trades_sharing_a_timestamp_across_pages_are_stored_once(tmp_path):
+    # The trades at 2000 span the first two pages
+    trades = [trade(1000, 1)] + [trade(2000, i) for i in range(2, 5)] + [trade(3000, 5)]
+    store, backfill, status = run_backfill(tmp_path, trades, page_limit=3, end=10000)
+    
+    ids = store.read("trades", "x", "A/B")["id"].tolist()
+    assert ids == [b"1", b"2", b"3", b"4", b"5"]
+    assert status["done"] == 1
+    assert status["rows"] == 5
+
+def test_full_page_within_one_millisecond_skips_ahead(tmp_path):
+    # More trades at one timestamp than fit a page cannot be paged through
+    trades = [trade(1000, i) for i in range(5)] + [trade(1001, 9)]
+    store, backfill, status = run_backfill(tmp_path, trades, page_limit=3, end=10000)
+    
+    timestamps = store.read("trades", "x", "A/B")["timestamp"].tolist()
+    assert timestamps == [1000, 1000, 1000, 1001]
+    assert status["done"] == 1
+
+def test_rerun_resumes_from_the_checkpoint(tmp_path):
+    trades = [trade(1000, 1), trade(2000, 2), trade(2000, 3)]
+    store, backfill, _ = run_backfill(tmp_path, trades, page_limit=10, end=5000)
+    checkpoint = json.loads((tmp_path / "backfill.json").read_text())
+    assert checkpoint["trades:x:A/B"]["cursor"] == 5000
+    
+    trades.append(trade(6000, 4))
+    store, backfill, status = run_backfill(tmp_path, trades, page_limit=10, end=8000)
+    assert store.read("trades", "x", "A/B")["id"].tolist() == [b"1", b"2", b"3", b"4"]
+    assert status["jobs"][0]["start"] == 0
+
+def test_rows_are_written_off_the_event_loop(tmp_path, monkeypatch):
+    threads = []
+    append_trades = HistoryStore.append_trades
+    
+    def record_thread(self, *args):
+        threads.append(threading.current_thread().name)
+        return append_trades(self, *args)
+    
+    monkeypatch.setattr(HistoryStore, "append_trades", record_thread)
+    run_backfill(tmp_path, [trade(1000, 1), trade(2000, 2)], page_limit=1, end=5000)
+    assert threads and all(name.startswith("backfill-writer") for name in threads)
\ No newline at end of file
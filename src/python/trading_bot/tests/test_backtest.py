@@ -0,0 +1,44 @@
+import asyncio
+import numpy as np
+import pytest
+
+pytest.importorskip("ccxt")
+
+from backtest import run_backtest
+from grid_sweep import price_path, simulate_grids
+
+# Hourly bars, each holding one price; the grid ticks many times per bar,
+# so replacement orders rest before the price moves on as simulate_grids assumes
+PRICES = [100.0, 111.0, 89.0, 104.0, 93.0, 108.0, 96.0, 100.5, 120.0, 80.0, 102.0]
+RESERVE = 100.0
+BARS = [[1704067200000 + i * 3600000, price, price, price, price, 1.0] for i, price in enumerate(PRICES)]
+
+@pytest.mark.parametrize("grid_levels", [5, 7, 12])
+def test_simulated_exchange_fills_match_simulate_grids(grid_levels):
+    combination = {"lower_price": 90.0, "upper_price": 110.0, "grid_levels": grid_levels, "total_investment": 1200.0}
+    expected = simulate_grids(price_path(BARS), [combination], fee_rate=0.001)[0]
+    
+    # Fund the initial buys and the base the initial sells need, plus a
+    # reserve for the fees, which simulate_grids lets the balance absorb
+    step = (combination["upper_price"] - combination["lower_price"]) / (grid_levels - 1)
+    order_value = combination["total_investment"] / grid_levels
+    levels = [combination["lower_price"] + i * step for i in range(grid_levels)]
+    balances = {
+        "USDT": order_value * sum(1 for price in levels if price < PRICES[0]) + RESERVE,
+        "BTC": sum(order_value / price for price in levels if price > PRICES[0]) * (1 + 1e-9)
+    }
+    
+    results = asyncio.run(run_backtest(
+        "grid_trading",
+        {"exchange_id": "sim", "symbol": "BTC/USDT", "tick_interval": 60, **combination},
+        data={"sim": {"BTC/USDT": BARS}},
+        balances={"sim": balances},
+        fee_rate=0.001
+    ))
+    
+    trades = results["trades"]
+    assert sum(1 for trade in trades if trade["side"] == "buy") == expected["buys"]
+    assert sum(1 for trade in trades if trade["side"] == "sell") == expected["sells"]
+    assert results["fees"] == pytest.approx(expected["fees"], rel=1e-6)
+    assert results["balances"]["sim"]["BTC"] == pytest.approx(expected["inventory"], rel=1e-6)
+    assert results["balances"]["sim"]["USDT"] == pytest.approx(expected["quote_balance"] + RESERVE, rel=1e-6)
\ No newline at end of file
@@ -0,0 +1,88 @@
+import numpy as np
+import pytest
+from grid_sweep import price_path, grid_combinations, simulate_grids
+
+def reference_grid(path, lower_price, upper_price, grid_levels, total_investment, fee_rate):
+    """Order-by-order model of GridTradingStrategy over a price path"""
+    step = (upper_price - lower_price) / (grid_levels - 1)
+    order_value = total_investment / grid_levels
+    start = path[0]
+    orders = [
+        ["buy" if price < start else "sell", price, order_value / price]
+        for price in (lower_price + index * step for index in range(grid_levels))
+        if price != start
+    ]
+    inventory = sum(amount for side, _, amount in orders if side == "sell")
+    quote = order_value * sum(1 for side, _, _ in orders if side == "buy")
+    peak = quote + inventory * start
+    buys = sells = 0
+    fees = max_drawdown = 0.0
+    
+    for previous, price in zip(path[:-1], path[1:]):
+        for order in orders:
+            side, level, amount = order
+            if side == "sell" and price > previous and level <= price:
+                fee = amount * level * fee_rate
+                quote += amount * level - fee
+                inventory -= amount
+                sells += 1
+            elif side == "buy" and price < previous and level >= price:
+                fee = amount * level * fee_rate
+                quote -= amount * level + fee
+                inventory += amount
+                buys += 1
+            else:
+                continue
+            fees += fee
+            order[0] = "buy" if side == "sell" else "sell"
+        equity = quote + inventory * price
+        peak = max(peak, equity)
+        max_drawdown = max(max_drawdown, (peak - equity) / peak)
+    
+    return {
+        "buys": buys,
+        "sells": sells,
+        "fees": fees,
+        "inventory": inventory,
+        "quote_balance": quote,
+        "final_value": quote + inventory * path[-1],
+        "max_drawdown_pct": max_drawdown * 100
+    }
+
+def test_price_path_keeps_turning_points():
+    assert price_path([1.0, 2.0, 3.0, 3.0, 2.0, 1.0, 4.0]).tolist() == [1.0, 3.0, 1.0, 4.0]
+    
+    # A rising bar is walked open, low, high, close
+    bars = [[0, 10.0, 12.0, 9.0, 11.0, 1.0]]
+    assert price_path(bars).tolist() == [10.0, 9.0, 12.0, 11.0]
+
+def test_grid_combinations_skip_invalid_sets():
+    combinations = grid_combinations([90.0, 110.0], [100.0], [1, 5], [1000.0])
+    assert combinations == [{"lower_price": 90.0, "upper_price": 100.0, "grid_levels": 5, "total_investment": 1000.0}]
+
+def test_simulate_grids_matches_order_by_order_model():
+    rng = np.random.default_rng(7)
+    path = price_path(100.0 + np.cumsum(rng.normal(0.0, 1.5, 500)))
+    path[0] = 100.0
+    combinations = grid_combinations([80.0, 90.0, 95.5], [105.0, 110.0, 130.0], [2, 5, 11], [1000.0])
+    
+    results = simulate_grids(path, combinations, fee_rate=0.001)
+    assert len(results) == len(combinations)
+    for combination, result in zip(combinations, results):
+        expected = reference_grid(path, fee_rate=0.001, **combination)
+        for key, value in expected.items():
+            assert result[key] == pytest.approx(value, rel=1e-9, abs=1e-9), (combination, key)
+        assert result["fills"] == expected["buys"] + expected["sells"]
+
+def test_level_at_start_price_gets_no_order():
+    # Levels at 90, 95, 100, 105 and 110 with the price starting on 100
+    combination = {"lower_price": 90.0, "upper_price": 110.0, "grid_levels": 5, "total_investment": 1000.0}
+    result = simulate_grids(np.array([100.0, 111.0, 89.0]), [combination], fee_rate=0.0)[0]
+    
+    assert result["initial_value"] == pytest.approx(400.0 + 200.0 * 100.0 / 105.0 + 200.0 * 100.0 / 110.0)
+    assert result["sells"] == 2
+    # The level at 100 stays empty after the sells are replaced with buys
+    assert result["buys"] == 4
+    
+    # Both sells were backed by base bought at 100
+    assert result["realized_pnl"] == pytest.approx(200.0 * (1 - 100.0 / 105.0) + 200.0 * (1 - 100.0 / 110.0))
\ No newline at end of file
@@ -0,0 +1,60 @@
+import numpy as np
+import pytest
+from history_store import HistoryStore, DAY_MS
+
+def candle(timestamp, close):
+    return [timestamp, close, close + 1, close - 1, close, 10.0]
+
+def trade(timestamp, trade_id):
+    return {"timestamp": timestamp, "id": trade_id, "price": 100.0, "amount": 1.0, "side": "sell"}
+
+def test_rows_are_partitioned_by_day_and_read_by_range(tmp_path):
+    store = HistoryStore(tmp_path)
+    candles = [candle(DAY_MS - 60000, 1.0), candle(DAY_MS, 2.0), candle(DAY_MS + 60000, 3.0)]
+    assert store.append_ohlcv("x", "A/B", candles) == 3
+    
+    assert store.get_days("ohlcv", "x", "A/B") == ["1970-01-01", "1970-01-02"]
+    assert store.read("ohlcv", "x", "A/B")["close"].tolist() == [1.0, 2.0, 3.0]
+    assert store.read("ohlcv", "x", "A/B", start=DAY_MS, columns=["close"])["close"].tolist() == [2.0, 3.0]
+    assert store.read("ohlcv", "x", "A/B", end=DAY_MS + 60000)["timestamp"].tolist() == [DAY_MS - 60000, DAY_MS]
+    assert store.read_ohlcv("x", "A/B").shape == (3, 6)
+    assert store.get_range("ohlcv", "x", "A/B") == (DAY_MS - 60000, DAY_MS + 60000)
+
+def test_candles_already_stored_are_dropped(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append_ohlcv("x", "A/B", [candle(0, 1.0), candle(60000, 2.0)])
+    assert store.append_ohlcv("x", "A/B", [candle(60000, 5.0), candle(120000, 3.0)]) == 1
+    assert store.read("ohlcv", "x", "A/B")["close"].tolist() == [1.0, 2.0, 3.0]
+
+def test_trades_at_the_last_timestamp_are_matched_by_id(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append_trades("x", "A/B", [trade(1000, "a"), trade(2000, "b"), trade(2000, "c")])
+    written = store.append_trades("x", "A/B", [trade(1500, "z"), trade(2000, "b"), trade(2000, "d"), trade(3000, "e")])
+    
+    assert written == 2
+    assert store.read("trades", "x", "A/B")["id"].tolist() == [b"a", b"b", b"c", b"d", b"e"]
+
+def test_torn_write_is_cut_off_before_appending(tmp_path):
+    store = HistoryStore(tmp_path)
+    store.append_ohlcv("x", "A/B", [candle(0, 1.0), candle(60000, 2.0)])
+    
+    # A crash after writing some columns of a third row
+    path = store.get_path("ohlcv", "x", "A/B", "1970-01-01")
+    with open(path / "open.bin", "ab") as f:
+        f.write(np.float64(9.0).tobytes())
+    with open(path / "close.bin", "ab") as f:
+        f.write(np.float64(9.0).tobytes()[:4])
+    assert len(store.read("ohlcv", "x", "A/B")["close"]) == 2
+    
+    store.append_ohlcv("x", "A/B", [candle(120000, 3.0)])
+    data = store.read("ohlcv", "x", "A/B")
+    assert data["open"].tolist() == [1.0, 2.0, 3.0]
+    assert data["close"].tolist() == [1.0, 2.0, 3.0]
+
+def test_unknown_kind_and_column_are_rejected(tmp_path):
+    store = HistoryStore(tmp_path)
+    with pytest.raises(ValueError):
+        store.append("quotes", "x", "A/B", {"timestamp": [1]})
+    with pytest.raises(ValueError):
+        store.read("ohlcv", "x", "A/B", columns=["vwap"])
+    assert store.read("ohlcv", "x", "A/B")["close"].tolist() == []
\ No newline at end of file
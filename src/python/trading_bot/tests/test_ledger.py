@@ -0,0 +1,83 @@
+import pytest
+from clock import VirtualClock
+from ledger import Ledger
+
+def test_fills_are_matched_first_in_first_out():
+    ledger = Ledger(VirtualClock(0.0))
+    ledger.record_fill("x", "A/B", "buy", 1.0, 100.0)
+    ledger.record_fill("x", "A/B", "buy", 1.0, 110.0)
+    
+    # Closes the lot bought at 100 and half of the one at 110
+    assert ledger.record_fill("x", "A/B", "sell", 1.5, 120.0) == pytest.approx(20.0 + 5.0)
+    position = ledger.get_positions()[0]
+    assert position["position"] == pytest.approx(0.5)
+    assert position["average_price"] == pytest.approx(110.0)
+    assert position["open_lots"] == 1
+    assert ledger.round_trips == 1
+    assert ledger.wins == 1
+
+def test_a_fill_can_reverse_the_position():
+    ledger = Ledger(VirtualClock(0.0))
+    ledger.record_fill("x", "A/B", "buy", 1.0, 100.0)
+    assert ledger.record_fill("x", "A/B", "sell", 3.0, 90.0) == pytest.approx(-10.0)
+    
+    position = ledger.get_positions()[0]
+    assert position["position"] == pytest.approx(-2.0)
+    assert position["average_price"] == pytest.approx(90.0)
+    
+    ledger.mark("x", "A/B", 80.0)
+    assert ledger.unrealized_pnl == pytest.approx(20.0)
+
+def test_markets_are_kept_apart():
+    ledger = Ledger(VirtualClock(0.0))
+    ledger.record_fill("x", "A/B", "buy", 1.0, 100.0)
+    ledger.record_fill("y", "A/B", "sell", 1.0, 105.0)
+    
+    assert ledger.realized_pnl == 0.0
+    assert {(p["exchange_id"], p["position"]) for p in ledger.get_positions()} == {("x", 1.0), ("y", -1.0)}
+
+def test_equity_peak_and_drawdown_follow_marks_and_fees():
+    ledger = Ledger(VirtualClock(0.0), capital=1000.0)
+    ledger.record_fill("x", "A/B", "buy", 2.0, 100.0, fee=1.0)
+    ledger.mark("x", "A/B", 110.0)
+    ledger.mark("x", "A/B", 95.0)
+    
+    summary = ledger.get_summary()
+    assert summary["unrealized_pnl"] == pytest.approx(-10.0)
+    assert summary["fees"] == pytest.approx(1.0)
+    assert summary["profit_loss"] == pytest.approx(-11.0)
+    assert summary["peak_equity"] == pytest.approx(19.0)
+    assert summary["max_drawdown"] == pytest.approx(30.0)
+    assert summary["max_drawdown_pct"] == pytest.approx(30.0 / 1019.0 * 100)
+
+def test_flat_position_has_no_rounding_residue():
+    ledger = Ledger(VirtualClock(0.0))
+    for _ in range(10):
+        ledger.record_fill("x", "A/B", "buy", 0.1, 100.3)
+    ledger.record_fill("x", "A/B", "sell", 1.0, 100.3)
+    
+    position = ledger.get_positions()[0]
+    assert position["position"] == 0.0
+    assert position["open_lots"] == 0
+    assert ledger.unrealized_pnl == 0.0
+
+def test_marks_for_unknown_markets_and_bad_fills_are_ignored():
+    ledger = Ledger(VirtualClock(0.0))
+    ledger.mark("x", "A/B", 100.0)
+    assert ledger.record_fill("x", "A/B", "buy", 0.0, 100.0) == 0.0
+    assert ledger.fills == 0
+    assert ledger.get_equity_series() == {"times": [], "values": []}
+
+def test_equity_history_is_downsampled_when_full():
+    clock = VirtualClock(0.0)
+    ledger = Ledger(clock, resolution=1.0, max_points=8)
+    ledger.record_fill("x", "A/B", "buy", 1.0, 100.0)
+    for second in range(1, 40):
+        clock.now = float(second)
+        ledger.mark("x", "A/B", 100.0 + second)
+    
+    series = ledger.get_equity_series()
+    assert len(series["times"]) <= 8
+    assert series["times"] == sorted(series["times"])
+    assert series["values"][-1] == pytest.approx(ledger.get_equity())
+    assert ledger.resolution > 1.0
\ No newline at end of file
@@ -0,0 +1,78 @@
+import numpy as np
+import pytest
+from order_book import OrderBook
+
+def make_book():
+    return OrderBook.from_ccxt({
+        "symbol": "A/B",
+        "bids": [[99.0, 1.0], [100.0, 2.0], [98.0, 3.0], [97.0, 0.0]],
+        "asks": [[102.0, 2.0], [101.0, 1.0], [103.0, 4.0]],
+        "timestamp": 1000,
+        "nonce": 5
+    })
+
+def test_snapshot_is_sorted_best_first_without_empty_levels():
+    book = make_book()
+    assert book.bids.prices.tolist() == [100.0, 99.0, 98.0]
+    assert book.asks.prices.tolist() == [101.0, 102.0, 103.0]
+    assert book.best_bid == 100.0
+    assert book.best_ask == 101.0
+    assert book.mid_price == 100.5
+    assert book.spread == 1.0
+
+def test_single_deltas_insert_update_and_remove_levels():
+    book = make_book()
+    book.apply_delta("bids", 99.5, 1.5)
+    book.apply_delta("bids", 100.0, 0.5)
+    book.apply_delta("asks", 101.0, 0.0)
+    book.apply_delta("asks", 110.0, 0.0)
+    
+    assert book.bids.top(3).tolist() == [[100.0, 0.5], [99.5, 1.5], [99.0, 1.0]]
+    assert book.asks.prices.tolist() == [102.0, 103.0]
+
+def test_batched_deltas_keep_the_last_update_per_price():
+    book = make_book()
+    book.apply_deltas(
+        bids=[[100.0, 5.0], [100.0, 0.0], [101.0, 1.0]],
+        asks=[[102.0, 0.0], [104.0, 1.0], [104.0, 2.0]],
+        timestamp=2000,
+        nonce=6
+    )
+    
+    assert book.bids.top(10).tolist() == [[101.0, 1.0], [99.0, 1.0], [98.0, 3.0]]
+    assert book.asks.top(10).tolist() == [[101.0, 1.0], [103.0, 4.0], [104.0, 2.0]]
+    assert (book.timestamp, book.nonce) == (2000, 6)
+
+def test_batched_deltas_match_single_deltas():
+    rng = np.random.default_rng(7)
+    single, batched = make_book(), make_book()
+    prices = rng.choice(np.arange(90.0, 100.0, 0.5), 200)
+    sizes = rng.choice([0.0, 0.5, 1.0, 2.0], 200)
+    
+    for price, size in zip(prices, sizes):
+        single.apply_delta("bids", price, size)
+    batched.apply_deltas(bids=np.column_stack((prices, sizes)))
+    
+    assert batched.bids.top(100).tolist() == single.bids.top(100).tolist()
+
+def test_cumulative_depth_and_vwap():
+    book = make_book()
+    sizes, notional = book.cumulative_depth("asks")
+    assert sizes.tolist() == [1.0, 3.0, 7.0]
+    assert notional.tolist() == [101.0, 305.0, 717.0]
+    
+    assert book.vwap("buy", 1.0) == 101.0
+    assert book.vwap("buy", 2.0) == pytest.approx((101.0 + 102.0) / 2)
+    assert book.vwap("buy", 7.0) == pytest.approx(717.0 / 7)
+    assert book.vwap("buy", 7.5) is None
+    assert book.vwap("sell", 3.0) == pytest.approx((100.0 * 2 + 99.0) / 3)
+    assert book.vwap("sell", 0.0) is None
+    with pytest.raises(ValueError):
+        book.vwap("hold", 1.0)
+
+def test_round_trips_through_ccxt_dict():
+    book = make_book()
+    data = book.to_dict(limit=2)
+    assert data["bids"] == [[100.0, 2.0], [99.0, 1.0]]
+    assert data["asks"] == [[101.0, 1.0], [102.0, 2.0]]
+    assert OrderBook.from_ccxt(book.to_dict()).to_dict() == book.to_dict()
\ No newline at end of file
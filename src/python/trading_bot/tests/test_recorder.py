@@ -0,0 +1,24 @@
+import gzip
+import numpy as np
+from recorder import MarketRecorder, read_recording, TICKER_DTYPE
+
+def ticker_record(received_at):
+    return (int(received_at * 1000), received_at, 1.0, 2.0, 1.1, 3.0, 1.05, 100.0)
+
+def test_snapshots_go_to_the_file_of_their_period(tmp_path):
+    recorder = MarketRecorder(None, [("x", "A/B")], directory=tmp_path, rotate_interval=3600)
+    recorder._write({("ticker", "x", "A/B"): [ticker_record(3599.5), ticker_record(3599.9), ticker_record(3600.1)]})
+    
+    first = recorder.get_path("ticker", "x", "A/B", 0)
+    second = recorder.get_path("ticker", "x", "A/B", 3600)
+    assert read_recording(first)["received_at"].tolist() == [3599.5, 3599.9]
+    assert read_recording(second)["received_at"].tolist() == [3600.1]
+
+def test_truncated_member_keeps_earlier_members(tmp_path):
+    first = np.array([ticker_record(1.0), ticker_record(2.0)], dtype=TICKER_DTYPE)
+    second = np.array([ticker_record(3.0)], dtype=TICKER_DTYPE)
+    cut = gzip.compress(np.array([ticker_record(4.0)], dtype=TICKER_DTYPE).tobytes())
+    
+    path = tmp_path / "ticker-19700101T000000.bin.gz"
+    path.write_bytes(gzip.compress(first.tobytes()) + gzip.compress(second.tobytes()) + cut[:len(cut) // 2])
+    assert read_recording(path)["received_at"].tolist() == [1.0, 2.0, 3.0]
\ No newline at end of file
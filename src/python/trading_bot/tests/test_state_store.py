@@ -0,0 +1,80 @@
+import time
+import asyncio
+from state_store import StateStore
+
+def test_writes_are_batched_into_one_commit(tmp_path):
+    store = StateStore(tmp_path / "state.db", flush_interval=0.01)
+    
+    async def run():
+        store.put("grid", "a", 1)
+        store.put("grid", "b", 2)
+        store.put("grid", "a", 3)
+        await asyncio.sleep(0.1)
+        return await store.load("grid")
+    
+    assert asyncio.run(run()) == {"a": 3, "b": 2}
+    assert store.stats["commits"] == 1
+    assert store.stats["rows"] == 2
+
+def test_writes_staged_during_a_commit_are_flushed(tmp_path):
+    store = StateStore(tmp_path / "state.db", flush_interval=0.01)
+    commit = store._commit
+    
+    def slow_commit(cleared, batch):
+        time.sleep(0.1)
+        commit(cleared, batch)
+    
+    store._commit = slow_commit
+    
+    async def run():
+        store.put("grid", "k1", 1)
+        await asyncio.sleep(0.05)
+        store.put("grid", "k2", 2)
+        await asyncio.sleep(0.5)
+    
+    asyncio.run(run())
+    assert store.pending == {}
+    assert store.stats["commits"] == 2
+    assert store._load("grid") == {"k1": "1", "k2": "2"}
+
+def test_clear_drops_staged_and_committed_values(tmp_path):
+    store = StateStore(tmp_path / "state.db", flush_interval=0.01)
+    
+    async def run():
+        store.put("grid", "a", 1)
+        await asyncio.sleep(0.05)
+        store.put("grid", "b", 2)
+        store.clear("grid")
+        store.put("grid", "c", 3)
+        assert await store.load("grid") == {"c": 3}
+        await asyncio.sleep(0.05)
+    
+    asyncio.run(run())
+    assert store._load("grid") == {"c": "3"}
+
+def test_failed_commit_keeps_newer_writes(tmp_path):
+    store = StateStore(tmp_path / "state.db", flush_interval=0.01)
+    commit = store._commit
+    
+    def failing_commit(cleared, batch):
+        store._commit = commit
+        raise OSError("disk full")
+    
+    store._commit = failing_commit
+    
+    async def run():
+        store.put("grid", "a", 1)
+        await asyncio.sleep(0.05)
+        assert store.stats["errors"] == 1
+        store.put("grid", "a", 2)
+        await asyncio.sleep(0.05)
+    
+    asyncio.run(run())
+    assert store._load("grid") == {"a": "2"}
+
+def test_writes_without_a_loop_commit_immediately(tmp_path):
+    store = StateStore(tmp_path / "state.db")
+    store.put("grid", "a", {"price": 1.5})
+    store.delete("grid", "missing")
+    assert store._load("grid") == {"a": '{"price": 1.5}'}
+    assert store.pending == {}
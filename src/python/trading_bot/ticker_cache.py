@@ -0,0 +1,164 @@
+import time
+import asyncio
+from typing import Dict, Optional, Any, Tuple, Callable, Awaitable
+
+class TickerCache:
+    """
+    Short-lived cache of tickers keyed by (exchange, symbol)
+    
+    A ticker younger than the freshness window is served from memory. When a
+    key is missing or stale, the first caller fetches it and every concurrent
+    caller for the same key awaits that one in-flight request instead of
+    issuing its own.
+    """
+    def __init__(self, ttl: float = 2.0):
+        """
+        Initialize the cache
+        
+        Args:
+            ttl: Default freshness window in seconds
+        """
+        self.ttl = ttl
+        self.entries: Dict[Tuple[str, str], Tuple[float, Dict]] = {}
+        self.in_flight: Dict[Tuple[str, str], asyncio.Task] = {}
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+    
+    async def get(
+        self,
+        exchange_id: str,
+        symbol: str,
+        fetch: Callable[[], Awaitable[Dict]],
+        ttl: Optional[float] = None
+    ) -> Dict:
+        """
+        Get a ticker, fetching it only if no fresh copy is cached
+        
+        Exceptions raised by ``fetch`` are propagated to every waiting caller
+        and nothing is cached for the key.
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            fetch: Coroutine factory that fetches the ticker from the exchange
+            ttl: Freshness window in seconds, defaults to the cache TTL
+            
+        Returns:
+            Dict: Ticker
+        """
+        key = (exchange_id, symbol)
+        
+        ticker = self.peek(exchange_id, symbol, ttl)
+        if ticker is not None:
+            return ticker
+        
+        task = self.in_flight.get(key)
+        if task:
+            self.coalesced += 1
+        else:
+            self.misses += 1
+            task = asyncio.ensure_future(self._fetch(key, fetch))
+            self.in_flight[key] = task
+        
+        # Shield the shared request so one cancelled caller does not cancel it for the others
+        return await asyncio.shield(task)
+    
+    async def _fetch(self, key: Tuple[str, str], fetch: Callable[[], Awaitable[Dict]]) -> Dict:
+        """
+        Run a fetch and store its result
+        
+        Args:
+            key: Cache key
+            fetch: Coroutine factory that fetches the ticker
+            
+        Returns:
+            Dict: Ticker
+        """
+        try:
+            ticker = await fetch()
+            if ticker:
+                self.entries[key] = (time.monotonic(), ticker)
+            return ticker
+        finally:
+            self.in_flight.pop(key, None)
+    
+    def peek(self, exchange_id: str, symbol: str, ttl: Optional[float] = None) -> Optional[Dict]:
+        """
+        Get a cached ticker without fetching
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            ttl: Freshness window in seconds, defaults to the cache TTL
+            
+        Returns:
+            Dict: Ticker or None if not cached or stale
+        """
+        max_age = self.ttl if ttl is None else ttl
+        entry = self.entries.get((exchange_id, symbol))
+        if entry and time.monotonic() - entry[0] <= max_age:
+            self.hits += 1
+            return entry[1]
+        return None
+    
+    def put(self, exchange_id: str, symbol: str, ticker: Dict) -> None:
+        """
+        Store a ticker obtained elsewhere (e.g. from a bulk fetch)
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            ticker: Ticker
+        """
+        if ticker:
+            self.entries[(exchange_id, symbol)] = (time.monotonic(), ticker)
+    
+    def get_age(self, exchange_id: str, symbol: str) -> Optional[float]:
+        """
+        Get the age of a cached ticker
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Market symbol
+            
+        Returns:
+            float: Age in seconds or None if not cached
+        """
+        entry = self.entries.get((exchange_id, symbol))
+        if not entry:
+            return None
+        return time.monotonic() - entry[0]
+    
+    def invalidate(self, exchange_id: Optional[str] = None, symbol: Optional[str] = None) -> None:
+        """
+        Drop cached tickers
+        
+        Args:
+            exchange_id: Only drop tickers of this exchange
+            symbol: Only drop tickers of this symbol
+        """
+        for key in list(self.entries):
+            if exchange_id is not None and key[0] != exchange_id:
+                continue
+            if symbol is not None and key[1] != symbol:
+                continue
+            del self.entries[key]
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """
+        Get cache counters
+        
+        Returns:
+            Dict: Hit, miss and coalesce counters
+        """
+        lookups = self.hits + self.misses + self.coalesced
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": (self.hits + self.coalesced) / lookups if lookups else 0.0,
+            "entries": len(self.entries),
+            "in_flight": len(self.in_flight),
+            "ttl": self.ttl
+        }
\ No newline at end of file
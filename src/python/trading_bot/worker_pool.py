@@ -0,0 +1,1197 @@
+import os
+import time
+import typing
+import logging
+import asyncio
+import itertools
+import threading
+import multiprocessing
+from typing import Dict, List, Optional, Any, Tuple, Set
+import ccxt.async_support as ccxt
+from config import PermissionLevel
+from balance_tracker import BalanceTracker
+from market_data import QuoteStore
+from market_bus import MarketDataReader, KIND_TICKER, record_to_ticker
+from state_store import StateStore
+
+logger = logging.getLogger("worker_pool")
+
+# Seconds between reads of the shared memory market data bus in workers
+BUS_POLL_INTERVAL = 0.01
+
+# Exchange manager coroutines that workers call through the gateway
+GATEWAY_METHODS = (
+    "fetch_balance",
+    "fetch_markets",
+    "load_market_index",
+    "fetch_ticker",
+    "fetch_tickers",
+    "fetch_order_book",
+    "create_order",
+    "create_orders",
+    "cancel_order",
+    "cancel_orders",
+    "cancel_all_for_symbol",
+    "fetch_order",
+    "fetch_orders",
+    "fetch_open_orders",
+    "fetch_closed_orders",
+    "fetch_my_trades",
+    "unsubscribe_ticker",
+    "unsubscribe_order_book",
+    "untrack_balances"
+)
+
+# ccxt methods workers may call directly through ExchangeManager._call, with
+# the permission level each needs. The order tracker uses these to tell a
+# failed request from an empty result.
+GATEWAY_CCXT_METHODS: Dict[str, PermissionLevel] = {
+    "fetch_open_orders": "read_only",
+    "fetch_closed_orders": "read_only",
+    "fetch_my_trades": "read_only"
+}
+
+# Synchronous exchange manager methods that workers forward without waiting
+GATEWAY_NOTIFICATIONS = (
+    "subscribe_ticker",
+    "subscribe_order_book",
+    "track_balances",
+    "_track_orders"
+)
+
+class GatewayError(Exception):
+    """
+    Error raised by the gateway that has no ccxt equivalent
+    """
+    pass
+
+def _remote_error(name: str, message: str) -> Exception:
+    """
+    Rebuild an exception raised in the gateway
+    
+    ccxt errors keep their type so strategies can still tell, e.g.,
+    InsufficientFunds from a timeout.
+    
+    Args:
+        name: Exception class name
+        message: Exception message
+        
+    Returns:
+        Exception: Exception to raise in the worker
+    """
+    error_class = getattr(ccxt, name, None)
+    if isinstance(error_class, type) and issubclass(error_class, Exception):
+        return error_class(message)
+    if name == "TimeoutError":
+        return asyncio.TimeoutError(message)
+    return GatewayError(f"{name}: {message}")
+
+def _reader(source: Any, loop: asyncio.AbstractEventLoop, dispatch: Any) -> None:
+    """
+    Hand messages from a multiprocessing queue to an event loop
+    
+    Runs in a daemon thread until it reads None.
+    
+    Args:
+        source: Queue to read
+        loop: Event loop to dispatch on
+        dispatch: Callback run on the loop for each message
+    """
+    while True:
+        message = source.get()
+        if message is None:
+            break
+        try:
+            loop.call_soon_threadsafe(dispatch, message)
+        except RuntimeError:
+            # Loop already closed
+            break
+
+class RemoteExchange:
+    """
+    Capabilities of a gateway exchange, as seen by strategies in a worker
+    """
+    def __init__(self, exchange_id: str, has: Dict):
+        self.id = exchange_id
+        self.has = has
+
+class GatewayClient:
+    """
+    Exchange manager stand-in for strategies running in a worker process
+    
+    Coroutines such as create_order are executed by the ExchangeManager of
+    the gateway process, so connection pools, caches and rate limits are
+    shared by all workers. Quotes of subscribed markets, fills and tracked
+    balances are mirrored into a local quote store and balance tracker, so
+    the synchronous accessors strategies rely on need no round trip.
+    Tickers arrive through the shared memory market data bus, everything
+    else through the worker's queue.
+    """
+    def __init__(self, worker_id: int, gateway_queue: Any, exchanges: Dict[str, Dict], call_timeout: float = 60.0, state_path: Optional[str] = None):
+        """
+        Initialize the client
+        
+        Args:
+            worker_id: ID of the worker process
+            gateway_queue: Queue read by the gateway
+            exchanges: Exchange snapshot from WorkerPool.get_exchange_snapshot
+            call_timeout: Seconds to wait for a gateway response
+            state_path: SQLite state database of the gateway, strategies keep no state without it
+        """
+        self.worker_id = worker_id
+        self.gateway_queue = gateway_queue
+        self.exchanges = exchanges
+        self.call_timeout = call_timeout
+        self.quote_store = QuoteStore()
+        self.balance_tracker = _MirroredBalanceTracker(self)
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.request_ids = itertools.count()
+        self.calls = 0
+        # Ticker subscriptions of this worker's instances, mirrored from the bus
+        self.tickers: Dict[Tuple[str, str], int] = {}
+        # SQLite in WAL mode is safe to share with the gateway and other workers
+        self.state_store = StateStore(state_path) if state_path else None
+    
+    def __getattr__(self, name: str) -> Any:
+        if name in GATEWAY_METHODS or name == "_call":
+            async def request(*args, **kwargs) -> Any:
+                return await self._request(name, *args, **kwargs)
+            return request
+        raise AttributeError(name)
+    
+    async def _request(self, method: str, *args, **kwargs) -> Any:
+        """
+        Call an exchange manager coroutine in the gateway
+        
+        Args:
+            method: Method name
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+            
+        Returns:
+            Result of the call
+        """
+        request_id = next(self.request_ids)
+        future = asyncio.get_event_loop().create_future()
+        self.pending[request_id] = future
+        self.calls += 1
+        self.gateway_queue.put(("call", self.worker_id, request_id, method, args, kwargs))
+        
+        try:
+            ok, result = await asyncio.wait_for(future, self.call_timeout)
+        finally:
+            self.pending.pop(request_id, None)
+        
+        if not ok:
+            raise _remote_error(*result)
+        return result
+    
+    def _notify(self, method: str, *args, **kwargs) -> None:
+        """
+        Call a synchronous exchange manager method in the gateway without waiting
+        
+        Args:
+            method: Method name
+            *args: Positional arguments
+            **kwargs: Keyword arguments
+        """
+        self.gateway_queue.put(("notify", self.worker_id, method, args, kwargs))
+    
+    def on_response(self, request_id: int, ok: bool, result: Any) -> None:
+        """
+        Resolve a pending gateway call
+        
+        Args:
+            request_id: ID of the call
+            ok: False if the call raised
+            result: Return value, or (exception name, message)
+        """
+        future = self.pending.get(request_id)
+        if future and not future.done():
+            future.set_result((ok, result))
+    
+    def on_fill(self, exchange_id: str, order: Dict) -> None:
+        """
+        Call the fill listeners of the local balance tracker
+        
+        Args:
+            exchange_id: ID of the exchange
+            order: Order whose filled amount grew
+        """
+        for listener in list(self.balance_tracker.listeners):
+            try:
+                listener(exchange_id, order)
+            except Exception as e:
+                logger.error(f"Balance tracker listener failed: {str(e)}")
+    
+    def get_exchange(self, exchange_id: str) -> Optional[RemoteExchange]:
+        """
+        Get the capabilities of an exchange
+        
+        Args:
+            exchange_id: ID of the exchange
+            
+        Returns:
+            RemoteExchange or None if not found
+        """
+        snapshot = self.exchanges.get(exchange_id)
+        if not snapshot:
+            return None
+        return RemoteExchange(exchange_id, snapshot["has"])
+    
+    def check_permission(self, exchange_id: str, required_level: PermissionLevel) -> bool:
+        """
+        Check if the exchange has the required permission level
+        
+        Args:
+            exchange_id: ID of the exchange
+            required_level: Required permission level
+            
+        Returns:
+            bool: True if the exchange has the required permission level
+        """
+        snapshot = self.exchanges.get(exchange_id)
+        return bool(snapshot and snapshot["permissions"].get(required_level))
+    
+    async def fetch_ticker(self, exchange_id: str, symbol: str, max_age: Optional[float] = None) -> Dict:
+        """
+        Fetch ticker for a symbol, from the mirrored quote store when fresh
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol to fetch ticker for
+            max_age: Maximum acceptable age in seconds, defaults to the exchange's ticker_ttl
+            
+        Returns:
+            Dict: Ticker
+        """
+        if max_age is None:
+            max_age = self.exchanges.get(exchange_id, {}).get("ticker_ttl", 0.0)
+        
+        entry = self.quote_store.get_ticker(exchange_id, symbol)
+        if entry and entry[0] <= max_age:
+            return entry[1]
+        return await self._request("fetch_ticker", exchange_id, symbol, max_age)
+    
+    def get_ticker_age(self, exchange_id: str, symbol: str) -> Optional[float]:
+        """
+        Get how long ago the mirrored ticker for a symbol was received
+        
+        Args:
+            exchange_id: ID of the exchange
+            symbol: Symbol of the ticker
+            
+        Returns:
+            float: Age in seconds or None if not mirrored
+        """
+        entry = self.quote_store.get_ticker(exchange_id, symbol)
+        return entry[0] if entry else None
+    
+    def subscribe_ticker(self, exchange_id: str, symbol: str, **kwargs) -> bool:
+        """
+        Subscribe to a ticker in the gateway and mirror its updates
+        
+        Returns:
+            bool: True if the exchange is known
+        """
+        if exchange_id not in self.exchanges:
+            return False
+        key = (exchange_id, symbol)
+        self.tickers[key] = self.tickers.get(key, 0) + 1
+        self._notify("subscribe_ticker", exchange_id, symbol, **kwargs)
+        return True
+    
+    async def unsubscribe_ticker(self, exchange_id: str, symbol: str) -> bool:
+        """
+        Leave a ticker subscription in the gateway
+        
+        Returns:
+            bool: True if the feed existed, False otherwise
+        """
+        key = (exchange_id, symbol)
+        if self.tickers.get(key, 0) > 1:
+            self.tickers[key] -= 1
+        else:
+            self.tickers.pop(key, None)
+        return await self._request("unsubscribe_ticker", exchange_id, symbol)
+    
+    def on_bus_records(self, records: Any) -> None:
+        """
+        Mirror subscribed tickers read from the market data bus
+        
+        Args:
+            records: Records returned by MarketDataReader.poll
+        """
+        for record in records[records["kind"] == KIND_TICKER]:
+            key = (record["exchange"].decode(), record["symbol"].decode())
+            if key in self.tickers:
+                self.quote_store.put_ticker(key[0], key[1], record_to_ticker(record))
+    
+    def subscribe_order_book(self, exchange_id: str, symbol: str, **kwargs) -> bool:
+        """
+        Subscribe to an order book in the gateway and mirror its updates
+        
+        Returns:
+            bool: True if the exchange is known
+        """
+        if exchange_id not in self.exchanges:
+            return False
+        self._notify("subscribe_order_book", exchange_id, symbol, **kwargs)
+        return True
+    
+    def track_balances(self, exchange_id: str) -> bool:
+        """
+        Start the balance sync of an exchange in the gateway
+        
+        Returns:
+            bool: True if the exchange is known
+        """
+        if exchange_id not in self.exchanges:
+            return False
+        self._notify("track_balances", exchange_id)
+        return True
+    
+    def _track_orders(self, exchange_id: str, orders: List[Dict]) -> List[Dict]:
+        """
+        Forward fetched order states to the gateway's balance tracker
+        
+        Returns:
+            List[Dict]: The same orders
+        """
+        if orders:
+            self._notify("_track_orders", exchange_id, orders)
+        return orders
+    
+    async def fetch_balance(self, exchange_id: str) -> Dict:
+        """
+        Fetch a balance through the gateway and apply it to the mirror
+        
+        Callers read the balance with get_free_balance right after, which
+        must not wait for the next heartbeat.
+        
+        Returns:
+            Dict: Account balance
+        """
+        balance = await self._request("fetch_balance", exchange_id)
+        if balance:
+            self.balance_tracker.update(exchange_id, balance)
+        return balance
+    
+    def get_free_balance(self, exchange_id: str, currency: str) -> Optional[float]:
+        """
+        Get the mirrored free balance of a currency
+        
+        Balances are pushed by the gateway every heartbeat, so orders placed
+        since then may not be reflected yet.
+        
+        Returns:
+            float: Free balance or None if the balances were never fetched
+        """
+        return self.balance_tracker.get_free(exchange_id, currency)
+
+class _MirroredBalanceTracker(BalanceTracker):
+    """
+    Worker-side balance tracker fed by the gateway
+    
+    Order states observed by the worker are forwarded to the gateway, which
+    owns all reservations.
+    """
+    def __init__(self, client: GatewayClient):
+        super().__init__()
+        self.client = client
+    
+    def on_order(self, exchange_id: str, order: Dict) -> None:
+        self.client._track_orders(exchange_id, [order])
+
+class _Worker:
+    """
+    Event loop side of a worker process
+    """
+    def __init__(self, worker_id: int, inbox: Any, gateway_queue: Any, exchanges: Dict[str, Dict], bus_name: str, heartbeat_interval: float, call_timeout: float, state_path: Optional[str] = None):
+        # Imported here: the strategy manager imports this module
+        from strategy_manager import strategy_manager
+        
+        self.worker_id = worker_id
+        self.inbox = inbox
+        self.gateway_queue = gateway_queue
+        self.heartbeat_interval = heartbeat_interval
+        self.client = GatewayClient(worker_id, gateway_queue, exchanges, call_timeout, state_path)
+        self.reader = MarketDataReader(bus_name)
+        self.strategy_manager = strategy_manager
+        self.stopped = asyncio.Event()
+    
+    async def run(self) -> None:
+        """
+        Serve commands until shut down
+        """
+        loop = asyncio.get_event_loop()
+        threading.Thread(target=_reader, args=(self.inbox, loop, self.dispatch), daemon=True).start()
+        heartbeat = asyncio.ensure_future(self._heartbeat())
+        bus = asyncio.ensure_future(self._read_bus())
+        
+        await self.stopped.wait()
+        heartbeat.cancel()
+        bus.cancel()
+        await asyncio.gather(heartbeat, bus, return_exceptions=True)
+        self.reader.close()
+        if self.client.state_store:
+            await self.client.state_store.close()
+    
+    async def _read_bus(self) -> None:
+        """
+        Poll the market data bus for new records
+        """
+        while True:
+            records = self.reader.poll()
+            if len(records):
+                self.client.on_bus_records(records)
+            await asyncio.sleep(BUS_POLL_INTERVAL)
+    
+    def dispatch(self, message: Tuple) -> None:
+        """
+        Handle a message from the gateway
+        
+        Args:
+            message: Message tuple, tagged by its first element
+        """
+        kind = message[0]
+        if kind == "response":
+            self.client.on_response(*message[1:])
+        elif kind == "quote":
+            _, quote_kind, exchange_id, symbol, data = message
+            if quote_kind == "ticker":
+                self.client.quote_store.put_ticker(exchange_id, symbol, data)
+            else:
+                self.client.quote_store.put_order_book(exchange_id, symbol, data)
+        elif kind == "fill":
+            self.client.on_fill(message[1], message[2])
+        elif kind == "balances":
+            for exchange_id, balances in message[1].items():
+                self.client.balance_tracker.update(exchange_id, balances)
+        elif kind == "command":
+            asyncio.ensure_future(self._command(*message[1:]))
+    
+    async def _command(self, request_id: int, name: str, args: Tuple) -> None:
+        """
+        Run a strategy command and reply to the pool
+        
+        Args:
+            request_id: ID of the command
+            name: Command name
+            args: Command arguments
+        """
+        manager = self.strategy_manager
+        try:
+            if name == "create":
+                instance_name, strategy_id, parameters, exchanges = args
+                self.client.exchanges = exchanges
+                result = await manager.create_instance(instance_name, strategy_id, self.client, parameters)
+            elif name == "start":
+                result = manager.start_instance(args[0])
+            elif name == "stop":
+                result = manager.stop_instance(args[0])
+            elif name == "remove":
+                result = await manager.remove_instance(args[0])
+            elif name == "shutdown":
+                await manager.stop_all()
+                self.stopped.set()
+                result = True
+            else:
+                raise GatewayError(f"Unknown command {name}")
+            reply = ("reply", self.worker_id, request_id, True, result)
+        except Exception as e:
+            reply = ("reply", self.worker_id, request_id, False, (type(e).__name__, str(e)))
+        
+        self.gateway_queue.put(reply)
+        self.gateway_queue.put(("instances", self.worker_id, self.strategy_manager.get_all_instances_status()))
+    
+    def _send_heartbeat(self, loop_lag: float) -> None:
+        """
+        Report health and load to the pool
+        
+        Args:
+            loop_lag: Delay of the last heartbeat timer in seconds
+        """
+        self.gateway_queue.put(("heartbeat", self.worker_id, {
+            "pid": os.getpid(),
+            "instances": self.strategy_manager.get_all_instances_status(),
+            "pending_calls": len(self.client.pending),
+            "gateway_calls": self.client.calls,
+            "loop_lag": loop_lag,
+            "cpu_time": time.process_time(),
+            "bus_missed": self.reader.missed
+        }))
+    
+    async def _heartbeat(self) -> None:
+        """
+        Send a heartbeat every interval, measuring event loop lag
+        """
+        while True:
+            due = time.monotonic() + self.heartbeat_interval
+            await asyncio.sleep(self.heartbeat_interval)
+            self._send_heartbeat(max(0.0, time.monotonic() - due))
+
+def _worker_main(worker_id: int, inbox: Any, gateway_queue: Any, exchanges: Dict[str, Dict], bus_name: str, heartbeat_interval: float, call_timeout: float, state_path: Optional[str] = None) -> None:
+    """
+    Entry point of a worker process
+    """
+    async def main() -> None:
+        worker = _Worker(worker_id, inbox, gateway_queue, exchanges, bus_name, heartbeat_interval, call_timeout, state_path)
+        await worker.run()
+    
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
+
+class WorkerHandle:
+    """
+    Pool-side state of one worker process
+    """
+    def __init__(self, worker_id: int, process: Any, inbox: Any):
+        self.worker_id = worker_id
+        self.process = process
+        self.inbox = inbox
+        self.started_at = time.monotonic()
+        self.last_heartbeat: Optional[float] = None
+        self.stats: Dict[str, Any] = {}
+        self.cpu_percent = 0.0
+        self.in_flight = 0
+        self.served = 0
+        self.restarts = 0
+    
+    def is_alive(self) -> bool:
+        return self.process.is_alive()
+    
+    def get_status(self, heartbeat_timeout: float) -> Dict:
+        """
+        Get the health and load of the worker
+        
+        Args:
+            heartbeat_timeout: Seconds without a heartbeat after which the worker counts as unresponsive
+            
+        Returns:
+            Dict: Worker status
+        """
+        age = time.monotonic() - self.last_heartbeat if self.last_heartbeat else None
+        if not self.is_alive():
+            health = "dead"
+        elif age is None:
+            health = "starting"
+        elif age > heartbeat_timeout:
+            health = "unresponsive"
+        else:
+            health = "healthy"
+        
+        return {
+            "worker_id": self.worker_id,
+            "pid": self.process.pid,
+            "health": health,
+            "heartbeat_age": age,
+            "restarts": self.restarts,
+            "instances": [instance["name"] for instance in self.stats.get("instances", [])],
+            "cpu_percent": self.cpu_percent,
+            "loop_lag": self.stats.get("loop_lag"),
+            "pending_calls": self.stats.get("pending_calls", 0),
+            "bus_missed": self.stats.get("bus_missed", 0),
+            "gateway_calls": self.served,
+            "gateway_in_flight": self.in_flight
+        }
+
+class WorkerPool:
+    """
+    Runs strategy instances in a pool of worker processes
+    
+    The process owning the pool is the exchange gateway: workers hold a
+    GatewayClient instead of an ExchangeManager and send every exchange call
+    back over a multiprocessing queue, so rate limits, caches and connection
+    pools stay global. Strategy math runs in the workers, off the gateway's
+    event loop. Workers report their instances and load with heartbeats, and
+    a worker that dies is restarted with its instances.
+    """
+    def __init__(
+        self,
+        exchange_manager: Any,
+        num_workers: Optional[int] = None,
+        heartbeat_interval: float = 1.0,
+        call_timeout: float = 60.0
+    ):
+        """
+        Initialize the pool
+        
+        Args:
+            exchange_manager: Exchange manager of the gateway
+            num_workers: Number of worker processes, defaults to the CPU count
+            heartbeat_interval: Seconds between worker heartbeats and balance pushes
+            call_timeout: Seconds to wait for gateway calls and worker commands
+        """
+        self.exchange_manager = exchange_manager
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.heartbeat_interval = heartbeat_interval
+        self.call_timeout = call_timeout
+        self.context = multiprocessing.get_context("spawn")
+        self.gateway_queue = None
+        self.workers: Dict[int, WorkerHandle] = {}
+        # Instance name -> worker ID and what is needed to recreate it
+        self.placements: Dict[str, int] = {}
+        self.instance_configs: Dict[str, Dict] = {}
+        self.routes: Dict[Tuple[str, str, str], Set[int]] = {}
+        # Worker ID -> (kind, exchange_id, symbol) -> feeds and balance syncs it holds
+        self.worker_refs: Dict[int, Dict[Tuple[str, str, Optional[str]], int]] = {}
+        self.pending: Dict[int, asyncio.Future] = {}
+        self.request_ids = itertools.count()
+        self.monitor_task: Optional[asyncio.Task] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.bus = None
+        self.running = False
+    
+    def get_exchange_snapshot(self) -> Dict[str, Dict]:
+        """
+        Get the exchange capabilities and permissions workers need
+        
+        Returns:
+            Dict: Exchange ID to capabilities
+        """
+        levels = typing.get_args(PermissionLevel)
+        snapshot = {}
+        for exchange_id, exchange in self.exchange_manager.get_all_exchanges().items():
+            config = self.exchange_manager.get_exchange_config(exchange_id)
+            snapshot[exchange_id] = {
+                "has": {key: value for key, value in exchange.has.items() if isinstance(value, (bool, str)) or value is None},
+                "permissions": {level: self.exchange_manager.check_permission(exchange_id, level) for level in levels},
+                "ticker_ttl": config.ticker_ttl if config else 0.0
+            }
+        return snapshot
+    
+    def start(self) -> None:
+        """
+        Spawn the workers and start serving gateway calls
+        
+        Must be called from the gateway's running event loop.
+        """
+        if self.running:
+            return
+        
+        self.running = True
+        self.loop = asyncio.get_event_loop()
+        self.gateway_queue = self.context.Queue()
+        self.bus = self.exchange_manager.enable_market_bus()
+        
+        for worker_id in range(self.num_workers):
+            self._spawn(worker_id)
+        
+        threading.Thread(target=_reader, args=(self.gateway_queue, self.loop, self._dispatch), daemon=True).start()
+        self.exchange_manager.quote_store.add_listener(self._on_quote)
+        self.exchange_manager.balance_tracker.add_listener(self._on_fill)
+        self.monitor_task = asyncio.ensure_future(self._monitor())
+        
+        logger.info(f"Started {self.num_workers} strategy workers")
+    
+    def _spawn(self, worker_id: int) -> WorkerHandle:
+        """
+        Start the process of a worker
+        
+        Args:
+            worker_id: ID of the worker
+            
+        Returns:
+            WorkerHandle: Handle of the new process
+        """
+        inbox = self.context.Queue()
+        state_store = self.exchange_manager.state_store
+        state_path = str(state_store.path) if state_store else None
+        process = self.context.Process(
+            target=_worker_main,
+            args=(worker_id, inbox, self.gateway_queue, self.get_exchange_snapshot(), self.bus.name, self.heartbeat_interval, self.call_timeout, state_path),
+            name=f"strategy-worker-{worker_id}",
+            daemon=True
+        )
+        process.start()
+        
+        previous = self.workers.get(worker_id)
+        handle = WorkerHandle(worker_id, process, inbox)
+        if previous:
+            handle.restarts = previous.restarts + 1
+        self.workers[worker_id] = handle
+        return handle
+    
+    def _send(self, worker_id: int, message: Tuple) -> None:
+        """
+        Put a message into a worker's inbox
+        
+        Args:
+            worker_id: ID of the worker
+            message: Message tuple
+        """
+        handle = self.workers.get(worker_id)
+        if handle and handle.is_alive():
+            handle.inbox.put(message)
+    
+    def _broadcast(self, message: Tuple) -> None:
+        """
+        Put a message into every worker's inbox
+        
+        Args:
+            message: Message tuple
+        """
+        for worker_id in self.workers:
+            self._send(worker_id, message)
+    
+    def _dispatch(self, message: Tuple) -> None:
+        """
+        Handle a message from a worker
+        
+        Args:
+            message: Message tuple, tagged by its first element
+        """
+        kind = message[0]
+        if kind == "call":
+            asyncio.ensure_future(self._serve(*message[1:]))
+        elif kind == "notify":
+            self._serve_notification(*message[1:])
+        elif kind == "reply":
+            _, worker_id, request_id, ok, result = message
+            future = self.pending.get(request_id)
+            if future and not future.done():
+                future.set_result((ok, result))
+        elif kind == "heartbeat":
+            _, worker_id, stats = message
+            handle = self.workers.get(worker_id)
+            if handle and stats.get("pid") == handle.process.pid:
+                now = time.monotonic()
+                if handle.last_heartbeat and handle.stats:
+                    elapsed = now - handle.last_heartbeat
+                    if elapsed > 0:
+                        handle.cpu_percent = 100.0 * (stats["cpu_time"] - handle.stats["cpu_time"]) / elapsed
+                handle.last_heartbeat = now
+                handle.stats = stats
+        elif kind == "instances":
+            _, worker_id, instances = message
+            handle = self.workers.get(worker_id)
+            if handle:
+                handle.stats["instances"] = instances
+    
+    def _check_ccxt_call(self, args: Tuple) -> None:
+        """
+        Check a worker's direct ccxt call against the exchange's permission
+        
+        Args:
+            args: Arguments of ExchangeManager._call, the exchange ID and ccxt method first
+            
+        Raises:
+            GatewayError: If the method is not available to workers or the exchange lacks the permission
+        """
+        if len(args) < 2 or args[1] not in GATEWAY_CCXT_METHODS:
+            raise GatewayError(f"ccxt method {args[1] if len(args) > 1 else None} is not available to workers")
+        
+        exchange_id, method = args[0], args[1]
+        required = GATEWAY_CCXT_METHODS[method]
+        if not self.exchange_manager.check_permission(exchange_id, required):
+            raise GatewayError(f"Exchange {exchange_id} does not have {required} permission for {method}")
+    
+    async def _serve(self, worker_id: int, request_id: int, method: str, args: Tuple, kwargs: Dict) -> None:
+        """
+        Execute a worker's exchange call and send back the result
+        
+        Args:
+            worker_id: ID of the calling worker
+            request_id: ID of the call
+            method: Exchange manager method
+            args: Positional arguments
+            kwargs: Keyword arguments
+        """
+        handle = self.workers.get(worker_id)
+        if handle:
+            handle.in_flight += 1
+            handle.served += 1
+        
+        try:
+            if method == "_call":
+                self._check_ccxt_call(args)
+            elif method not in GATEWAY_METHODS:
+                raise GatewayError(f"Method {method} is not available to workers")
+            result = await getattr(self.exchange_manager, method)(*args, **kwargs)
+            if method in ("unsubscribe_ticker", "unsubscribe_order_book"):
+                kind = method[len("unsubscribe_"):]
+                if not self._count_ref(worker_id, (kind, args[0], args[1]), -1):
+                    self.routes.get((kind, args[0], args[1]), set()).discard(worker_id)
+            elif method == "untrack_balances":
+                self._count_ref(worker_id, ("balances", args[0], None), -1)
+            response = ("response", request_id, True, result)
+        except Exception as e:
+            response = ("response", request_id, False, (type(e).__name__, str(e)))
+        finally:
+            if handle:
+                handle.in_flight -= 1
+        
+        self._send(worker_id, response)
+    
+    def _serve_notification(self, worker_id: int, method: str, args: Tuple, kwargs: Dict) -> None:
+        """
+        Execute a worker's synchronous exchange manager call
+        
+        Args:
+            worker_id: ID of the calling worker
+            method: Exchange manager method
+            args: Positional arguments
+            kwargs: Keyword arguments
+        """
+        if method not in GATEWAY_NOTIFICATIONS:
+            logger.error(f"Worker {worker_id} sent unknown notification {method}")
+            return
+        
+        try:
+            result = getattr(self.exchange_manager, method)(*args, **kwargs)
+        except Exception as e:
+            logger.error(f"Failed to run {method} for worker {worker_id}: {str(e)}")
+            return
+        
+        if method == "track_balances" and result:
+            self._count_ref(worker_id, ("balances", args[0], None), 1)
+        
+        if method in ("subscribe_ticker", "subscribe_order_book") and result:
+            kind = method[len("subscribe_"):]
+            self._count_ref(worker_id, (kind, args[0], args[1]), 1)
+            self.routes.setdefault((kind, args[0], args[1]), set()).add(worker_id)
+            
+            # Give the new subscriber the latest quote right away
+            store = self.exchange_manager.quote_store
+            entry = store.get_ticker(args[0], args[1]) if kind == "ticker" else store.get_order_book(args[0], args[1])
+            if entry:
+                self._send(worker_id, ("quote", kind, args[0], args[1], entry[1]))
+    
+    def _count_ref(self, worker_id: int, key: Tuple[str, str, Optional[str]], delta: int) -> int:
+        """
+        Count a worker's subscriptions and balance syncs
+        
+        Args:
+            worker_id: ID of the worker
+            key: (kind, exchange_id, symbol), kind "balances" has no symbol
+            delta: 1 when taken, -1 when released
+            
+        Returns:
+            int: References the worker still holds
+        """
+        refs = self.worker_refs.setdefault(worker_id, {})
+        count = refs.get(key, 0) + delta
+        if count > 0:
+            refs[key] = count
+        else:
+            refs.pop(key, None)
+        return max(count, 0)
+    
+    async def _release_worker(self, worker_id: int) -> None:
+        """
+        Release the feeds and balance syncs a worker still holds
+        
+        A worker that died never unsubscribes, so its references would keep
+        the gateway's feeds and balance syncs running forever.
+        
+        Args:
+            worker_id: ID of the worker
+        """
+        for subscribers in self.routes.values():
+            subscribers.discard(worker_id)
+        
+        manager = self.exchange_manager
+        for (kind, exchange_id, symbol), count in self.worker_refs.pop(worker_id, {}).items():
+            for _ in range(count):
+                try:
+                    if kind == "ticker":
+                        await manager.unsubscribe_ticker(exchange_id, symbol)
+                    elif kind == "order_book":
+                        await manager.unsubscribe_order_book(exchange_id, symbol)
+                    else:
+                        await manager.untrack_balances(exchange_id)
+                except Exception as e:
+                    logger.error(f"Failed to release {kind} of {exchange_id} for worker {worker_id}: {str(e)}")
+    
+    def _on_quote(self, kind: str, exchange_id: str, symbol: str, data: Any) -> None:
+        """
+        Forward an order book update to the workers subscribed to it
+        
+        Tickers reach the workers through the market data bus.
+        """
+        if kind == "ticker":
+            return
+        for worker_id in self.routes.get((kind, exchange_id, symbol), ()):
+            self._send(worker_id, ("quote", kind, exchange_id, symbol, data))
+    
+    def _on_fill(self, exchange_id: str, order: Dict) -> None:
+        """
+        Forward a fill of a tracked order to all workers
+        """
+        self._broadcast(("fill", exchange_id, order))
+    
+    async def _monitor(self) -> None:
+        """
+        Push balances to the workers and restart dead workers
+        """
+        tracker = self.exchange_manager.balance_tracker
+        while self.running:
+            await asyncio.sleep(self.heartbeat_interval)
+            
+            balances = {exchange_id: tracker.get_balances(exchange_id) for exchange_id in tracker.synced_at}
+            if balances:
+                self._broadcast(("balances", balances))
+            
+            for worker_id, handle in list(self.workers.items()):
+                if self.running and not handle.is_alive():
+                    logger.error(f"Strategy worker {worker_id} died with exit code {handle.process.exitcode}, restarting")
+                    handle.inbox.cancel_join_thread()
+                    await self._release_worker(worker_id)
+                    self._spawn(worker_id)
+                    for name, placement in self.placements.items():
+                        if placement == worker_id:
+                            asyncio.ensure_future(self._restore(name))
+    
+    async def _restore(self, name: str) -> None:
+        """
+        Recreate an instance on its worker after a restart
+        
+        Args:
+            name: Instance name
+        """
+        instance = self.instance_configs.get(name)
+        if not instance:
+            return
+        
+        success = await self.create_instance(name, instance["strategy_id"], instance["parameters"])
+        if success and instance["running"]:
+            await self.start_instance(name)
+    
+    async def _command(self, worker_id: int, name: str, *args) -> Any:
+        """
+        Run a command in a worker and wait for its reply
+        
+        Args:
+            worker_id: ID of the worker
+            name: Command name
+            *args: Command arguments
+            
+        Returns:
+            Command result
+        """
+        request_id = next(self.request_ids)
+        future = asyncio.get_event_loop().create_future()
+        self.pending[request_id] = future
+        self._send(worker_id, ("command", request_id, name, args))
+        
+        try:
+            ok, result = await asyncio.wait_for(future, self.call_timeout)
+        finally:
+            self.pending.pop(request_id, None)
+        
+        if not ok:
+            raise _remote_error(*result)
+        return result
+    
+    def _pick_worker(self) -> int:
+        """
+        Choose the alive worker with the fewest instances, then the lowest CPU use
+        
+        Returns:
+            int: ID of the worker
+        """
+        counts = {worker_id: 0 for worker_id in self.workers}
+        for worker_id in self.placements.values():
+            counts[worker_id] = counts.get(worker_id, 0) + 1
+        
+        candidates = [handle for handle in self.workers.values() if handle.is_alive()] or list(self.workers.values())
+        return min(candidates, key=lambda handle: (counts[handle.worker_id], handle.cpu_percent)).worker_id
+    
+    async def create_instance(self, name: str, strategy_id: str, parameters: Dict = None) -> bool:
+        """
+        Create a named strategy instance in a worker
+        
+        An existing instance with the same name is replaced on its worker.
+        
+        Args:
+            name: Instance name
+            strategy_id: ID of the strategy
+            parameters: Strategy parameters
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        worker_id = self.placements.get(name)
+        if worker_id is None:
+            worker_id = self._pick_worker()
+        
+        try:
+            success = await self._command(worker_id, "create", name, strategy_id, parameters or {}, self.get_exchange_snapshot())
+        except Exception as e:
+            logger.error(f"Failed to create strategy instance {name} on worker {worker_id}: {str(e)}")
+            return False
+        
+        if success:
+            self.placements[name] = worker_id
+            self.instance_configs[name] = {"strategy_id": strategy_id, "parameters": parameters or {}, "running": False}
+        return success
+    
+    async def _instance_command(self, command: str, name: str) -> bool:
+        """
+        Run a start, stop or remove command for an instance
+        
+        Args:
+            command: Command name
+            name: Instance name
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        worker_id = self.placements.get(name)
+        if worker_id is None:
+            logger.error(f"Strategy instance {name} not found")
+            return False
+        
+        try:
+            return await self._command(worker_id, command, name)
+        except Exception as e:
+            logger.error(f"Failed to {command} strategy instance {name} on worker {worker_id}: {str(e)}")
+            return False
+    
+    async def start_instance(self, name: str) -> bool:
+        """
+        Start a strategy instance in its worker
+        
+        Args:
+            name: Instance name
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        success = await self._instance_command("start", name)
+        if success:
+            self.instance_configs[name]["running"] = True
+        return success
+    
+    async def stop_instance(self, name: str) -> bool:
+        """
+        Stop a strategy instance in its worker
+        
+        Args:
+            name: Instance name
+            
+        Returns:
+            bool: True if successful, False otherwise
+        """
+        success = await self._instance_command("stop", name)
+        if success:
+            self.instance_configs[name]["running"] = False
+        return success
+    
+    async def remove_instance(self, name: str) -> bool:
+        """
+        Stop and remove a strategy instance from its worker
+        
+        Args:
+            name: Instance name
+            
+        Returns:
+            bool: True if the instance existed, False otherwise
+        """
+        success = await self._instance_command("remove", name)
+        self.placements.pop(name, None)
+        self.instance_configs.pop(name, None)
+        return success
+    
+    def has_instance(self, name: str) -> bool:
+        """
+        Check if an instance is placed in the pool
+        
+        Args:
+            name: Instance name
+            
+        Returns:
+            bool: True if placed
+        """
+        return name in self.placements
+    
+    def get_instance_status(self, name: str) -> Dict:
+        """
+        Get the status of an instance as of its worker's last heartbeat
+        
+        Args:
+            name: Instance name
+            
+        Returns:
+            Dict with instance status, empty if not found
+        """
+        worker_id = self.placements.get(name)
+        if worker_id is None:
+            return {}
+        
+        for status in self.workers[worker_id].stats.get("instances", []):
+            if status["name"] == name:
+                return dict(status, worker_id=worker_id)
+        
+        instance = self.instance_configs[name]
+        return {
+            "name": name,
+            "id": instance["strategy_id"],
+            "running": instance["running"],
+            "parameters": instance["parameters"],
+            "worker_id": worker_id
+        }
+    
+    def get_all_instances_status(self) -> List[Dict]:
+        """
+        Get the status of all instances in the pool
+        
+        Returns:
+            List of dicts with instance status
+        """
+        return [self.get_instance_status(name) for name in self.placements]
+    
+    def get_workers_status(self) -> List[Dict]:
+        """
+        Get the health and load of all workers
+        
+        Returns:
+            List of dicts with worker status
+        """
+        timeout = max(5.0, 5 * self.heartbeat_interval)
+        return [handle.get_status(timeout) for handle in self.workers.values()]
+    
+    async def stop(self) -> None:
+        """
+        Stop all instances and shut the workers down
+        """
+        if not self.running:
+            return
+        
+        self.running = False
+        if self.monitor_task:
+            self.monitor_task.cancel()
+            self.monitor_task = None
+        
+        # Workers stop their instances, whose on_stop still goes through the gateway
+        results = await asyncio.gather(
+            *(self._command(worker_id, "shutdown") for worker_id, handle in self.workers.items() if handle.is_alive()),
+            return_exceptions=True
+        )
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Strategy worker did not shut down cleanly: {str(result)}")
+        
+        loop = asyncio.get_event_loop()
+        for handle in self.workers.values():
+            await loop.run_in_executor(None, handle.process.join, self.call_timeout)
+            if handle.is_alive():
+                handle.process.terminate()
+            handle.inbox.cancel_join_thread()
+        
+        # Workers that did not shut down cleanly still hold references
+        for worker_id in list(self.worker_refs):
+            await self._release_worker(worker_id)
+        
+        self.exchange_manager.quote_store.remove_listener(self._on_quote)
+        self.exchange_manager.balance_tracker.remove_listener(self._on_fill)
+        self.gateway_queue.put(None)
+        self.workers = {}
+        self.placements = {}
+        self.instance_configs = {}
+        self.routes = {}
+        
+        logger.info("Stopped strategy workers")
\ No newline at end of file